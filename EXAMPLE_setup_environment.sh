@@ -112,3 +112,88 @@ export EMPLOYEES_API_URL='http://mock_fsbid:3333/Employees'
 export SECREF_URL='http://mock_fsbid:3333/v2/SECREF'
 
 export OBC_URL='http://localhost:4000'
+
+# FSBid transport tuning
+# Connections kept alive per FSBid root, and the max size of each root's pool (size to gunicorn threads)
+export FSBID_POOL_CONNECTIONS=4
+export FSBID_POOL_MAXSIZE=20
+# Connect and read timeouts in seconds; the BackOffice CRUD procedures get a longer read timeout
+export FSBID_CONNECT_TIMEOUT=5
+export FSBID_READ_TIMEOUT=60
+export FSBID_BACKOFFICE_READ_TIMEOUT=120
+# Retries (with exponential backoff) for idempotent verbs only
+export FSBID_RETRIES=2
+export FSBID_RETRY_BACKOFF=0.3
+# Seconds reference data (skills, grades, languages, bureaus, ...) and bid cycles are cached for
+export FSBID_REFERENCE_CACHE_TIMEOUT=43200
+export FSBID_CYCLES_CACHE_TIMEOUT=300
+
+# Cache backend: locmem (per process, default), file, memcached, dummy (disabled) or a dotted backend path
+# Invalidation and shared caches only work across processes with a shared backend; use locmem only with runserver.
+# gunicorn runs several workers, so deployments use memcached. file is only a single host fallback: its add isn't
+# atomic across processes (racing the single-flight locks, cache version seeding and access counters), and every
+# request reads and unpickles version files from disk
+export DJANGO_CACHE_BACKEND='memcached'
+# locmem name, file cache directory, or comma separated host:port list for networked backends
+export DJANGO_CACHE_LOCATION='127.0.0.1:11211'
+export DJANGO_CACHE_MAX_ENTRIES=5000
+# Seconds a cached viewset response is kept (writes to the underlying models invalidate it sooner)
+export DJANGO_CACHE_RESPONSE_TIMEOUT=86400
+# Seconds a user's bureau/org permission codes and their permission on a given position are cached (capped by token expiry)
+export FSBID_PERMISSIONS_CACHE_TIMEOUT=3600
+export FSBID_POSITION_PERMISSIONS_CACHE_TIMEOUT=300
+# Rows fetched per FSBid page while streaming CSV exports
+export FSBID_CSV_PAGE_SIZE=500
+# Per-endpoint FSBid latency/error metrics (stats/fsbidupstream/), and Upstream-Calls/Upstream-Time response headers
+export FSBID_METRICS_ENABLED=True
+export FSBID_UPSTREAM_TIME_HEADER=False
+# Notification email outbox: worker threads per process, emails sent per SMTP connection,
+# attempts before an email is marked failed, first retry delay (doubling), and seconds between idle polls
+export EMAIL_OUTBOX_WORKERS=2
+export EMAIL_OUTBOX_BATCH_SIZE=50
+export EMAIL_OUTBOX_MAX_ATTEMPTS=5
+export EMAIL_OUTBOX_RETRY_BACKOFF=30
+export EMAIL_OUTBOX_POLL_INTERVAL=30
+# Threads per process looking up the bidders to email when a handshake is registered or unregistered
+export HANDSHAKE_NOTIFICATION_WORKERS=2
+# Saved search counts refreshed within this many seconds are skipped; distinct upstream counts run at once
+export SAVED_SEARCH_COUNT_MAX_AGE=300
+export SAVED_SEARCH_COUNT_WORKERS=4
+# Seconds a user's permission group names are cached (group changes made through TalentMAP invalidate them at once)
+# Ignored with the locmem/dummy cache backends, which can't invalidate other processes
+export USER_GROUPS_CACHE_TIMEOUT=300
+# Max seconds each worker reuses its post code to OBC id index (writes to Obc refresh it sooner)
+export FSBID_OBC_INDEX_TIMEOUT=3600
+# Min seconds between each worker's checks of the cache for OBC loads made by other processes
+export FSBID_OBC_VERSION_CHECK_INTERVAL=30
+# Seconds the directory of all CDOs (agenda employee search and export) is cached
+export FSBID_CDO_CACHE_TIMEOUT=900
+
+# Production server (gunicorn -c gunicorn.conf.py talentmap_api.wsgi); workers default to 2 * CPUs + 1
+export GUNICORN_BIND='0.0.0.0:8000'
+export GUNICORN_WORKERS=5
+export GUNICORN_THREADS=4
+# Seconds a request may run before its worker is restarted; must outlast the slowest FSBid call with its retries.
+# Left unset, it's derived from the FSBid read timeouts and retries (405s with the values above)
+# export GUNICORN_TIMEOUT=405
+# Seconds in-flight requests get to finish on reload (HUP) or shutdown (TERM)
+export GUNICORN_GRACEFUL_TIMEOUT=60
+export GUNICORN_KEEPALIVE=5
+# Requests served before a worker is recycled, to bound memory growth
+export GUNICORN_MAX_REQUESTS=2000
+export GUNICORN_MAX_REQUESTS_JITTER=200
+export GUNICORN_PIDFILE='/var/run/talentmap/gunicorn.pid'
+
+# Seconds a database connection is reused between requests (0 closes it after each request)
+export DATABASE_CONN_MAX_AGE=300
+# Ping reused connections before their first query in each request
+export DATABASE_CONN_HEALTH_CHECKS=true
+# Acquire connections from a cx_Oracle session pool per process; size DATABASE_POOL_MAX to the worker's thread count
+export DATABASE_POOL_ENABLED=false
+export DATABASE_POOL_MIN=2
+export DATABASE_POOL_MAX=10
+export DATABASE_POOL_INCREMENT=1
+# Seconds a client's profile is reused by the same CDO (client page and suggestions)
+export FSBID_CLIENT_CACHE_TIMEOUT=60
+# Seconds an employee's SECREF contact details are cached (client CSV export)
+export FSBID_CONTACT_CACHE_TIMEOUT=3600
@@ -6,7 +6,7 @@
 # * sets up environment vars
 # * install dependencies
 # * run migrations
-# * restart server
+# * restart server (gunicorn, see gunicorn.conf.py)
 
 # Create and activate virtual env
 virtualenv --python=/usr/bin/python3 venv
@@ -35,6 +35,12 @@ export DEPLOYMENT_LOCATION='/home/ec2-user/State-TalentMAP-API-dev/'
 export FSBID_API_URL='https://mockfsbid.metaphasedev.com'
 export EMPLOYEES_API_URL='https://mockfsbid.metaphasedev.com/Employees'
 export SECREF_URL='https://mockfsbid.metaphasedev.com/v2/SECREF'
+export GUNICORN_PIDFILE='/home/ec2-user/talentmap-api.pid'
+export GUNICORN_ERROR_LOG='/home/ec2-user/log/gunicorn.log'
+export GUNICORN_ACCESS_LOG='/home/ec2-user/log/gunicorn-access.log'
+# the gunicorn workers must share a cache for invalidation to reach all of them
+export DJANGO_CACHE_BACKEND='memcached'
+export DJANGO_CACHE_LOCATION='<MEMCACHED_HOST:PORT>'
 
 # install dependencies
 pip install -r requirements.txt
@@ -42,10 +48,14 @@ pip install -r requirements-no-deps.txt --no-dependencies
 
 python manage.py migrate
 
-# Stop the server
+# Stop the server, letting in-flight requests finish
 pkill -f runserver
+if [ -f $GUNICORN_PIDFILE ]; then
+  kill -TERM `cat $GUNICORN_PIDFILE`
+  while [ -f $GUNICORN_PIDFILE ]; do sleep 1; done
+fi
 
-python manage.py runserver 0.0.0.0:8000 &>/dev/null &
+gunicorn -c gunicorn.conf.py --daemon talentmap_api.wsgi
 
 echo "Deployment complete"
 
@@ -0,0 +1,63 @@
+'''
+Production server settings for talentmap_api.wsgi:
+
+    gunicorn -c gunicorn.conf.py talentmap_api.wsgi
+
+Values are read from setup_environment.sh (the same file wsgi.py loads), and the process environment overrides them.
+Send the master a HUP to gracefully reload workers, or a TERM to stop once in-flight requests finish.
+'''
+import multiprocessing
+import os
+
+from talentmap_api.environment import load_environment_script
+
+ENVIRONMENT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'setup_environment.sh')
+environment = load_environment_script(ENVIRONMENT_FILE) if os.path.exists(ENVIRONMENT_FILE) else {}
+
+
+def get_variable(variable, default=None):
+    env_name = os.environ.get('DJANGO_ENVIRONMENT_NAME', environment.get('DJANGO_ENVIRONMENT_NAME', ''))
+    for name in [f'{env_name}{variable}', variable]:
+        if name in os.environ:
+            return os.environ[name]
+    return environment.get(variable, default)
+
+
+bind = get_variable('GUNICORN_BIND', '0.0.0.0:8000')
+
+# Pre-forked worker processes, each serving requests on a small thread pool. Requests spend most of their time
+# waiting on FSBid, so threads (rather than more processes) raise concurrency without multiplying memory.
+workers = int(get_variable('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'gthread'
+threads = int(get_variable('GUNICORN_THREADS', 4))
+
+
+def get_slowest_fsbid_call():
+    '''
+    Seconds the slowest FSBid read can take: the longest read timeout (see FSBID_TRANSPORT_DEFAULTS and
+    FSBID_TRANSPORT_ROOTS in settings.py) plus connect time, for the first try and every retry, plus backoff
+    '''
+    connect_timeout = float(get_variable('FSBID_CONNECT_TIMEOUT', 5))
+    read_timeout = max(
+        float(get_variable('FSBID_READ_TIMEOUT', 60)),
+        float(get_variable('FSBID_BACKOFFICE_READ_TIMEOUT', 120)),
+        float(get_variable('FSBID_SECREF_READ_TIMEOUT', 30)),
+    )
+    retries = int(get_variable('FSBID_RETRIES', 2))
+    backoff = sum(float(get_variable('FSBID_RETRY_BACKOFF', 0.3)) * 2 ** attempt for attempt in range(retries))
+    return (connect_timeout + read_timeout) * (retries + 1) + backoff
+
+
+# Must outlast the slowest FSBid call, retries included (e.g. 3 x (5s + 120s) for BackOffice reads), or the
+# whole worker is restarted along with every other request on its threads
+timeout = int(get_variable('GUNICORN_TIMEOUT', int(get_slowest_fsbid_call()) + 30))
+graceful_timeout = int(get_variable('GUNICORN_GRACEFUL_TIMEOUT', 60))
+keepalive = int(get_variable('GUNICORN_KEEPALIVE', 5))
+
+# Recycle each worker after this many requests (0 disables), jittered so they don't all restart at once
+max_requests = int(get_variable('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = int(get_variable('GUNICORN_MAX_REQUESTS_JITTER', 200))
+
+pidfile = get_variable('GUNICORN_PIDFILE')
+accesslog = get_variable('GUNICORN_ACCESS_LOG', '-')
+errorlog = get_variable('GUNICORN_ERROR_LOG', '-')
@@ -1,8 +1,14 @@
+import os
+
 from locust import HttpLocust, TaskSet, task
 
 '''
 To run interavtively: locust --host=http://whatever
 To run headless: locust --host=http://whatever --no-web -c CLIENTS -r HATCHRATE -n num_requests
+
+To compare servers, run TalentMAPServingLocust with the same settings against runserver and gunicorn, e.g.
+  LOCUST_TOKEN=<api token> LOCUST_JWT=<fsbid jwt> locust -f locustfile.py TalentMAPServingLocust --host=http://whatever --no-web -c 50 -r 5 -n 2000
+and compare the requests/s and percentiles of the two reports
 '''
 
 
@@ -28,3 +34,37 @@ class TalentMAPLocust(HttpLocust):
     task_set = TalentMAPResearchTasks
     min_wait = 5000
     max_wait = 15000
+
+
+class TalentMAPServingTasks(TaskSet):
+    '''
+    FSBid backed searches, which spend most of their time waiting on upstream calls
+    '''
+
+    def on_start(self):
+        self.headers = {
+            "Authorization": f"Token {os.environ.get('LOCUST_TOKEN', '')}",
+            "JWT": os.environ.get('LOCUST_JWT', ''),
+        }
+
+    @task(10)
+    def search_available_positions(self):
+        self.client.get("/api/v1/fsbid/available_positions/?page=1&limit=10", headers=self.headers, name="/api/v1/fsbid/available_positions/")
+
+    @task(5)
+    def search_projected_vacancies(self):
+        self.client.get("/api/v1/fsbid/projected_vacancies/?page=1&limit=10", headers=self.headers, name="/api/v1/fsbid/projected_vacancies/")
+
+    @task(5)
+    def reference_cycles(self):
+        self.client.get("/api/v1/fsbid/reference/cycles/", headers=self.headers)
+
+    @task(1)
+    def health_check(self):
+        self.client.get("/ht/")
+
+
+class TalentMAPServingLocust(HttpLocust):
+    task_set = TalentMAPServingTasks
+    min_wait = 500
+    max_wait = 1500
@@ -124,8 +124,9 @@ class AvailablePositionRankingView(FieldLimitableSerializerMixin,
         if isinstance(self.request.data, dict):
             cp = self.request.data.get('cp_id')
 
-        hasBureauPermissions = empservices.has_bureau_permissions(cp, self.request.META['HTTP_JWT'])
-        hasOrgPermissions = empservices.has_org_permissions(cp, self.request.META['HTTP_JWT'])
+        permissions = empservices.get_position_permissions(cp, self.request.META['HTTP_JWT'])
+        hasBureauPermissions = permissions["bureau"]
+        hasOrgPermissions = permissions["org"]
         exists = AvailablePositionRankingLock.objects.filter(cp_id=cp).exists()
 
         # is locked and does not have bureau permissions
@@ -141,8 +142,9 @@ class AvailablePositionRankingView(FieldLimitableSerializerMixin,
 
     def get_queryset(self):
         cp = self.request.GET.get('cp_id')
-        hasBureauPermissions = empservices.has_bureau_permissions(cp, self.request.META['HTTP_JWT'])
-        hasOrgPermissions = empservices.has_org_permissions(cp, self.request.META['HTTP_JWT'])
+        permissions = empservices.get_position_permissions(cp, self.request.META['HTTP_JWT'])
+        hasBureauPermissions = permissions["bureau"]
+        hasOrgPermissions = permissions["org"]
 
         if hasOrgPermissions or hasBureauPermissions:
             return get_prefetched_filtered_queryset(AvailablePositionRanking, self.serializer_class).order_by('rank')
@@ -154,8 +156,9 @@ class AvailablePositionRankingView(FieldLimitableSerializerMixin,
         Removes the available position rankings by cp_id for the user
         '''
         cp = pk
-        hasBureauPermissions = empservices.has_bureau_permissions(cp, self.request.META['HTTP_JWT'])
-        hasOrgPermissions = empservices.has_org_permissions(cp, self.request.META['HTTP_JWT'])
+        permissions = empservices.get_position_permissions(cp, self.request.META['HTTP_JWT'])
+        hasBureauPermissions = permissions["bureau"]
+        hasOrgPermissions = permissions["org"]
         exists = AvailablePositionRankingLock.objects.filter(cp_id=cp).exists()
 
         # is locked and does not have bureau permissions
@@ -215,7 +218,7 @@ class AvailablePositionRankingLockView(FieldLimitableSerializerMixin,
         Returns 204 if the available position is locked, otherwise, 404
         '''
         # must have bureau permission for the bureau code associated with the position
-        if not empservices.has_bureau_permissions(pk, request.META['HTTP_JWT']) and not empservices.has_org_permissions(pk, self.request.META['HTTP_JWT']):
+        if not any(empservices.get_position_permissions(pk, request.META['HTTP_JWT']).values()):
             return Response(status=status.HTTP_403_FORBIDDEN)
 
         if AvailablePositionRankingLock.objects.filter(cp_id=pk).exists():
@@ -414,15 +417,22 @@ class BureauBiddersRankings(APIView):
         num_sl_bids = 0
         filtered_bids = []
 
+        ranks = {}
+        for ranked_cp_id, rank in user_rankings.values_list("cp_id", "rank"):
+            ranks.setdefault(ranked_cp_id, rank)
+        ranked_cp_ids = [pydash.get(bid, 'position_info.id') for bid in user_bids]
+        permitted_cp_ids = empservices.get_permitted_cp_ids(
+            [cp for cp in ranked_cp_ids if cp is not None and str(int(cp)) in ranks],
+            self.request.META['HTTP_JWT'],
+        )
+
         for bid in user_bids:
             try:
                 pos_id = str(int(pydash.get(bid, 'position_info.id')))
-                rank = user_rankings.filter(cp_id=pos_id).values_list("rank", flat=True).first()
+                rank = ranks.get(pos_id)
                 if rank is not None:
                     num_sl_bids += 1
-                    hasBureauPermissions = empservices.has_bureau_permissions(pos_id, self.request.META['HTTP_JWT'])
-                    hasOrgPermissions = empservices.has_org_permissions(pos_id, self.request.META['HTTP_JWT'])
-                    if hasOrgPermissions or hasBureauPermissions:
+                    if pos_id in permitted_cp_ids:
                         bid["ranking"] = rank
                         filtered_bids.append(bid)
             except Exception as e:
@@ -22,9 +22,9 @@ def get_position_handshake_data(cp_id):
 
     return props
 
-def map_handshake_data(hs, exclude_revoked=False):
+def map_handshake(hs):
     '''
-    Map handshake data
+    Map a single handshake instance (or None)
     '''
     mapping = {
         'O': "handshake_offered",
@@ -49,11 +49,7 @@ def map_handshake_data(hs, exclude_revoked=False):
         'hs_date_expiration': None,
     }
 
-    if exclude_revoked:
-        hs = hs.exclude(status='R')
-
-    if hs.exists():
-        hs = hs.first()
+    if hs is not None:
         status = hs.status
         bidder_status = hs.bidder_status
         is_cdo_update = hs.is_cdo_update == 1
@@ -61,10 +57,10 @@ def map_handshake_data(hs, exclude_revoked=False):
         props['hs_status_code'] = mapping[status]
         props['hs_cdo_indicator'] = is_cdo_update
 
-        if bidder_status is 'D':
+        if bidder_status == 'D':
             props['bidder_hs_code'] = bidder_mapping['D']
 
-        if bidder_status is 'A':
+        if bidder_status == 'A':
             props['bidder_hs_code'] = bidder_mapping['A']
 
         # Dates
@@ -76,6 +72,15 @@ def map_handshake_data(hs, exclude_revoked=False):
 
     return props
 
+def map_handshake_data(hs, exclude_revoked=False):
+    '''
+    Map handshake data
+    '''
+    if exclude_revoked:
+        hs = hs.exclude(status='R')
+
+    return map_handshake(hs.first())
+
 def get_bidder_handshake_data(cp_id, perdet, exclude_revoked=False):
     '''
     Return handshake data for a given perdet and cp_id
@@ -83,6 +88,13 @@ def get_bidder_handshake_data(cp_id, perdet, exclude_revoked=False):
     hs = BidHandshake.objects.filter(cp_id=cp_id, bidder_perdet=perdet)
     return map_handshake_data(hs, exclude_revoked)
 
+def get_bidders_handshake_data(cp_id, perdets):
+    '''
+    Return handshake data for many perdets on a cp_id, keyed by perdet, using a single query
+    '''
+    handshakes = {hs.bidder_perdet: hs for hs in BidHandshake.objects.filter(cp_id=cp_id, bidder_perdet__in=perdets)}
+    return {perdet: map_handshake(handshakes.get(perdet)) for perdet in perdets}
+
 def get_lead_handshake_data(cp_id):
     '''
     Return lead handshake data for a cp_id
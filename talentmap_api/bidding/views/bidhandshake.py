@@ -143,9 +143,7 @@ class BidHandshakeCdoActionView(FieldLimitableSerializerMixin,
             return Response(status=status.HTTP_404_NOT_FOUND)
         else:
             # Return an error if a handshake has already been accepted within active
-            bids = bid_services.user_bids(pk, jwt)
-            accept_disabled = pydash.find(bids, lambda x: str(int(pydash.get(x, 'position_info.id'))) == str(int(cp_id)) and x['accept_handshake_disabled'] is True)
-            if accept_disabled:
+            if bid_services.is_accept_handshake_disabled(pk, cp_id, jwt):
                 return Response('A handshake in this cycle position bid cycle has already been accepted', status=status.HTTP_409_CONFLICT)
 
             hs.update(last_editing_bidder=user, status='A', bidder_status='A', is_cdo_update=True,
@@ -191,9 +189,7 @@ class BidHandshakeBidderActionView(FieldLimitableSerializerMixin,
             return Response(status=status.HTTP_404_NOT_FOUND)
         else:
             # Return an error if a handshake has already been accepted within active
-            bids = bid_services.user_bids(user.emp_id, jwt)
-            accept_disabled = pydash.find(bids, lambda x: str(int(pydash.get(x, 'position_info.id'))) == str(int(cp_id)) and x['accept_handshake_disabled'] is True)
-            if accept_disabled:
+            if bid_services.is_accept_handshake_disabled(user.emp_id, cp_id, jwt):
                 return Response('A handshake in this cycle position bid cycle has already been accepted', status=status.HTTP_409_CONFLICT)
 
             hs.update(last_editing_bidder=user, status='A', bidder_status='A', is_cdo_update=False,
@@ -41,6 +41,8 @@ class CyclePositionListView(FieldLimitableSerializerMixin,
     serializer_class = CyclePositionSerializer
     filter_class = CyclePositionFilter
     permission_classes = (IsAuthenticatedOrReadOnly,)
+    # the queryset is built per request, so name the model whose writes invalidate the cache
+    cache_models = (CyclePosition,)
 
     def get_queryset(self):
         queryset = CyclePosition.objects.filter(bidcycle__active=True, status_code__in=["HS", "OP"], posted_date__isnull=False)
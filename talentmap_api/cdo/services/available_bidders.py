@@ -1,8 +1,6 @@
 import logging
 import csv
-import maya
 import pydash
-from copy import deepcopy
 
 from django.conf import settings
 from django.http import HttpResponse
@@ -13,6 +11,7 @@ import talentmap_api.bureau.services.available_bidders as bureau_services
 import talentmap_api.fsbid.services.client as client_services
 
 from talentmap_api.common.common_helpers import ensure_date, formatCSV
+from talentmap_api.common.dates import format_date
 
 from talentmap_api.common.common_helpers import formatCSV
 from talentmap_api.fsbid.services.common import mapBool
@@ -20,86 +19,108 @@ from talentmap_api.fsbid.services.common import mapBool
 logger = logging.getLogger(__name__)
 
 
-def get_available_bidders_stats(data):
+# Facets shown on the Available Bidders stats panel, and the bidder field each is tallied by
+AVAILABLE_BIDDERS_FACETS = (
+    ('Bureau', 'current_assignment.position.bureau_code'),
+    ('CDO', 'cdo.full_name'),
+    ('Grade', 'grade'),
+    ('OC Bureau', 'available_bidder_details.oc_bureau'),
+    ('Post', 'pos_location'),
+    ('Skill', 'skills'),
+    ('Status', 'available_bidder_details.status'),
+)
+
+NONE_LISTED = 'None listed'
+
+# Most posts the UI has columns for
+MAX_POSTS = 18
+
+
+def get_facet_accessor(path):
     '''
-    Returns all Available Bidders statistics
+    Compiles a dotted bidder path into a function returning the facet key and its display name
+    '''
+    if path == 'skills':
+        # bidders are tallied under their first skill, named by its description (None listed if it has no code)
+        def get_skill(bidder):
+            skill = next(filter(None, bidder.get('skills') or []), None)
+            code = None if skill is None else skill.get('code')
+            if code is None:
+                return None, NONE_LISTED
+            return code, f"{skill.get('description')}"
+        return get_skill
+
+    keys = path.split('.')
+
+    def get_value(bidder):
+        value = bidder
+        for key in keys:
+            if not isinstance(value, dict):
+                return None, NONE_LISTED
+            value = value.get(key)
+        return value, NONE_LISTED if value is None else f"{value}"
+    return get_value
+
+
+class AvailableBiddersStats:
+    '''
+    Tallies every facet of a list of available bidders in a single pass
     '''
-    stats = {
-        'Bureau': {},
-        'CDO': {},
-        'Grade': {},
-        'OC Bureau': {},
-        'Post': {},
-        'Skill': {},
-        'Status': {},
-    }
-
-    stats_sum = {
-        'Bureau': 0,
-        'CDO': 0,
-        'Grade': 0,
-        'OC Bureau': 0,
-        'Post': 0,
-        'Skill': 0,
-        'Status': 0,
-    }
 
-    config = [
-        { 'key': 'current_assignment.position.bureau_code', 'statsKey': 'Bureau' },
-        { 'key': 'cdo.full_name', 'statsKey': 'CDO' },
-        { 'key': 'grade', 'statsKey': 'Grade' },
-        { 'key': 'available_bidder_details.oc_bureau', 'statsKey': 'OC Bureau' },
-        { 'key': 'pos_location', 'statsKey': 'Post' },
-        { 'key': 'skills', 'statsKey': 'Skill' },
-        { 'key': 'available_bidder_details.status', 'statsKey': 'Status' },
-    ]
-
-    none_listed = {'name': 'None listed', 'value': 0}
-
-    if data:
-        # get stats for various fields
-        for bidder in pydash.get(data, 'results'):
-            def map_object(stat):
-                key = pydash.get(bidder, stat['key'])
-                stats_key = stats[stat['statsKey']]
-                if stat['key'] == 'skills':
-                    skill = list(deepcopy(filter(None, bidder[stat['key']])))
-                    key = skill[0]['code']
-                    if key not in stats['Skill']:
-                        stats_key[key] = deepcopy(none_listed) if key == None else {'name': f"{skill[0]['description']}", 'value': 0}
+    def __init__(self, facets=AVAILABLE_BIDDERS_FACETS):
+        self.facets = [(name, get_facet_accessor(path)) for name, path in facets]
+
+    def tally(self, bidders):
+        '''
+        Returns each facet's {key: [name, count]} histogram, in order of first appearance
+        '''
+        histograms = {name: {} for name, accessor in self.facets}
+        tallies = [(histograms[name], accessor) for name, accessor in self.facets]
+        for bidder in bidders:
+            for histogram, accessor in tallies:
+                key, name = accessor(bidder)
+                entry = histogram.get(key)
+                if entry is None:
+                    histogram[key] = [name, 1]
                 else:
-                    if key not in stats[stat['statsKey']]:
-                        stats_key[key] = deepcopy(none_listed) if key == None else {'name': f"{key}", 'value': 0}
-
-                stats_key[key]['value'] += 1
-                stats_sum[stat['statsKey']] += 1
-
-            pydash.for_each(config, map_object)
-
-    # adding percentage & creating final data structure to pass to FE
-    bidders_stats = {}
-    for stat in stats:
-        stat_sum = stats_sum[stat]
-        bidders_stats[stat] = []
-        for s in stats[stat]:
-            stat_value = stats[stat][s]['value']
-            bidders_stats[stat].append({**stats[stat][s], 'percent': "{:.0%}".format(stat_value / stat_sum)})
-
-    # partition is used to handle the edge case when
-    # len(bidders_stats['Post']) > 18 and all the post only have a value of 1
-    # 18 was chosen due to UI Columns
-    if len(bidders_stats['Post']) > 18:
-        post_partition = pydash.partition(bidders_stats['Post'], lambda post: post['value'] > 1)
-        take_from_pp = 18 - len(post_partition[0])
-        post_partition[0].extend(post_partition[1][:take_from_pp])
-        bidders_stats['Post'] = post_partition[0]
-    
-    bidders_stats['Grade'] = sorted(bidders_stats['Grade'], key = lambda grade: grade['name'])
-    bidders_stats['Skill'] = sorted(bidders_stats['Skill'], key = lambda skill: skill['name'])
-    bidders_stats['Sum'] = stats_sum
-
+                    entry[1] += 1
+        return histograms
+
+    def get_stats(self, bidders):
+        bidders = list(bidders)
+        total = len(bidders)
+        bidders_stats = {}
+        for facet, histogram in self.tally(bidders).items():
+            bidders_stats[facet] = [
+                {'name': name, 'value': value, 'percent': "{:.0%}".format(value / total)} for name, value in histogram.values()
+            ]
+
+        # partition is used to handle the edge case when
+        # len(bidders_stats['Post']) > 18 and all the post only have a value of 1
+        # 18 was chosen due to UI Columns
+        if len(bidders_stats.get('Post', [])) > MAX_POSTS:
+            post_partition = pydash.partition(bidders_stats['Post'], lambda post: post['value'] > 1)
+            take_from_pp = MAX_POSTS - len(post_partition[0])
+            post_partition[0].extend(post_partition[1][:take_from_pp])
+            bidders_stats['Post'] = post_partition[0]
+
+        for facet in ['Grade', 'Skill']:
+            if facet in bidders_stats:
+                bidders_stats[facet] = sorted(bidders_stats[facet], key=lambda stat: stat['name'])
+        bidders_stats['Sum'] = {facet: total for facet, accessor in self.facets}
+        return bidders_stats
+
+
+# CDO and bureau users see the same facets of their available bidders lists
+available_bidders_stats = AvailableBiddersStats()
+
+
+def get_available_bidders_stats(bidders):
+    '''
+    Returns all Available Bidders statistics for a deduplicated list of bidders
+    '''
     return {
-        "stats": bidders_stats,
+        "stats": available_bidders_stats.get_stats(bidders or []),
     }
 
 
@@ -167,22 +188,13 @@ def get_available_bidders_csv(request):
 
         fields = formatCSV(record, fields_info)
 
-        # Removing time zone text to allow Maya to parse
+        # Removing time zone text to allow the date to parse
         update_date, x, y = fields["updated_on"].partition('(')
-        update_date = maya.parse(update_date).datetime().strftime('%m/%d/%Y')
-
-        try:
-            ted = maya.parse(fields["ted"]).datetime().strftime('%m/%d/%Y')
-        except:
-            ted = 'None listed'
-        try:
-            step_letter_one = maya.parse(fields["step_letter_one"]).datetime().strftime('%m/%d/%Y')
-        except:
-            step_letter_one = 'None listed'
-        try:
-            step_letter_two = maya.parse(fields["step_letter_two"]).datetime().strftime('%m/%d/%Y')
-        except:
-            step_letter_two = 'None listed'
+        update_date = format_date(update_date.strip())
+
+        ted = format_date(fields.get("ted"), default='None listed')
+        step_letter_one = format_date(fields.get("step_letter_one"), default='None listed')
+        step_letter_two = format_date(fields.get("step_letter_two"), default='None listed')
         writer.writerow([
             fields["name"],
             fields["status"],
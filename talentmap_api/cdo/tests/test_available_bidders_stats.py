@@ -0,0 +1,110 @@
+import logging
+import random
+import time
+from copy import deepcopy
+
+import pydash
+import pytest
+
+
+def get_legacy_stats(bidders):
+    # the per-bidder pydash.for_each/deepcopy tally the single pass engine replaced
+    config = [
+        {'key': 'current_assignment.position.bureau_code', 'statsKey': 'Bureau'},
+        {'key': 'cdo.full_name', 'statsKey': 'CDO'},
+        {'key': 'grade', 'statsKey': 'Grade'},
+        {'key': 'available_bidder_details.oc_bureau', 'statsKey': 'OC Bureau'},
+        {'key': 'pos_location', 'statsKey': 'Post'},
+        {'key': 'skills', 'statsKey': 'Skill'},
+        {'key': 'available_bidder_details.status', 'statsKey': 'Status'},
+    ]
+    stats = {c['statsKey']: {} for c in config}
+    stats_sum = {c['statsKey']: 0 for c in config}
+    none_listed = {'name': 'None listed', 'value': 0}
+    for bidder in bidders:
+        def map_object(stat):
+            key = pydash.get(bidder, stat['key'])
+            stats_key = stats[stat['statsKey']]
+            if stat['key'] == 'skills':
+                skill = list(deepcopy(filter(None, bidder[stat['key']])))
+                key = skill[0]['code']
+                if key not in stats_key:
+                    stats_key[key] = deepcopy(none_listed) if key is None else {'name': f"{skill[0]['description']}", 'value': 0}
+            elif key not in stats_key:
+                stats_key[key] = deepcopy(none_listed) if key is None else {'name': f"{key}", 'value': 0}
+            stats_key[key]['value'] += 1
+            stats_sum[stat['statsKey']] += 1
+        pydash.for_each(config, map_object)
+
+    bidders_stats = {
+        stat: [{**s, 'percent': "{:.0%}".format(s['value'] / stats_sum[stat])} for s in stats[stat].values()] for stat in stats
+    }
+    if len(bidders_stats['Post']) > 18:
+        post_partition = pydash.partition(bidders_stats['Post'], lambda post: post['value'] > 1)
+        post_partition[0].extend(post_partition[1][:18 - len(post_partition[0])])
+        bidders_stats['Post'] = post_partition[0]
+    bidders_stats['Grade'] = sorted(bidders_stats['Grade'], key=lambda grade: grade['name'])
+    bidders_stats['Skill'] = sorted(bidders_stats['Skill'], key=lambda skill: skill['name'])
+    bidders_stats['Sum'] = stats_sum
+    return bidders_stats
+
+
+def make_bidders(count):
+    rng = random.Random(0)
+    return [{
+        "perdet_seq_number": i,
+        "grade": rng.choice(["01", "02", "03", "04", "OM"]),
+        "skills": [{"code": code, "description": f"SKILL {code}"} for code in rng.sample(["2010", "3001", "5505", "6218"], 2)],
+        "pos_location": rng.choice([None] + [f"City {n}, Country" for n in range(40)]),
+        "cdo": {"full_name": rng.choice(["Doe, Jane", "Roe, Rick", None])},
+        "current_assignment": {"position": {"bureau_code": rng.choice(["AF", "EAP", "EUR", "WHA"])}},
+        "available_bidder_details": {"oc_bureau": rng.choice([None, "AF", "EUR"]), "status": rng.choice(["OC", "UA", "IT", "AWOL"])},
+    } for i in range(count)]
+
+
+def test_available_bidders_stats_matches_legacy_tally():
+    from talentmap_api.cdo.services.available_bidders import get_available_bidders_stats
+
+    bidders = make_bidders(50)
+    stats = get_available_bidders_stats(bidders)["stats"]
+    assert stats == get_legacy_stats(bidders)
+    assert stats["Sum"]["Skill"] == 50
+    assert len(stats["Post"]) == 18
+
+    bidders[0]["skills"] = []
+    assert {"name": "None listed", "value": 1, "percent": "2%"} in get_available_bidders_stats(bidders)["stats"]["Skill"]
+
+    # a first skill without a code is filed under None listed, not its description
+    bidders[1]["skills"] = [{"code": None, "description": "UNKNOWN"}]
+    skills = get_available_bidders_stats(bidders)["stats"]["Skill"]
+    assert {"name": "None listed", "value": 2, "percent": "4%"} in skills
+    assert "UNKNOWN" not in [skill["name"] for skill in skills]
+
+    assert get_available_bidders_stats([])["stats"]["Sum"]["Grade"] == 0
+
+
+def test_available_bidders_stats_matches_legacy_tally_at_scale():
+    from talentmap_api.cdo.services.available_bidders import get_available_bidders_stats
+
+    bidders = make_bidders(5000)
+    assert get_available_bidders_stats(bidders)["stats"] == get_legacy_stats(bidders)
+
+
+@pytest.mark.benchmark
+def test_available_bidders_stats_benchmark():
+    from talentmap_api.cdo.services.available_bidders import get_available_bidders_stats
+
+    bidders = make_bidders(5000)
+
+    before = time.perf_counter()
+    baseline = get_legacy_stats(bidders)
+    baseline_time = time.perf_counter() - before
+
+    before = time.perf_counter()
+    stats = get_available_bidders_stats(bidders)["stats"]
+    engine_time = time.perf_counter() - before
+
+    logging.getLogger(__name__).info(f"5k bidders: legacy {baseline_time * 1000:.1f}ms, single pass {engine_time * 1000:.1f}ms")
+    assert stats == baseline
+    # the single pass is typically ~6x faster; the margin keeps loaded machines from failing it
+    assert engine_time < baseline_time / 2
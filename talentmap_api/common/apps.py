@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+
+
+class CommonConfig(AppConfig):
+    name = 'talentmap_api.common'
+
+    def ready(self):
+        from django.core.signals import request_started
+        from health_check.plugins import plugin_dir
+        from talentmap_api.common.health import DatabasePoolHealthCheck
+        from talentmap_api.messaging.outbox import start_outbox
+
+        plugin_dir.register(DatabasePoolHealthCheck)
+        # Web processes drain the email outbox, including emails left pending or retrying by a restart
+        request_started.connect(start_outbox, dispatch_uid="start_email_outbox")
@@ -0,0 +1,90 @@
+import logging
+import uuid
+
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete, m2m_changed
+
+logger = logging.getLogger(__name__)
+
+STATS_KEY = "cache_stats:{}:{}"
+
+
+def get_version_key(model):
+    return f"cache_version:{model._meta.label_lower}"
+
+
+def get_model_versions(models):
+    '''
+    Returns the current write version of each model, keyed by model label
+    '''
+    keys = {get_version_key(model): model._meta.label_lower for model in models}
+    versions = cache.get_many(list(keys))
+    for key in keys:
+        if versions.get(key) is None:
+            # a missing (or evicted) version starts fresh, so it can never match an older cached response
+            cache.add(key, uuid.uuid4().hex, None)
+            versions[key] = cache.get(key)
+    return {label: versions[key] for key, label in keys.items()}
+
+
+def bump_model_version(sender, **kwargs):
+    '''
+    Signal receiver that invalidates every cached response built from the sending model
+    '''
+    cache.set(get_version_key(sender), uuid.uuid4().hex, None)
+
+
+def get_m2m_receiver(model):
+    def receiver(action, **kwargs):
+        if action.startswith('post_'):
+            bump_model_version(model)
+    return receiver
+
+
+def track_models(models):
+    '''
+    Invalidates cached responses whenever one of the given models is saved or deleted
+    '''
+    for model in models:
+        uid = f"cache_invalidation_{model._meta.label_lower}"
+        post_save.connect(bump_model_version, sender=model, dispatch_uid=uid)
+        post_delete.connect(bump_model_version, sender=model, dispatch_uid=uid)
+        for field in model._meta.local_many_to_many:
+            m2m_changed.connect(
+                get_m2m_receiver(model),
+                sender=field.remote_field.through,
+                dispatch_uid=f"{uid}_{field.name}",
+                weak=False,
+            )
+
+
+def record_access(name, hit):
+    '''
+    Counts a cache hit or miss for the named view
+    '''
+    key = STATS_KEY.format(name, "hits" if hit else "misses")
+    if cache.add(key, 1, None):
+        return
+    try:
+        cache.incr(key)
+    except ValueError:
+        # expired between the add and the incr
+        cache.set(key, 1, None)
+
+
+def get_access_stats(names):
+    '''
+    Returns the hit and miss counters, and hit ratio, for each named view
+    '''
+    keys = {name: (STATS_KEY.format(name, "hits"), STATS_KEY.format(name, "misses")) for name in names}
+    counters = cache.get_many([key for pair in keys.values() for key in pair])
+    stats = {}
+    for name, (hits_key, misses_key) in keys.items():
+        hits = counters.get(hits_key, 0)
+        misses = counters.get(misses_key, 0)
+        stats[name] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 3) if hits + misses else None,
+        }
+    return stats
@@ -4,7 +4,8 @@ import json
 from rest_framework_extensions.key_constructor import bits
 from rest_framework_extensions.key_constructor.constructors import DefaultKeyConstructor
 
-from talentmap_api.common.common_helpers import order_dict
+from talentmap_api.common.common_helpers import order_dict, get_user_group_names
+from talentmap_api.common.cache.invalidation import get_model_versions
 
 
 class PathKeyBit(bits.QueryParamsKeyBit):
@@ -16,12 +17,41 @@ class PathKeyBit(bits.QueryParamsKeyBit):
         return {"path": request.path}
 
 
+class UserRoleKeyBit(bits.KeyBitBase):
+    """
+    Adds the requesting user and their groups as a key bit, so a shared cache never serves one user's response to another
+    """
+
+    def get_data(self, params, view_instance, view_method, request, args, kwargs):
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            return {"user": "anonymous"}
+        return {
+            "user": user.id,
+            "groups": sorted(get_user_group_names(user)),
+        }
+
+
+class ModelVersionKeyBit(bits.KeyBitBase):
+    """
+    Adds the write version of the view's models as a key bit, so a save or delete invalidates the cached responses
+    """
+
+    def get_data(self, params, view_instance, view_method, request, args, kwargs):
+        get_cache_models = getattr(view_instance, 'get_cache_models', None)
+        if get_cache_models is None:
+            return {}
+        return get_model_versions(get_cache_models())
+
+
 class TalentMAPKeyConstructor(DefaultKeyConstructor):
     """
-    Construct the cache key, include query params as a bit
+    Construct the cache key, include query params, the user and their roles, and model versions as bits
     """
     path_bit = PathKeyBit()
     request_params = bits.QueryParamsKeyBit()
+    user_role = UserRoleKeyBit()
+    model_versions = ModelVersionKeyBit()
 
     def prepare_key(self, key_dict):  # nosec We're OK to use MD5 here since it isn't for cryptographic purposes
         key_dict = order_dict(key_dict)  # We order the dict to ensure something like ?q=german&code=1 == ?code=1&q=german
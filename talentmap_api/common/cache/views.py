@@ -1,16 +1,76 @@
 import logging
+from django.http import HttpResponse
 from rest_framework.viewsets import GenericViewSet
 from rest_framework import mixins
 
-from rest_framework_extensions.cache.decorators import CacheResponse as cache_response
+from rest_framework_extensions.cache.decorators import CacheResponse
+
+from talentmap_api.common.cache.invalidation import record_access, track_models
 
 logger = logging.getLogger(__name__)
 
+# Names of every cached viewset, for the hit/miss stats
+cached_views = set()
+
+
+class cache_response(CacheResponse):
+    '''
+    CacheResponse that also counts hits and misses per view
+    '''
+
+    def process_cache_response(self, view_instance, view_method, request, args, kwargs):
+        key = self.calculate_key(
+            view_instance=view_instance,
+            view_method=view_method,
+            request=request,
+            args=args,
+            kwargs=kwargs
+        )
+        response_triple = self.cache.get(key)
+        record_access(view_instance.__class__.__name__, bool(response_triple))
+        if not response_triple:
+            response = view_method(view_instance, request, *args, **kwargs)
+            response = view_instance.finalize_response(request, response, *args, **kwargs)
+            response.render()  # should be rendered, before storing its content in the cache
+
+            if not response.status_code >= 400 or self.cache_errors:
+                response_triple = (response.rendered_content, response.status_code, list(response.items()))
+                self.cache.set(key, response_triple, self.timeout)
+        else:
+            content, status, headers = response_triple
+            response = HttpResponse(content=content, status=status)
+            for header, value in headers:
+                response[header] = value
+
+        if not hasattr(response, '_closable_objects'):
+            response._closable_objects = []
+
+        return response
+
 
 class CachedViewSet(mixins.ListModelMixin,
                     mixins.RetrieveModelMixin,
                     GenericViewSet):
 
+    # Models whose writes invalidate the cached responses; defaults to the queryset's model
+    cache_models = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cached_views.add(cls.__name__)
+        models = cls.get_cache_models()
+        if not models:
+            logger.warning(f"{cls.__name__} has no queryset or cache_models, so its cached responses are never invalidated")
+        track_models(models)
+
+    @classmethod
+    def get_cache_models(cls):
+        if cls.cache_models:
+            return cls.cache_models
+        if cls.queryset is not None:
+            return (cls.queryset.model,)
+        return ()
+
     @cache_response()
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
@@ -0,0 +1,100 @@
+'''
+Fast parsing and formatting of FSBid dates.
+
+FSBid returns a handful of fixed ISO 8601 shapes (2021-05-01, 2021-05-01T00:00:00, 2021-05-01T00:00:00.000Z, ...).
+These are parsed with datetime.strptime and a format picked from the string's shape, and anything else falls back to
+dateutil. Results are memoized because
+the same dates (cycle dates, TEDs, panel dates) repeat across most rows of a result set or export.
+'''
+import datetime
+import re
+from functools import lru_cache
+
+import pytz
+from dateutil import parser
+
+UTC = datetime.timezone.utc
+
+# Distinct values remembered per function; FSBid result sets rarely hold more distinct dates than this
+CACHE_SIZE = 8192
+
+# The fixed shapes parsed with strptime: a date, then optionally a time and a Z or +HH:MM offset
+ISO_FORMAT = re.compile(r'^(\d{4}-\d{2}-\d{2})(?:[T ](\d{2}:\d{2}(?::\d{2}(?:\.\d{3}|\.\d{6})?)?))?(Z|[+-]\d{2}:\d{2})?$')
+
+# strptime formats for the time part, by its length
+TIME_FORMATS = {
+    5: 'T%H:%M',
+    8: 'T%H:%M:%S',
+    12: 'T%H:%M:%S.%f',
+    15: 'T%H:%M:%S.%f',
+}
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_date(value):
+    '''
+    Parses a date string into a datetime, naive unless the string has an offset. Raises ValueError if it isn't a date.
+    '''
+    match = ISO_FORMAT.match(value)
+    if not match:
+        return parser.parse(value)
+    day, time, offset = match.groups()
+    value, date_format = day, '%Y-%m-%d'
+    if time:
+        value, date_format = f"{value}T{time}", date_format + TIME_FORMATS[len(time)]
+    if offset:
+        # Python 3.6's %z doesn't accept Z or a colon in the offset
+        value, date_format = value + ('+0000' if offset == 'Z' else offset.replace(':', '')), date_format + '%z'
+    return datetime.datetime.strptime(value, date_format)
+
+
+def to_utc(value):
+    '''
+    Converts a date string or object into an aware UTC datetime, reading one without an offset as UTC (as maya.parse does)
+    '''
+    if isinstance(value, datetime.datetime):
+        date = value
+    elif isinstance(value, datetime.date):
+        date = datetime.datetime.combine(value, datetime.time())
+    else:
+        date = parse_date(value)
+    if date.tzinfo is None:
+        return date.replace(tzinfo=UTC)
+    return date.astimezone(UTC)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def format_date(value, date_format='%m/%d/%Y', default=None, timezone=None):
+    '''
+    Formats a date for display, e.g. in a CSV cell. Returns the default if the value is empty or not a date.
+
+    Args:
+        - value (string or date) - The date, read as UTC unless it has an offset
+        - date_format (string) - strftime format
+        - default (string) - Returned for empty or unparseable values
+        - timezone (string) - Time zone name to convert to before formatting, e.g. 'US/Eastern'
+    '''
+    if not value or not isinstance(value, (str, datetime.date)):
+        return default
+    try:
+        date = to_utc(value)
+    except (ValueError, OverflowError):
+        return default
+    if timezone:
+        date = date.astimezone(pytz.timezone(timezone))
+    return date.strftime(date_format)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_date(value, utc_offset=0):
+    '''
+    Converts a date string into an aware UTC datetime shifted back by utc_offset hours, as ensure_date returns it.
+    Raises ValueError if it isn't a date.
+    '''
+    try:
+        date = parse_date(value)
+    except ValueError:
+        # some FSBid timestamps omit their milliseconds and zone
+        date = parse_date(f"{value}.000Z")
+    return date.astimezone(UTC) - datetime.timedelta(hours=utc_offset)
+
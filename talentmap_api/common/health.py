@@ -0,0 +1,34 @@
+from health_check.backends import BaseHealthCheckBackend
+from health_check.exceptions import ServiceWarning
+
+from talentmap_api.common.oracle.base import get_pool_stats
+
+
+class DatabasePoolHealthCheck(BaseHealthCheckBackend):
+    '''
+    Reports this process' Oracle session pool usage, warning when a pool has no free sessions
+    '''
+
+    critical_service = False
+
+    def __init__(self):
+        super().__init__()
+        self.stats = {}
+
+    def check_status(self):
+        self.stats = get_pool_stats()
+        for alias, pool in self.stats.items():
+            if pool["busy"] >= pool["max"]:
+                self.add_error(ServiceWarning(f"Session pool '{alias}' is exhausted ({pool['busy']} of {pool['max']} sessions busy)"))
+
+    def pretty_status(self):
+        status = super().pretty_status()
+        if not self.stats:
+            return f"{status} (not pooled)"
+        pools = "; ".join(
+            f"{alias}: {pool['busy']} busy, {pool['opened']} open, {pool['min']}-{pool['max']} sessions" for alias, pool in self.stats.items()
+        )
+        return f"{status} ({pools})"
+
+    def identifier(self):
+        return "DatabaseSessionPool"
@@ -2,6 +2,7 @@ from django.core.management.base import BaseCommand
 
 import logging
 
+from talentmap_api.common.cache.invalidation import bump_model_version
 from talentmap_api.common.xml_helpers import CSVloader
 from talentmap_api.glossary.models import GlossaryEntry
 from talentmap_api.organization.models import Obc
@@ -25,6 +26,8 @@ class Command(BaseCommand):
         parser.add_argument('--delete', dest='delete', action='store_true', help='Delete collisions')
         parser.add_argument('--update', dest='update', action='store_true', help='Update collisions')
         parser.add_argument('--skippost', dest='skip_post', action='store_true', help='Skip post load functions')
+        parser.add_argument('--bulk', dest='bulk', action='store_true', help='Write with batched bulk queries in a single transaction')
+        parser.add_argument('--batch-size', dest='batch_size', type=int, default=500, help='Rows per bulk query when using --bulk')
 
     def handle(self, *args, **options):
         model, tag_map, collision_field, post_load_function = self.modes[options['type'][0]]()
@@ -38,14 +41,18 @@ class Command(BaseCommand):
         else:
             collision_behavior = "skip"
 
-        loader = CSVloader(model, tag_map, collision_behavior, collision_field)
+        loader = CSVloader(model, tag_map, collision_behavior, collision_field, options['bulk'], options['batch_size'])
         new_ids, updated_ids = loader.create_models_from_csv(options['file'][0])
 
+        # Bulk writes don't send model signals, so invalidate anything cached from this model (e.g. the OBC index)
+        if new_ids or updated_ids or collision_behavior == "delete":
+            bump_model_version(model)
+
         # Run the post load function, if it exists
         if callable(post_load_function) and not options['skip_post']:
             post_load_function(new_ids, updated_ids)
 
-        self.logger.info(f"CSV Load Report\n\tNew: {len(new_ids)}\n\tUpdated: {len(updated_ids)}\t\t")
+        self.logger.info(f"CSV Load Report\n\tNew: {len(new_ids)}\n\tUpdated: {len(updated_ids)}\n\tRows: {loader.rows} in {loader.elapsed:.2f}s ({loader.rows_per_second:.0f} rows/s)\t\t")
 
 
 def mode_glossary_entry():
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+import logging
+
+from talentmap_api.messaging.outbox import outbox
+
+
+class Command(BaseCommand):
+    help = 'Sends all notification emails that are due in the outbox, e.g. after an SMTP outage or from a scheduled job'
+    logger = logging.getLogger(__name__)
+
+    def handle(self, *args, **options):
+        sent = 0
+        while True:
+            claimed = outbox.send_batch()
+            if not claimed:
+                break
+            sent += claimed
+
+        stats = outbox.get_stats()
+        self.logger.info(f"Processed {sent} emails: {stats['sent']} sent, {stats['retried']} to retry, {stats['failed']} failed")
@@ -1,18 +1,24 @@
 from django.core.management.base import BaseCommand
 from django.apps import apps
+from django.db import connections
 
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 
+from talentmap_api.common.cache.invalidation import bump_model_version
 from talentmap_api.common.models import StaticRepresentationModel
 
 
 class Command(BaseCommand):
     help = 'Updates all models static string representations if supported'
     logger = logging.getLogger(__name__)
-    
+
     def add_arguments(self, parser):
         parser.add_argument('--model', nargs='?', dest="model", help='Used to specify a model to process only the specifically requested model')
-    
+        parser.add_argument('--batch-size', dest='batch_size', type=int, default=1000, help='Rows read and written per query')
+        parser.add_argument('--workers', dest='workers', type=int, default=1, help='Number of models to process in parallel')
+
     def handle(self, *args, **options):
         models = [x for x in apps.get_models() if issubclass(x, StaticRepresentationModel)]
         if options['model']:
@@ -29,9 +35,62 @@ class Command(BaseCommand):
             else:
                 print(f"The model {options['model']} is not a subclass of StaticRepresentationModel")
                 return
-        for model in models:
-            self.logger.info(f"Updating string representations for model: {model}")
-            for instance in list(model.objects.all()):
-                instance.save(force_update=True, update_fields=['_string_representation'])
 
-        self.logger.info("Updated string representations")
+        start = time.perf_counter()
+        batch_size = options['batch_size']
+        if options['workers'] > 1 and len(models) > 1:
+            with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+                totals = list(executor.map(lambda model: self.update_in_thread(model, batch_size), models))
+        else:
+            totals = [self.update_model(model, batch_size) for model in models]
+
+        scanned = sum(total[0] for total in totals)
+        changed = sum(total[1] for total in totals)
+        self.logger.info(f"Updated string representations: {changed} of {scanned} rows changed in {time.perf_counter() - start:.1f}s")
+
+    def update_in_thread(self, model, batch_size):
+        try:
+            return self.update_model(model, batch_size)
+        finally:
+            connections.close_all()
+
+    def update_model(self, model, batch_size):
+        '''
+        Recomputes a model's string representations, streaming its rows and writing back only those that changed
+
+        Returns the number of rows scanned and changed
+        '''
+        self.logger.info(f"Updating string representations for model: {model}")
+        start = time.perf_counter()
+        scanned = 0
+        changed = 0
+        pending = []
+
+        # Representations usually name related objects (e.g. a profile's user), so those are joined in
+        queryset = model.objects.select_related().order_by('pk')
+        for instance in queryset.iterator(chunk_size=batch_size):
+            scanned += 1
+            representation = str(instance)
+            if instance._string_representation != representation:
+                instance._string_representation = representation
+                pending.append(instance)
+
+            if len(pending) >= batch_size:
+                model.objects.bulk_update(pending, ['_string_representation'])
+                changed += len(pending)
+                pending = []
+
+            if scanned % (batch_size * 10) == 0:
+                self.logger.info(f"{model.__name__}: {scanned} rows scanned, {changed + len(pending)} changed ({scanned / (time.perf_counter() - start):.0f} rows/s)")
+
+        if pending:
+            model.objects.bulk_update(pending, ['_string_representation'])
+            changed += len(pending)
+
+        # bulk_update doesn't send post_save, so invalidate anything cached from this model
+        if changed:
+            bump_model_version(model)
+
+        elapsed = time.perf_counter() - start
+        self.logger.info(f"{model.__name__}: {changed} of {scanned} rows changed in {elapsed:.1f}s ({scanned / elapsed if elapsed else 0:.0f} rows/s)")
+        return (scanned, changed)
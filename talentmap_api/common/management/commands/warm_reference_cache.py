@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+import logging
+import os
+import sys
+import time
+
+from talentmap_api.fsbid.services.reference import get_reference_data, get_reference_views
+
+
+# Environment variable holding the JWT; it's read from stdin when unset, so it never appears in ps or shell history
+JWT_VARIABLE = 'WARM_CACHE_JWT'
+
+
+class Command(BaseCommand):
+    help = f'Loads the FSBid reference data (cycles, skills, grades, languages, bureaus, ...) into the shared cache. ' \
+           f'The JWT authorizing the FSBid calls is read from ${JWT_VARIABLE}, or else from stdin'
+    logger = logging.getLogger(__name__)
+
+    def add_arguments(self, parser):
+        parser.add_argument('--refresh', dest='refresh', action='store_true', help='Refetch data that is already cached')
+
+    def handle(self, *args, **options):
+        jwt_token = os.environ.get(JWT_VARIABLE) or sys.stdin.readline()
+        jwt_token = jwt_token.strip()
+        if not jwt_token:
+            raise CommandError(f"Set ${JWT_VARIABLE} or pipe the JWT on stdin")
+        failed = []
+        for view in get_reference_views():
+            start = time.perf_counter()
+            data = get_reference_data(view, jwt_token, options['refresh'])
+            if data is None:
+                failed.append(view.uri)
+                continue
+            self.logger.info(f"Cached {len(data)} rows from {view.uri} in {time.perf_counter() - start:.2f}s")
+
+        if failed:
+            self.logger.error(f"Could not cache reference data from: {', '.join(failed)}")
+        else:
+            self.logger.info("Reference cache is warm")
@@ -1,3 +1,8 @@
+from django.conf import settings
+
+from talentmap_api.fsbid.metrics import metrics, current_request, RequestUpstream
+
+
 
 class IE11Middleware:
     '''
@@ -24,5 +29,45 @@ class ExposeHeadersMiddleware:
 
     def __call__(self, request):
         response = self.get_response(request)
-        response['Access-Control-Expose-Headers'] = "Content-Disposition, Position-Limit"
+        response['Access-Control-Expose-Headers'] = "Content-Disposition, Position-Limit, Upstream-Calls, Upstream-Time"
+        return response
+
+
+class UpstreamMetricsMiddleware:
+    '''
+    Counts the FSBid calls made while serving each request, per view, and optionally
+    reports them in the Upstream-Calls and Upstream-Time (milliseconds) response headers.
+    Streamed responses (CSV exports) keep calling FSBid while their body is sent, so they are recorded once it ends;
+    their headers only count the calls made before the first byte.
+    '''
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        upstream = RequestUpstream()
+        token = current_request.set(upstream)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request.reset(token)
+
+        if settings.FSBID_UPSTREAM_TIME_HEADER:
+            response['Upstream-Calls'] = upstream.calls
+            response['Upstream-Time'] = f"{upstream.elapsed_ms:.0f}"
+        if response.streaming:
+            response.streaming_content = self.record_when_sent(response.streaming_content, request, upstream)
+        else:
+            self.record(request, upstream)
         return response
+
+    def record(self, request, upstream):
+        match = getattr(request, 'resolver_match', None)
+        if match is not None:
+            metrics.record_request(match.view_name or match._func_path, upstream)
+
+    def record_when_sent(self, content, request, upstream):
+        try:
+            yield from content
+        finally:
+            self.record(request, upstream)
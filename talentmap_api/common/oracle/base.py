@@ -0,0 +1,122 @@
+'''
+Oracle database backend with connection health checks and optional cx_Oracle session pooling.
+
+Django 3.2 reuses a persistent connection (CONN_MAX_AGE) without checking it is still alive, so a session the database
+or a firewall dropped only fails on its next query. With CONN_HEALTH_CHECKS, the first query of each request pings a
+reused connection and reconnects if the ping fails.
+
+With a POOL setting, connections are acquired from a per-process cx_Oracle SessionPool and released back to it when
+Django closes them, instead of each connect and close doing a full Oracle login/logoff.
+'''
+import logging
+import threading
+
+from django.db.backends.oracle import base
+from django.db.backends.oracle.utils import dsn
+
+logger = logging.getLogger(__name__)
+
+Database = base.Database
+
+# Session pools keyed by database alias, shared by every thread of the process
+pools = {}
+pools_lock = threading.Lock()
+
+
+def get_pool(alias, settings_dict, conn_params):
+    pool = pools.get(alias)
+    if pool is None:
+        with pools_lock:
+            pool = pools.get(alias)
+            if pool is None:
+                options = settings_dict['POOL']
+                params = dict(conn_params)
+                params['threaded'] = True
+                pool = Database.SessionPool(
+                    settings_dict['USER'],
+                    settings_dict['PASSWORD'],
+                    dsn(settings_dict),
+                    options.get('min', 1),
+                    options.get('max', 10),
+                    options.get('increment', 1),
+                    getmode=Database.SPOOL_ATTRVAL_WAIT,
+                    **params
+                )
+                pools[alias] = pool
+                logger.info(f"Created Oracle session pool for '{alias}' ({pool.min} to {pool.max} sessions)")
+    return pool
+
+
+def get_pool_stats():
+    '''
+    Returns the size and usage of this process' session pools
+    '''
+    with pools_lock:
+        items = list(pools.items())
+    return {
+        alias: {
+            "min": pool.min,
+            "max": pool.max,
+            "increment": pool.increment,
+            "opened": pool.opened,
+            "busy": pool.busy,
+        } for alias, pool in items
+    }
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.health_check_done = False
+        self.health_check_failed = False
+
+    @property
+    def health_check_enabled(self):
+        return self.settings_dict.get('CONN_HEALTH_CHECKS', False)
+
+    @property
+    def pool(self):
+        if not self.settings_dict.get('POOL'):
+            return None
+        return get_pool(self.alias, self.settings_dict, self.get_connection_params())
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        return pool.acquire()
+
+    def connect(self):
+        super().connect()
+        # a brand new connection doesn't need checking
+        self.health_check_done = True
+        self.health_check_failed = False
+
+    def _close(self):
+        if self.connection is not None and self.settings_dict.get('POOL'):
+            with self.wrap_database_errors:
+                if self.health_check_failed:
+                    # don't hand a dead session to the next caller
+                    return self.pool.drop(self.connection)
+                return self.pool.release(self.connection)
+        return super()._close()
+
+    def close_if_health_check_failed(self):
+        if self.connection is None or not self.health_check_enabled or self.health_check_done:
+            return
+        if not self.is_usable():
+            logger.info(f"Replacing an unusable '{self.alias}' database connection")
+            self.health_check_failed = True
+            self.close()
+        self.health_check_done = True
+
+    def close_if_unusable_or_obsolete(self):
+        # runs at the start and end of every request; the next query checks the connection again
+        if self.connection is not None:
+            self.health_check_done = False
+        super().close_if_unusable_or_obsolete()
+
+    def _cursor(self, name=None):
+        self.close_if_health_check_failed()
+        return super()._cursor(name)
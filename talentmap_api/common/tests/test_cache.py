@@ -0,0 +1,43 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from model_mommy import mommy
+from django.contrib.auth.models import AnonymousUser, Group
+from django.core.cache.backends.locmem import LocMemCache
+
+from talentmap_api.common.cache.key_constructor import key_func
+from talentmap_api.common.cache.invalidation import get_model_versions, track_models, record_access, get_access_stats
+
+
+def get_key(user, view_instance=None):
+    request = Mock(path="/api/v1/cycleposition/", GET={"q": "german"}, user=user)
+    return key_func(view_instance=view_instance or Mock(spec=[]), view_method=Mock(__name__="list"), request=request, args=(), kwargs={})
+
+
+@pytest.mark.django_db()
+def test_cache_key_is_user_and_role_aware():
+    user = mommy.make('auth.User')
+    other = mommy.make('auth.User')
+    assert get_key(user) == get_key(user)
+    assert get_key(user) != get_key(other)
+    assert get_key(user) != get_key(AnonymousUser())
+
+    key = get_key(user)
+    user.groups.add(mommy.make(Group, name="cdo"))
+    assert get_key(user) != key
+
+
+@pytest.mark.django_db()
+def test_cache_versions_bump_on_write():
+    with patch('talentmap_api.common.cache.invalidation.cache', LocMemCache('cache-test', {})):
+        track_models([Group])
+        versions = get_model_versions([Group])
+        assert get_model_versions([Group]) == versions
+
+        mommy.make(Group, name="bureau")
+        assert get_model_versions([Group]) != versions
+
+        record_access("TestView", False)
+        record_access("TestView", True)
+        record_access("TestView", True)
+        assert get_access_stats(["TestView"])["TestView"] == {"hits": 2, "misses": 1, "hit_ratio": 0.667}
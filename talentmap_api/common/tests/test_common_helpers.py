@@ -96,3 +96,46 @@ def test_in_superuser_group(authorized_user):
 
     # Should not raise an exception
     assert in_superuser_group(authorized_user)
+
+
+@pytest.mark.django_db()
+def test_user_group_names_cached_until_membership_changes(authorized_user, django_assert_num_queries):
+    from unittest.mock import patch
+    from django.contrib.auth.models import User
+    from django.core.cache.backends.locmem import LocMemCache
+    from talentmap_api.common.common_helpers import user_in_any_group
+
+    from django.test import override_settings
+
+    group = mommy.make('auth.Group', name="cached_group")
+    locmem = LocMemCache('user-groups', {})
+    # stands in for a shared backend; per-process backends don't share group names between requests
+    with patch('talentmap_api.common.common_helpers.cache', locmem), patch('talentmap_api.common.cache.invalidation.cache', locmem), \
+            override_settings(USER_GROUPS_CACHE_TIMEOUT=300):
+        assert not user_in_any_group(authorized_user, ["cached_group", "superuser"])
+
+        # a fresh user object, as on the next request, reads its groups from the cache
+        user = User.objects.get(id=authorized_user.id)
+        with django_assert_num_queries(0):
+            assert not in_superuser_group(user)
+            assert not user_in_any_group(user, ["cached_group"])
+
+        group.user_set.add(authorized_user)
+        assert user_in_any_group(user, ["cached_group"])
+        in_group_or_403(User.objects.get(id=authorized_user.id), "cached_group")
+
+
+@pytest.mark.django_db()
+def test_user_group_names_not_shared_without_shared_cache(authorized_user):
+    from django.contrib.auth.models import User
+    from django.test import override_settings
+    from talentmap_api.common.common_helpers import user_in_any_group
+
+    group = mommy.make('auth.Group', name="uncached_group")
+    with override_settings(USER_GROUPS_CACHE_TIMEOUT=0):
+        group.user_set.add(authorized_user)
+        assert user_in_any_group(User.objects.get(id=authorized_user.id), ["uncached_group"])
+
+        # a removal made by another process is seen by the next request's user
+        User.groups.through.objects.filter(user_id=authorized_user.id, group_id=group.id).delete()
+        assert not user_in_any_group(User.objects.get(id=authorized_user.id), ["uncached_group"])
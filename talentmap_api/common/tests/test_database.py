@@ -0,0 +1,32 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from django.db import connection
+
+from talentmap_api.common.health import DatabasePoolHealthCheck
+
+
+@pytest.mark.django_db()
+def test_reused_connection_is_checked_once_per_request():
+    connection.ensure_connection()
+    connection.health_check_done = False
+    with patch.object(connection, 'is_usable', return_value=True) as mock_is_usable, \
+            patch.dict(connection.settings_dict, {'CONN_HEALTH_CHECKS': True}):
+        for _ in range(2):
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM DUAL")
+        assert mock_is_usable.call_count == 1
+
+
+def test_pool_health_check_warns_when_exhausted():
+    pool = Mock(min=2, max=4, increment=1, opened=4, busy=4)
+    with patch.dict('talentmap_api.common.oracle.base.pools', {'default': pool}):
+        check = DatabasePoolHealthCheck()
+        check.run_check()
+        assert len(check.errors) == 1
+        assert "4 busy" in check.pretty_status()
+
+    check = DatabasePoolHealthCheck()
+    check.run_check()
+    assert not check.errors
+    assert check.pretty_status() == "working (not pooled)"
@@ -80,3 +80,29 @@ def test_csv_glossary_loading():
     assert item1.link == ""
     assert item2.link == "link2"
     assert item3.link == "link3"
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("behavior", [None, '--delete', '--update'])
+def test_csv_bulk_collisions(behavior):
+    start = GlossaryEntry.objects.create(title="item1", link="link1", definition="")
+
+    args = [os.path.join(settings.BASE_DIR, 'talentmap_api', 'data', 'test_data', 'test_glossary.csv'), 'glossary', '--bulk', '--batch-size', '2']
+    if behavior:
+        args.append(behavior)
+    call_command('load_csv', *args)
+
+    assert GlossaryEntry.objects.count() == 3
+    assert GlossaryEntry.objects.get(title="item3").definition == "def3"
+
+    item1 = GlossaryEntry.objects.get(title="item1")
+    if behavior is None:
+        assert item1.id == start.id
+        assert item1.link == "link1"
+    elif behavior == '--delete':
+        assert item1.id != start.id
+        assert item1.link == ""
+    else:
+        assert item1.id == start.id
+        assert item1.link == ""
+        assert item1.definition == "def1"
@@ -0,0 +1,26 @@
+import pytest
+
+from django.core.management import call_command
+
+from talentmap_api.common.cache.invalidation import get_model_versions
+from talentmap_api.organization.models import Obc
+
+
+@pytest.mark.django_db()
+def test_update_string_representations_only_writes_changed_rows(django_assert_num_queries):
+    for code in ["A", "B", "C"]:
+        Obc.objects.create(code=code)
+    Obc.objects.filter(code__in=["A", "C"]).update(_string_representation="stale")
+    version = get_model_versions([Obc])['organization.obc']
+
+    call_command('update_string_representations', '--model', 'organization.Obc', '--batch-size', '2')
+
+    # cached responses built from the stale representations are invalidated
+    assert get_model_versions([Obc])['organization.obc'] != version
+
+    for obc in Obc.objects.all():
+        assert obc._string_representation == str(obc)
+
+    # nothing changed, so nothing is written
+    with django_assert_num_queries(1):
+        call_command('update_string_representations', '--model', 'organization.Obc')
@@ -4,11 +4,18 @@ This file contains helpers for loading data into the database from XML files
 
 import logging
 import csv
+import time
+
+from django.db import transaction
+
+from talentmap_api.common.models import StaticRepresentationModel
+
+logger = logging.getLogger(__name__)
 
 
 class CSVloader():
 
-    def __init__(self, model, tag_map, collision_behavior=None, collision_field=None):
+    def __init__(self, model, tag_map, collision_behavior=None, collision_field=None, bulk=False, batch_size=500):
         '''
         Instantiates the CSVloader
 
@@ -17,12 +24,42 @@ class CSVloader():
             tag_map (dict) - A dictionary defining what CSV column headers map to which model fields
             collision_behavior (str) - What to do when a collision is detected (update or delete)
             collision_field (str) - The field to detect collisions on
+            bulk (bool) - Whether to write with batched bulk queries in one transaction, rather than row by row
+            batch_size (int) - Rows per bulk query
         '''
 
         self.model = model
         self.tag_map = tag_map
         self.collision_behavior = collision_behavior
         self.collision_field = collision_field
+        self.bulk = bulk
+        self.batch_size = batch_size
+        self.rows = 0
+        self.elapsed = 0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0
+
+    def read_instances(self, csv_filepath):
+        '''
+        Yields an unsaved instance for each line of the CSV file, as it is read
+        '''
+        with open(csv_filepath, 'r', encoding='utf-8-sig') as csv_file:
+            for line in csv.DictReader(csv_file):
+                self.rows += 1
+                instance = self.model()
+                for key in line.keys():
+                    # If we have a matching entry, and the map is not a callable,
+                    # set the instance's property to that value
+                    if not callable(self.tag_map[key]):
+                        data = line[key]
+                        if data and len(data.strip()) > 0:
+                            setattr(instance, self.tag_map[key], data)
+                    else:
+                        # Tag map is a callable, so call it with instance + item
+                        self.tag_map[key](instance, line[key])
+                yield instance
 
     def create_models_from_csv(self, csv_filepath):
         '''
@@ -36,65 +73,144 @@ class CSVloader():
             list: The list of new instance ids
             list: The list of updated instance ids
         '''
+        start = time.perf_counter()
+        self.rows = 0
+        if self.bulk:
+            result = self.bulk_load(csv_filepath)
+        else:
+            result = self.load(csv_filepath)
+        self.elapsed = time.perf_counter() - start
+        return result
 
+    def load(self, csv_filepath):
         # A list of instances to instantiate with a bulk create
         new_instances = []
 
         # A list of updated instance id's
         updated_instances = []
 
-        # Parse the CSV
-        with open(csv_filepath, 'r', encoding='utf-8-sig') as csv_file:
-            for line in csv.DictReader(csv_file):
-                instance = self.model()
-                for key in line.keys():
-                    # If we have a matching entry, and the map is not a callable,
-                    # set the instance's property to that value
-                    if not callable(self.tag_map[key]):
-                        data = line[key]
-                        if data and len(data.strip()) > 0:
-                            setattr(instance, self.tag_map[key], data)
-                    else:
-                        # Tag map is a callable, so call it with instance + item
-                        self.tag_map[key](instance, line[key])
+        for instance in self.read_instances(csv_filepath):
+            # Check for collisions
+            if self.collision_field:
+                q_kwargs = {}
+                q_kwargs[self.collision_field] = getattr(instance, self.collision_field)
+                collisions = type(instance).objects.filter(**q_kwargs)
+                if collisions.count() > 1:
+                    logger.warn(f"Looking for collision on {type(instance).__name__}, field {self.collision_field}, value {getattr(instance, self.collision_field)}; found {collisions.count()}. Skipping item.")
+                    continue
+                elif collisions.count() == 1:
+                    # We have exactly one collision, so handle it
+                    if self.collision_behavior == 'delete':
+                        collisions.delete()
+                        new_instances.append(instance)
+                    elif self.collision_behavior == 'update':
+                        # Update our collided instance
+                        collisions.update(**self.get_update_dict(instance))
+                        updated_instances.append(collisions.first().id)
+                        continue
+                    elif self.collision_behavior == 'skip':
+                        # Skip this instance, because it already exists
+                        continue
+                else:
+                    new_instances.append(instance)
+            else:
+                # Append our instance
+                new_instances.append(instance)
+
+        # We want to call the save() logic on each new instance
+        for instance in new_instances:
+            instance.save()
+        new_instances = [instance.id for instance in new_instances]
+
+        # Create our instances
+        return (new_instances, updated_instances)
+
+    def get_update_dict(self, instance):
+        update_dict = dict(instance.__dict__)
+        del update_dict["id"]
+        del update_dict["_state"]
+        # strip out any "null" values from the update dict; when we parse the CSVs we set nulls where empty
+        # and this sometimes will inadvertently overwrite data we want to keep
+        return {k: v for k, v in update_dict.items() if v is not None}
+
+    def bulk_load(self, csv_filepath):
+        '''
+        Same as load, but collisions are found in one prefetched query and rows are written in batches
+        of bulk queries, all in one transaction
+        '''
+        new_instances = []
+        updated_instances = []
+
+        # collision value -> ids of the existing rows holding it
+        existing = {}
+        if self.collision_field:
+            for value, pk in self.model.objects.values_list(self.collision_field, 'id').iterator():
+                existing.setdefault(value, []).append(pk)
+        seen = set()
+
+        to_create = []
+        to_delete = []
+        # fields updated -> instances, since bulk_update writes the same fields for every row
+        to_update = {}
+
+        def flush():
+            if to_delete:
+                self.model.objects.filter(id__in=to_delete).delete()
+                to_delete.clear()
+            for fields, instances in to_update.items():
+                self.model.objects.bulk_update(instances, fields, batch_size=self.batch_size)
+                updated_instances.extend(instance.id for instance in instances)
+            to_update.clear()
+            if to_create:
+                new_instances.extend(self.bulk_create(to_create))
+                to_create.clear()
+
+        with transaction.atomic():
+            for instance in self.read_instances(csv_filepath):
+                if isinstance(instance, StaticRepresentationModel):
+                    # bulk_create skips save(), which normally sets this
+                    instance._string_representation = str(instance)
 
-                # Check for collisions
                 if self.collision_field:
-                    q_kwargs = {}
-                    q_kwargs[self.collision_field] = getattr(instance, self.collision_field)
-                    collisions = type(instance).objects.filter(**q_kwargs)
-                    if collisions.count() > 1:
-                        logging.getLogger(__name__).warn(f"Looking for collision on {type(instance).__name__}, field {self.collision_field}, value {getattr(instance, self.collision_field)}; found {collisions.count()}. Skipping item.")
+                    value = getattr(instance, self.collision_field)
+                    if value in seen:
+                        logger.warn(f"Duplicate {self.collision_field} {value} in {csv_filepath}. Skipping item.")
                         continue
-                    elif collisions.count() == 1:
-                        # We have exactly one collision, so handle it
+                    seen.add(value)
+
+                    collisions = existing.get(value, [])
+                    if len(collisions) > 1:
+                        logger.warn(f"Looking for collision on {type(instance).__name__}, field {self.collision_field}, value {value}; found {len(collisions)}. Skipping item.")
+                        continue
+                    elif len(collisions) == 1:
                         if self.collision_behavior == 'delete':
-                            collisions.delete()
-                            new_instances.append(instance)
+                            to_delete.append(collisions[0])
+                            to_create.append(instance)
                         elif self.collision_behavior == 'update':
-                            # Update our collided instance
-                            update_dict = dict(instance.__dict__)
-                            del update_dict["id"]
-                            del update_dict["_state"]
-                            # strip out any "null" values from the update dict; when we parse the CSVs we set nulls where empty
-                            # and this sometimes will inadvertently overwrite data we want to keep
-                            update_dict = {k: v for k, v in update_dict.items() if v is not None}
-                            collisions.update(**update_dict)
-                            updated_instances.append(collisions.first().id)
-                            continue
+                            update_dict = self.get_update_dict(instance)
+                            instance.id = collisions[0]
+                            to_update.setdefault(tuple(sorted(update_dict)), []).append(instance)
                         elif self.collision_behavior == 'skip':
-                            # Skip this instance, because it already exists
                             continue
                     else:
-                        new_instances.append(instance)
+                        to_create.append(instance)
                 else:
-                    # Append our instance
-                    new_instances.append(instance)
+                    to_create.append(instance)
 
-        # We want to call the save() logic on each new instance
-        for instance in new_instances:
-            instance.save()
-        new_instances = [instance.id for instance in new_instances]
+                if len(to_create) + len(to_delete) + sum(map(len, to_update.values())) >= self.batch_size:
+                    flush()
+            flush()
 
-        # Create our instances
         return (new_instances, updated_instances)
+
+    def bulk_create(self, instances):
+        '''
+        Inserts the instances, returning their ids
+        '''
+        created = self.model.objects.bulk_create(instances, batch_size=self.batch_size)
+        ids = [instance.id for instance in created]
+        if None in ids and self.collision_field:
+            # the backend can't return ids from a bulk insert (e.g. Oracle), so look them up by collision value
+            values = [getattr(instance, self.collision_field) for instance in instances]
+            ids = list(self.model.objects.filter(**{f"{self.collision_field}__in": values}).values_list('id', flat=True))
+        return [pk for pk in ids if pk is not None]
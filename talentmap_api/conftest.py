@@ -1,3 +1,5 @@
+import os
+
 import pytest
 from model_mommy import mommy
 from django.conf import settings
@@ -17,10 +19,21 @@ def authorized_client(client):
     return client
 
 
-def pytest_configure():
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'benchmark: times an optimized path against the code it replaced; run with RUN_BENCHMARKS=1')
     test_cache = {
         'default': {
             'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
         }
     }
     settings.CACHES = test_cache
+
+
+def pytest_collection_modifyitems(config, items):
+    # wall-clock comparisons are too noisy for shared CI runners, so benchmarks are opt-in
+    if os.environ.get('RUN_BENCHMARKS'):
+        return
+    skip = pytest.mark.skip(reason="benchmarks only run with RUN_BENCHMARKS=1")
+    for item in items:
+        if 'benchmark' in item.keywords:
+            item.add_marker(skip)
@@ -0,0 +1,159 @@
+'''
+In-process instrumentation of FSBid upstream calls.
+
+The transport records every call here: latency histograms, payload sizes and error counts per endpoint
+(and per stored procedure for BackOffice CRUD calls). The upstream middleware tracks how many calls, and
+how much upstream time, each inbound request spent so that N+1 fan-out shows up per view.
+Figures are per worker process and reset when it restarts.
+'''
+import contextvars
+import re
+import threading
+from urllib.parse import urlsplit, parse_qs
+
+from django.conf import settings
+
+# Upper bounds, in milliseconds, of the latency histogram buckets
+LATENCY_BUCKETS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float('inf'))
+
+# Upstream calls per inbound request histogram buckets
+CALLS_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, float('inf'))
+
+# Path segments that identify a record rather than an endpoint, e.g. /v1/clients/123456/
+ID_SEGMENT = re.compile(r'^(\d+|[0-9a-fA-F-]{32,36})$')
+
+current_request = contextvars.ContextVar('fsbid_current_request', default=None)
+
+
+def get_bucket_label(bound):
+    return "+Inf" if bound == float('inf') else str(bound)
+
+
+def new_histogram(buckets):
+    return {get_bucket_label(bound): 0 for bound in buckets}
+
+
+def observe(histogram, buckets, value):
+    for bound in buckets:
+        if value <= bound:
+            histogram[get_bucket_label(bound)] += 1
+            return
+
+
+def get_endpoint(root, method, url):
+    '''
+    Groups a call by root, verb and templated path; BackOffice CRUD calls are grouped by stored procedure
+    '''
+    parts = urlsplit(url)
+    if root == 'BACKOFFICE_CRUD_URL':
+        params = parse_qs(parts.query)
+        procedure = '.'.join(filter(None, [params.get('packageName', [None])[0], params.get('procName', [None])[0]]))
+        if procedure:
+            return f"{method} {root} proc:{procedure}"
+    path = '/'.join('{id}' if ID_SEGMENT.match(segment) else segment for segment in parts.path.split('/'))
+    return f"{method} {root} {path}"
+
+
+class RequestUpstream:
+    '''
+    Upstream calls made on behalf of one inbound request, shared with the worker threads it fans out to
+    '''
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.elapsed_ms = 0.0
+
+    def add(self, elapsed_ms):
+        with self.lock:
+            self.calls += 1
+            self.elapsed_ms += elapsed_ms
+
+
+class UpstreamMetrics:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.endpoints = {}
+            self.views = {}
+
+    def record_call(self, root, method, url, elapsed_ms, status_code=None, request_bytes=0, response_bytes=0, error=None):
+        request = current_request.get()
+        if request is not None:
+            request.add(elapsed_ms)
+        if not settings.FSBID_METRICS_ENABLED:
+            return
+
+        endpoint = get_endpoint(root, method, url)
+        failed = error is not None or (isinstance(status_code, int) and status_code >= 400)
+        with self.lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None:
+                stats = self.endpoints[endpoint] = {
+                    "calls": 0,
+                    "errors": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "latency_ms": new_histogram(LATENCY_BUCKETS),
+                    "request_bytes": 0,
+                    "response_bytes": 0,
+                    "max_response_bytes": 0,
+                    "last_error": None,
+                }
+            stats["calls"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            observe(stats["latency_ms"], LATENCY_BUCKETS, elapsed_ms)
+            stats["request_bytes"] += request_bytes
+            stats["response_bytes"] += response_bytes
+            stats["max_response_bytes"] = max(stats["max_response_bytes"], response_bytes)
+            if failed:
+                stats["errors"] += 1
+                stats["last_error"] = error or f"HTTP {status_code}"
+
+    def record_request(self, view, upstream):
+        if not settings.FSBID_METRICS_ENABLED:
+            return
+        with self.lock:
+            stats = self.views.get(view)
+            if stats is None:
+                stats = self.views[view] = {
+                    "requests": 0,
+                    "upstream_calls": 0,
+                    "max_upstream_calls": 0,
+                    "upstream_ms": 0.0,
+                    "calls_per_request": new_histogram(CALLS_BUCKETS),
+                }
+            stats["requests"] += 1
+            stats["upstream_calls"] += upstream.calls
+            stats["max_upstream_calls"] = max(stats["max_upstream_calls"], upstream.calls)
+            stats["upstream_ms"] += upstream.elapsed_ms
+            observe(stats["calls_per_request"], CALLS_BUCKETS, upstream.calls)
+
+    def snapshot(self):
+        '''
+        Returns the endpoint and view figures, slowest endpoints and chattiest views first
+        '''
+        with self.lock:
+            endpoints = {name: dict(stats, latency_ms=dict(stats["latency_ms"])) for name, stats in self.endpoints.items()}
+            views = {name: dict(stats, calls_per_request=dict(stats["calls_per_request"])) for name, stats in self.views.items()}
+
+        for stats in endpoints.values():
+            stats["avg_ms"] = round(stats["total_ms"] / stats["calls"], 1)
+            stats["error_rate"] = round(stats["errors"] / stats["calls"], 3)
+            stats["avg_response_bytes"] = stats["response_bytes"] // stats["calls"]
+        for stats in views.values():
+            stats["avg_upstream_calls"] = round(stats["upstream_calls"] / stats["requests"], 1)
+            stats["avg_upstream_ms"] = round(stats["upstream_ms"] / stats["requests"], 1)
+
+        return {
+            "endpoints": dict(sorted(endpoints.items(), key=lambda e: e[1]["total_ms"], reverse=True)),
+            "views": dict(sorted(views.items(), key=lambda v: v[1]["upstream_calls"], reverse=True)),
+        }
+
+
+metrics = UpstreamMetrics()
@@ -1,13 +1,204 @@
+'''
+Pooled HTTP transport for FSBid.
+
+Every service imports ``requests`` from this module and calls ``requests.get/post/put/patch/delete``
+exactly as it would with the requests library. Calls are routed by URL to a keep-alive session that
+belongs to the configured FSBid root (WS_ROOT_API_URL, CP_API_V2_URL, BACKOFFICE_CRUD_URL, ...), so
+each upstream gets its own tuned connection pool, timeouts and retry policy.
+'''
+import logging
+import threading
+import time
+from http import cookiejar
+
+import requests as r
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 from django.conf import settings
 
+from talentmap_api.fsbid.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
 CERT = settings.HRONLINE_CERT
-if CERT:
-    import requests as r
-    requests = r.Session()
-    requests.verify = CERT
-else:
-    import requests
-    # TODO - figure out why this breaks tests
-    # import requests as r
-    # requests = r.Session()
-    # requests.verify = False
+
+# Settings holding the FSBid roots that get a dedicated connection pool
+FSBID_ROOTS = [
+    'WS_ROOT_API_URL',
+    'BACKOFFICE_CRUD_URL',
+    'SECREF_URL',
+    'EMPLOYEES_API_URL',
+    'CP_API_URL',
+    'CP_API_V2_URL',
+    'ORG_API_URL',
+    'CLIENTS_API_URL',
+    'CLIENTS_API_V2_URL',
+    'PV_API_URL',
+    'PV_API_V2_URL',
+    'PV_API_V3_URL',
+    'TP_API_URL',
+    'AGENDA_API_URL',
+    'PANEL_API_URL',
+    'PERSON_API_URL',
+    'BIDS_API_V2_URL',
+    'POSITIONS_API_URL',
+    'POSITIONS_API_V2_URL',
+    'PUBLISHABLE_POSITIONS_API_URL',
+    'PUBLISHABLE_POSITIONS_API_V2_URL',
+]
+
+DEFAULT_ROOT = 'default'
+
+# Reads are retried after read timeouts and gateway errors. Writes (including PUT/DELETE, e.g. bid submit or
+# handshake register) only retry connection errors, since FSBid may have applied one whose response was lost
+READ_METHODS = frozenset(['HEAD', 'GET', 'OPTIONS'])
+RETRY_STATUSES = (502, 503, 504)
+
+
+class BlockAllCookies(cookiejar.CookiePolicy):
+    '''
+    Sessions are shared by every user of a worker, so never persist upstream cookies between calls
+    '''
+    return_ok = set_ok = domain_return_ok = path_return_ok = lambda self, *args, **kwargs: False
+    netscape = True
+    rfc2965 = hide_cookie2 = False
+
+
+def get_root_options(root):
+    '''
+    Merges the transport defaults with any overrides configured for the given root
+    '''
+    return {
+        **settings.FSBID_TRANSPORT_DEFAULTS,
+        **settings.FSBID_TRANSPORT_ROOTS.get(root, {}),
+    }
+
+
+class FSBidTransport:
+    '''
+    Drop-in replacement for the requests module that keeps one pooled session per FSBid root
+    '''
+
+    def __init__(self, roots=FSBID_ROOTS):
+        self._lock = threading.Lock()
+        self._sessions = {}
+        # longest prefix first so that e.g. CP_API_V2_URL wins over WS_ROOT_API_URL
+        prefixes = [(getattr(settings, root, None), root) for root in roots]
+        self._prefixes = sorted([p for p in prefixes if p[0]], key=lambda p: len(p[0]), reverse=True)
+
+    def resolve_root(self, url):
+        for prefix, root in self._prefixes:
+            if url.startswith(prefix):
+                return root
+        return DEFAULT_ROOT
+
+    def _build_session(self, root):
+        options = get_root_options(root)
+        retry = Retry(
+            total=options['retries'],
+            connect=options['retries'],
+            read=options['retries'],
+            status=options['retries'],
+            backoff_factor=options['backoff_factor'],
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=READ_METHODS,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=options['pool_connections'],
+            pool_maxsize=options['pool_maxsize'],
+            pool_block=options['pool_block'],
+            max_retries=retry,
+        )
+        session = r.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.cookies.set_policy(BlockAllCookies())
+        if CERT:
+            session.verify = CERT
+        return session
+
+    def get_session(self, root):
+        session = self._sessions.get(root)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(root)
+                if session is None:
+                    session = self._build_session(root)
+                    self._sessions[root] = session
+        return session
+
+    def request(self, method, url, **kwargs):
+        root = self.resolve_root(url)
+        if 'timeout' not in kwargs:
+            options = get_root_options(root)
+            kwargs['timeout'] = (options['connect_timeout'], options['read_timeout'])
+
+        start = time.perf_counter()
+        try:
+            response = self.get_session(root).request(method, url, **kwargs)
+        except Exception as e:
+            metrics.record_call(root, method, url, (time.perf_counter() - start) * 1000, error=type(e).__name__)
+            raise
+        metrics.record_call(
+            root,
+            method,
+            url,
+            (time.perf_counter() - start) * 1000,
+            response.status_code,
+            len(response.request.body or b'') if response.request is not None else 0,
+            len(response.content or b''),
+        )
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request('PATCH', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request('HEAD', url, **kwargs)
+
+    def get_pool_stats(self):
+        '''
+        Returns the configuration and live connection pool usage for every root that has been used
+        '''
+        with self._lock:
+            sessions = dict(self._sessions)
+        stats = {}
+        for root, session in sessions.items():
+            options = get_root_options(root)
+            pools = []
+            for adapter in set(session.adapters.values()):
+                manager = adapter.poolmanager
+                for key in manager.pools.keys():
+                    pool = manager.pools.get(key)
+                    if pool is None:
+                        continue
+                    pools.append({
+                        "host": f"{pool.scheme}://{pool.host}:{pool.port}",
+                        "num_connections": pool.num_connections,
+                        "num_requests": pool.num_requests,
+                        "idle_connections": pool.pool.qsize() if pool.pool else 0,
+                        "maxsize": pool.pool.maxsize if pool.pool else 0,
+                    })
+            stats[root] = {
+                "url": getattr(settings, root, None),
+                "options": options,
+                "pools": pools,
+            }
+        return stats
+
+
+requests = FSBidTransport()
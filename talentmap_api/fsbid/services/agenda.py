@@ -1,14 +1,12 @@
-import csv
 import logging
 from functools import partial
+from itertools import chain
 from urllib.parse import urlencode, quote
-from datetime import datetime
 import jwt
 import pydash
 
 from django.conf import settings
 from django.http import QueryDict
-from django.http import HttpResponse
 from django.utils.encoding import smart_str
 
 from talentmap_api.fsbid.services import common as services
@@ -428,12 +426,13 @@ def get_agenda_item_history_csv(query, jwt_token, host, limit=None):
         "query_mapping_function": convert_agenda_item_query,
         "jwt_token": jwt_token,
         "mapping_function": fsbid_single_agenda_item_to_talentmap_single_agenda_item,
-        "host": host,
-        "use_post": False,
         "base_url": AGENDA_API_ROOT,
+        # same cap as a single unpaged request
+        "limit": limit or query.get("limit", 1000),
+        "use_post": False,
     }
 
-    data = services.send_get_csv_request(
+    data = services.send_get_csv_pages(
         **args
     )
 
@@ -1156,11 +1155,11 @@ def get_agendas_by_panel(pk, jwt_token):
     '''
     Get agendas for panel meeting
     '''
-    skillUrl = f"{API_ROOT}/v1/references/skills"
-    skills = requests.get(skillUrl, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'}).json()
+    from talentmap_api.fsbid.services.reference import get_skills
+
     skills_lookup = {}
-    for skill in skills["Data"]:
-            skills_lookup[skill["skl_code"]] = skill["skill_descr"]
+    for skill in get_skills(jwt_token):
+        skills_lookup[skill["skl_code"]] = skill["skill_descr"]
     args = {
         "uri": f"{pk}/agendas",
         "query": {},
@@ -1241,13 +1240,7 @@ def get_agendas_by_panel_export(pk, jwt_token, host=None):
 
     data = services.send_get_request(**args)
 
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f"attachment; filename=panel_meeting_agendas_{datetime.now().strftime('%Y_%m_%d_%H%M%S')}.csv"
-
-    writer = csv.writer(response, csv.excel)
-    response.write(u'\ufeff'.encode('utf8'))
-
-    writer.writerow([
+    rows = [[
         smart_str(u"Position Title"),
         smart_str(u"Position Number"),
         smart_str(u"Org"),
@@ -1258,11 +1251,9 @@ def get_agendas_by_panel_export(pk, jwt_token, host=None):
         smart_str(u"Panel Date"),
         smart_str(u"Status"),
         smart_str(u"Remarks"),
-    ])
+    ]]
 
-    writer.writerows(data['results'])
-
-    return response
+    return services.stream_csv_response(chain(rows, data['results']), "panel_meeting_agendas")
 
 def get_vice_data(pos_seq_nums, jwt_token):
     args = {
@@ -14,6 +14,7 @@ import jwt
 import maya
 import pydash
 
+from talentmap_api.common.dates import format_date
 from talentmap_api.fsbid.services import common as services
 
 
@@ -26,11 +27,11 @@ def get_agenda_employees(query, jwt_token=None, host=None):
     '''
     Get employees
     '''
-    from talentmap_api.fsbid.services.cdo import cdo
+    from talentmap_api.fsbid.services.cdo import get_cdo_directory
     try:
-        cdos = list(cdo(jwt_token))
+        cdos = get_cdo_directory(jwt_token)
     except:
-        cdos = []
+        cdos = {}
     args = {
         "uri": "v1/tm-persons",
         "query": query,
@@ -67,12 +68,12 @@ def get_agenda_employees_count(query, jwt_token, host=None, use_post=False):
 
 def get_agenda_employees_csv(query, jwt_token, rl_cd, host=None):
     from talentmap_api.fsbid.services.common import send_get_csv_request, mapBool
-    from talentmap_api.fsbid.services.cdo import cdo
+    from talentmap_api.fsbid.services.cdo import get_cdo_directory
     ad_id = jwt.decode(jwt_token, verify=False).get('unique_name')
     try:
-        cdos = list(cdo(jwt_token))
+        cdos = get_cdo_directory(jwt_token)
     except:
-        cdos = []
+        cdos = {}
     csvQuery = deepcopy(query)
     csvQuery['page'] = 1
     csvQuery['limit'] = 500
@@ -110,14 +111,8 @@ def get_agenda_employees_csv(query, jwt_token, rl_cd, host=None):
 
     for record in data:
         fallback = 'None listed'
-        try:
-            ted = smart_str(maya.parse(record["currentAssignment"]["TED"]).datetime().strftime('%m/%d/%Y'))
-        except:
-            ted = fallback
-        try:
-            panelMeetingDate = smart_str(maya.parse(record["agenda"]["panelDate"]).datetime().strftime('%m/%d/%Y'))
-        except:
-            panelMeetingDate = fallback
+        ted = smart_str(format_date(pydash.get(record, 'currentAssignment.TED'), default=fallback))
+        panelMeetingDate = smart_str(format_date(pydash.get(record, 'agenda.panelDate'), default=fallback))
 
         hasHandshake = True if pydash.get(record, 'hsAssignment.orgDescription') else False
 
@@ -200,7 +195,7 @@ def convert_agenda_employees_query(query):
     valuesToReturn = pydash.omit_by(values, lambda o: o is None or o == [])
     return urlencode(valuesToReturn, doseq=True, quote_via=quote)
 
-def fsbid_agenda_employee_to_talentmap_agenda_employee(data, cdos=[]):
+def fsbid_agenda_employee_to_talentmap_agenda_employee(data, cdos={}):
     '''
     Maps FSBid response to expected TalentMAP response
     '''
@@ -216,9 +211,7 @@ def fsbid_agenda_employee_to_talentmap_agenda_employee(data, cdos=[]):
         fullName = fullName.rstrip(" Nmn")
     cdo = None
     if pydash.get(data, 'cdo[0].echruid'):
-        hru_id = pydash.get(data, 'cdo[0].echruid')
-        cdoObj = pydash.find(cdos, lambda x: pydash.get(x, 'id') == hru_id)
-        cdo = cdoObj
+        cdo = cdos.get(pydash.get(data, 'cdo[0].echruid'))
     return {
         "person": {
             "fullName": fullName + f"{', '+suffix if hasSuffix else ''} ",
@@ -159,15 +159,13 @@ def get_available_positions_tandem_count(query, jwt_token, host=None):
 
 
 def get_available_positions_csv(query, jwt_token, host=None, limit=None, includeLimit=False):
-    data = services.send_get_csv_request(
+    data = services.send_get_csv_pages(
         "available",
         query,
         convert_ap_query,
         jwt_token,
         fsbid_ap_to_talentmap_ap,
         CP_API_V2_URL,
-        host,
-        None,
         limit,
         True,
     )
@@ -182,15 +180,13 @@ def get_available_positions_csv(query, jwt_token, host=None, limit=None, include
 
 
 def get_available_positions_tandem_csv(query, jwt_token, host=None, limit=None, includeLimit=False):
-    data = services.send_get_csv_request(
+    data = services.send_get_csv_pages(
         "availableTandem",
         query,
         partial(convert_ap_query, isTandem=True),
         jwt_token,
         fsbid_ap_to_talentmap_ap,
         CP_API_V2_URL,
-        host,
-        None,
         limit,
         True,
     )
@@ -237,11 +233,31 @@ def get_similar_available_positions(id, jwt_token, host=None):
     return {"results": results}
 
 
-def fsbid_ap_to_talentmap_ap(ap):
+def get_designations(cp_ids):
+    '''
+    Loads the designations for a page of cycle positions in one query, keyed by cp_id
+    '''
+    cp_ids = pydash.uniq([str(x) for x in cp_ids if x is not None])
+    if not cp_ids:
+        return {}
+    return {d.cp_id: d for d in AvailablePositionDesignation.objects.filter(cp_id__in=cp_ids)}
+
+
+def prefetch_page(data, mapping_function):
+    designations = get_designations(pydash.map_(data, 'cp_id'))
+    return services.prefetch_obc_ids(data, partial(mapping_function, designations=designations))
+
+
+def fsbid_ap_to_talentmap_ap(ap, designations=None, obc_ids=None):
     '''
     Converts the response available position from FSBid to a format more in line with the Talentmap position
     '''
-    designations = AvailablePositionDesignation.objects.filter(cp_id=ap.get("cp_id", None)).first()
+    cp_id = ap.get("cp_id", None)
+    if designations is None:
+        designations = get_designations([cp_id])
+    if obc_ids is None:
+        obc_ids = services.get_obc_ids([ap.get("pos_location_code", None)])
+    designations = designations.get(str(cp_id)) if cp_id is not None else None
 
     hasHandShakeOffered = False
     if ap.get("cp_status", None) == "HS":
@@ -315,15 +331,15 @@ def fsbid_ap_to_talentmap_ap(ap):
                 "id": None,
                 "code": ap.get("pos_location_code", None),
                 "tour_of_duty": ap.get("tod", None),
-                "post_overview_url": services.get_post_overview_url(ap.get("pos_location_code", None)),
-                "post_bidding_considerations_url": services.get_post_bidding_considerations_url(ap.get("pos_location_code", None)),
+                "post_overview_url": services.get_post_overview_url(ap.get("pos_location_code", None), obc_ids),
+                "post_bidding_considerations_url": services.get_post_bidding_considerations_url(ap.get("pos_location_code", None), obc_ids),
                 "cost_of_living_adjustment": None,
                 "differential_rate": ap.get("bt_differential_rate_num", None),
                 "danger_pay": ap.get("bt_danger_pay_num", None),
                 "rest_relaxation_point": None,
                 "has_consumable_allowance": None,
                 "has_service_needs_differential": None,
-                "obc_id": services.get_obc_id(ap.get("pos_location_code", None)),
+                "obc_id": obc_ids.get(ap.get("pos_location_code", None)),
                 "location": {
                     "country": ap.get("location_country", None),
                     "code": ap.get("pos_location_code", None),
@@ -372,6 +388,9 @@ def fsbid_ap_to_talentmap_ap(ap):
     }
 
 
+fsbid_ap_to_talentmap_ap.prefetch = prefetch_page
+
+
 def convert_ap_query(query, allowed_status_codes=["HS", "OP"], isTandem=False):
     '''
     Converts TalentMap filters into FSBid filters
@@ -10,7 +10,7 @@ import maya
 import pydash
 import jwt
 
-from talentmap_api.bidding.models import BidHandshakeCycle
+from talentmap_api.bidding.models import BidHandshake, BidHandshakeCycle
 
 from talentmap_api.common.common_helpers import ensure_date
 from talentmap_api.fsbid.services.positions import fsbid_to_talentmap_pos
@@ -23,6 +23,7 @@ import talentmap_api.fsbid.services.available_positions as ap_services
 
 API_ROOT = settings.WS_ROOT_API_URL
 BIDS_V2_ROOT = settings.BIDS_API_V2_URL
+CP_API_V2_ROOT = settings.CP_API_V2_URL
 
 logger = logging.getLogger(__name__)
 
@@ -38,12 +39,72 @@ def user_bids(employee_id, jwt_token, position_id=None, query={}):
     # Filter out any bids with a status of "D" (deleted)
     filteredBids['Data'] = [b for b in list(pydash.get(bids, 'Data') or []) if smart_str(b["bs_cd"]) != 'D']
     if position_id:
-        mappedBids = [fsbid_bid_to_talentmap_bid(bid, jwt_token) for bid in filteredBids.get('Data', []) if bid.get('cp_id') == int(position_id)]
-    else:
-        mappedBids = map(lambda b: fsbid_bid_to_talentmap_bid(b, jwt_token), filteredBids.get('Data', []))
+        filteredBids['Data'] = [bid for bid in filteredBids.get('Data', []) if bid.get('cp_id') == int(position_id)]
+    hydration = get_bids_hydration(filteredBids.get('Data', []), jwt_token)
+    mappedBids = [fsbid_bid_to_talentmap_bid(bid, jwt_token, hydration) for bid in filteredBids.get('Data', [])]
     mappedBids = sort_bids(bidlist=mappedBids, ordering_query=ordering_query)
     return map_bids_to_disable_handshake_if_accepted(mappedBids)
 
+def get_user_bid(employee_id, cp_id, jwt_token, hydrate=False):
+    '''
+    Get a user's bid on one cycle position, or None if they haven't bid on it.
+    Returns the raw FSBid bid unless hydrate is set, which maps it (position, handshake cycle and handshake) as user_bids does.
+    '''
+    url = f"{API_ROOT}/v1/bids/?perdet_seq_num={employee_id}&cp_id={cp_id}"
+    bids = requests.get(url, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'}).json()
+    bid = pydash.find(
+        pydash.get(bids, 'Data') or [],
+        lambda b: smart_str(b.get("bs_cd")) != 'D' and b.get('cp_id') is not None and int(b.get('cp_id')) == int(cp_id)
+    )
+    if bid is None or not hydrate:
+        return bid
+    return fsbid_bid_to_talentmap_bid(bid, jwt_token)
+
+
+def is_accept_handshake_disabled(employee_id, cp_id, jwt_token):
+    '''
+    Whether a bidder can't accept a handshake on a cycle position because they have already accepted one on
+    another position in the same bid cycle, i.e. the accept_handshake_disabled flag user_bids sets on that bid.
+    Only the bidder's accepted handshakes are looked at, so this costs no upstream calls unless they have one.
+    '''
+    from talentmap_api.fsbid.services.common import get_results_with_post
+
+    perdet = str(employee_id)
+    cp_id = str(int(cp_id))
+    accepted = set(BidHandshake.objects.filter(bidder_perdet=perdet, bidder_status='A').exclude(status='R').values_list('cp_id', flat=True))
+    if not accepted or cp_id in accepted:
+        return False
+
+    # Only handshakes on bids that are still in the bid list count
+    url = f"{API_ROOT}/v1/bids/?perdet_seq_num={employee_id}"
+    bids = requests.get(url, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'}).json()
+    bid_cp_ids = {str(int(b.get('cp_id'))) for b in pydash.get(bids, 'Data') or [] if smart_str(b.get("bs_cd")) != 'D' and b.get('cp_id') is not None}
+    accepted &= bid_cp_ids
+    if not accepted:
+        return False
+
+    cp_ids = [cp_id, *accepted]
+    positions = get_results_with_post(
+        "",
+        {"id": ','.join(cp_ids), "page": 1, "limit": len(cp_ids)},
+        ap_services.convert_all_query,
+        jwt_token,
+        ap_services.fsbid_ap_to_talentmap_ap,
+        CP_API_V2_ROOT,
+    ) or []
+    cycles = {str(int(p.get('id'))): pydash.get(p, 'bidcycle.id') for p in positions if p.get('id') is not None}
+    cycle = cycles.get(cp_id)
+    if cycle is None:
+        return False
+
+    # Handshakes in a cycle whose handshakes aren't revealed yet are hidden from the bid list, so don't count
+    handshake_cycle = BidHandshakeCycle.objects.filter(cycle_id=str(cycle)).first()
+    if handshake_cycle and handshake_cycle.handshake_allowed_date and handshake_cycle.handshake_allowed_date > maya.now().datetime():
+        return False
+
+    return any(cycles.get(accepted_cp_id) == cycle for accepted_cp_id in accepted)
+
+
 def get_user_bids_csv(employee_id, jwt_token, position_id=None, query={}):
     '''
     Export bids for a user to CSV
@@ -181,7 +242,47 @@ def can_delete_bid(bidStatus, cycleStatus):
     return bidStatus == Bid.Status.draft or (bidStatus == Bid.Status.submitted and cycleStatus == 'A')
 
 
-def fsbid_bid_to_talentmap_bid(data, jwt_token):
+def get_bids_hydration(bids, jwt_token):
+    '''
+    Loads everything the bid mapper needs for a list of FSBid bids in bulk: the cycle positions
+    in one upstream call, then the handshake cycles and handshakes with one query each
+    '''
+    from talentmap_api.fsbid.services.common import get_results_with_post
+
+    hydration = {
+        "positions": {},
+        "handshake_cycles": {},
+        "handshakes": {},
+    }
+    cp_ids = pydash.uniq([str(int(b.get('cp_id'))) for b in bids if b.get('cp_id') is not None])
+    if not cp_ids:
+        return hydration
+
+    positions = get_results_with_post(
+        "",
+        {"id": ','.join(cp_ids), "page": 1, "limit": len(cp_ids)},
+        ap_services.convert_all_query,
+        jwt_token,
+        ap_services.fsbid_ap_to_talentmap_ap,
+        CP_API_V2_ROOT,
+    ) or []
+    hydration["positions"] = {str(int(p.get('id'))): p for p in positions if p.get('id') is not None}
+
+    cycles = pydash.uniq([str(pydash.get(p, 'bidcycle.id')) for p in positions if pydash.get(p, 'bidcycle.id') is not None])
+    if cycles:
+        hydration["handshake_cycles"] = {str(c.cycle_id): c for c in BidHandshakeCycle.objects.filter(cycle_id__in=cycles)}
+
+    perdets = pydash.uniq([str(int(float(b.get('perdet_seq_num')))) for b in bids if b.get('perdet_seq_num') is not None])
+    handshakes = BidHandshake.objects.filter(cp_id__in=cp_ids, bidder_perdet__in=perdets).exclude(status='R')
+    hydration["handshakes"] = {(hs.cp_id, hs.bidder_perdet): hs for hs in handshakes}
+
+    return hydration
+
+
+def fsbid_bid_to_talentmap_bid(data, jwt_token, hydration=None):
+    if hydration is None:
+        hydration = get_bids_hydration([data], jwt_token)
+
     bidStatus = get_bid_status(
         data.get('bs_cd'),
         data.get('ubw_hndshk_offrd_flg'),
@@ -192,13 +293,12 @@ def fsbid_bid_to_talentmap_bid(data, jwt_token):
     canDelete = True if data.get('delete_ind', 'Y') == 'Y' else False
     cpId = int(data.get('cp_id'))
     perdet = str(int(float(data.get('perdet_seq_num'))))
-    positionInfo = ap_services.get_all_position(str(cpId), jwt_token) or {}
+    positionInfo = hydration["positions"].get(str(cpId)) or {}
     cycle = pydash.get(positionInfo, 'bidcycle.id')
 
     showHandshakeData = True
-    handshakeCycle = BidHandshakeCycle.objects.filter(cycle_id=cycle)
+    handshakeCycle = hydration["handshake_cycles"].get(str(cycle))
     if handshakeCycle:
-        handshakeCycle = handshakeCycle.first()
         handshake_allowed_date = handshakeCycle.handshake_allowed_date
         if handshake_allowed_date and handshake_allowed_date > maya.now().datetime():
             showHandshakeData = False
@@ -233,7 +333,7 @@ def fsbid_bid_to_talentmap_bid(data, jwt_token):
 
     if showHandshakeData:
         data["handshake"] = {
-            **bh_services.get_bidder_handshake_data(cpId, perdet, True),
+            **bh_services.map_handshake(hydration["handshakes"].get((str(cpId), perdet))),
         }
 
     return data
@@ -74,18 +74,16 @@ def get_bureau_positions_count(query, jwt_token, host=None):
 
 
 def get_bureau_positions_csv(query, jwt_token, host=None, limit=None, includeLimit=False):
-    from talentmap_api.fsbid.services.common import get_ap_and_pv_csv, send_get_csv_request
+    from talentmap_api.fsbid.services.common import get_ap_and_pv_csv, send_get_csv_pages
 
-    data = send_get_csv_request(
+    data = send_get_csv_pages(
         "",
         query,
         partial(convert_bp_query, use_post=True),
         jwt_token,
         fsbid_bureau_positions_to_talentmap,
         CP_API_V2_ROOT,
-        None,
-        None,
-        None,
+        limit,
         True,
     )
 
@@ -97,78 +95,111 @@ def get_bureau_position_bids(id, query, jwt_token, host):
     '''
     Gets all bids on an indivdual bureau position by id
     '''
-    from talentmap_api.fsbid.services.common import get_results
-    from talentmap_api.fsbid.services.employee import has_bureau_permissions, has_org_permissions
+    from talentmap_api.fsbid.services.employee import get_position_permissions
 
-    hasBureauPermissions = has_bureau_permissions(id, jwt_token)
-    hasOrgPermissions = has_org_permissions(id, jwt_token)
-    if not (hasBureauPermissions or hasOrgPermissions):
+    if not any(get_position_permissions(id, jwt_token).values()):
         raise PermissionDenied()
 
-    new_query = deepcopy(query)
-    new_query["id"] = id
-    active_perdet = bh_services.get_position_handshake_data(id)['active_handshake_perdet']
-    return get_results(
-        "bidders",
-        new_query,
-        convert_bp_bids_query,
-        jwt_token,
-        partial(fsbid_bureau_position_bids_to_talentmap, jwt=jwt_token, cp_id=id, active_perdet=active_perdet),
-        CP_API_ROOT,
-    )
+    return get_enriched_bureau_position_bids(id, query, jwt_token)
 
 def get_bureau_position_bids_csv(self, id, query, jwt_token, host):
     '''
     Gets all bids on an indivdual bureau position by id for export
     '''
-    from talentmap_api.fsbid.services.common import get_bidders_csv, send_get_csv_request
-    from talentmap_api.fsbid.services.employee import has_bureau_permissions, has_org_permissions
+    from talentmap_api.fsbid.services.common import get_bidders_csv
+    from talentmap_api.fsbid.services.employee import get_position_permissions
 
-    hasBureauPermissions = has_bureau_permissions(id, jwt_token)
-    hasOrgPermissions = has_org_permissions(id, jwt_token)
-    if not (hasBureauPermissions or hasOrgPermissions):
+    if not any(get_position_permissions(id, jwt_token).values()):
         raise PermissionDenied()
 
+    data = get_enriched_bureau_position_bids(id, query, jwt_token) or []
+
+    pos_num = get_bureau_position(id, jwt_token)["position"]["position_number"]
+    filename = f"position_{pos_num}_bidders"
+    response = get_bidders_csv(self, id, data, filename, True)
+    return response
+
+def get_enriched_bureau_position_bids(id, query, jwt_token):
+    '''
+    Fetches the bidders on a position, resolves their enrichment data in bulk, then maps the rows
+    '''
+    from talentmap_api.fsbid.services.common import get_results
+
     new_query = deepcopy(query)
     new_query["id"] = id
     active_perdet = bh_services.get_position_handshake_data(id)['active_handshake_perdet']
-    data = send_get_csv_request(
+    bids = get_results(
         "bidders",
         new_query,
         convert_bp_bids_query,
         jwt_token,
-        partial(fsbid_bureau_position_bids_to_talentmap, jwt=jwt_token, cp_id=id, active_perdet=active_perdet),
+        None,
         CP_API_ROOT,
     )
-
-    pos_num = get_bureau_position(id, jwt_token)["position"]["position_number"]
-    filename = f"position_{pos_num}_bidders"
-    response = get_bidders_csv(self, id, data, filename, True)
-    return response
-
-def fsbid_bureau_position_bids_to_talentmap(bid, jwt, cp_id, active_perdet):
+    if bids is None:
+        return None
+
+    enrichment = get_bureau_position_bids_enrichment(bids, jwt_token, id)
+    return list(map(
+        partial(fsbid_bureau_position_bids_to_talentmap, jwt=jwt_token, cp_id=id, active_perdet=active_perdet, enrichment=enrichment),
+        bids,
+    ))
+
+def get_bidder_perdet(bid):
+    perdet = bid.get("perdet_seq_num", None)
+    if perdet is None:
+        return None
+    return str(int(float(perdet)))
+
+def get_bureau_position_bids_enrichment(bids, jwt, cp_id):
     '''
-    Formats the response bureau position bids from FSBid
+    Resolves CDOs, classifications, handshakes, accepted offers and competing ranks for every bidder
+    on a position with one bulk query or one batch of upstream calls per kind, keyed by perdet
     '''
-    from talentmap_api.fsbid.services.common import has_competing_rank
+    from talentmap_api.fsbid.services.common import get_competing_rank_perdets, run_concurrently
     from talentmap_api.fsbid.services.reference import get_cycles
 
-    cdo = None
-    classifications = None
-    has_competing_rank_value = None
-    emp_id = str(int(float(bid.get("perdet_seq_num", None))))
-    if emp_id is not None:
-        cdo = cdoservices.single_cdo(jwt, emp_id)
-        classifications = classifications_services.get_client_classification(jwt, emp_id)
-        has_competing_rank_value = has_competing_rank(jwt, emp_id, cp_id)
+    perdets = pydash.uniq(list(filter(None, map(get_bidder_perdet, bids))))
+    if not perdets:
+        return {}
+
+    # FSBid only looks up CDOs and classifications one perdet at a time, so fan those out on a bounded pool
+    cdos = run_concurrently(partial(cdoservices.single_cdo, jwt), perdets)
+    classifications = run_concurrently(partial(classifications_services.get_client_classification, jwt), perdets)
+
+    competing_ranks = get_competing_rank_perdets(jwt, perdets, cp_id)
+    handshakes = bh_services.get_bidders_handshake_data(cp_id, perdets)
+
+    cycles = pydash.map_(get_cycles(jwt), 'id')
+    accepted_offers = set(BidHandshake.objects.filter(
+        bidder_perdet__in=perdets, status='A', bid_cycle_id__in=cycles
+    ).exclude(cp_id=cp_id).values_list("bidder_perdet", flat=True))
+
+    enrichment = {}
+    for i, perdet in enumerate(perdets):
+        enrichment[perdet] = {
+            "cdo": cdos[i],
+            "classifications": classifications[i],
+            "has_competing_rank": perdet in competing_ranks,
+            "handshake": handshakes[perdet],
+            "has_accepted_other_offer": perdet in accepted_offers,
+        }
+    return enrichment
+
+def fsbid_bureau_position_bids_to_talentmap(bid, jwt, cp_id, active_perdet, enrichment=None):
+    '''
+    Formats the response bureau position bids from FSBid
+    '''
+    emp_id = get_bidder_perdet(bid)
+    if enrichment is None:
+        enrichment = get_bureau_position_bids_enrichment([bid], jwt, cp_id)
+    bidder = enrichment.get(emp_id, {})
 
     hasHandShakeOffered = False
     if bid.get("handshake_code", None) == "HS":
         hasHandShakeOffered = True
     ted = ensure_date(bid.get("TED", None), utc_offset=-5)
 
-    handshake = bh_services.get_bidder_handshake_data(cp_id, emp_id)
-
     active_handshake_perdet = None
     if active_perdet:
         active_handshake_perdet = int(active_perdet) == int(emp_id)
@@ -176,15 +207,6 @@ def fsbid_bureau_position_bids_to_talentmap(bid, jwt, cp_id, active_perdet):
     if fullname:
         fullname = fullname.rstrip(' Nmn')
 
-    hasAcceptedOffer = False
-    cycles = get_cycles(jwt)
-    cycles = pydash.map_(cycles, 'id')
-    handshakesAccepted = BidHandshake.objects.filter(bidder_perdet=emp_id, status='A', bid_cycle_id__in=cycles).exclude(cp_id=cp_id).values_list("cp_id", flat=True)
-    handshakesAccepted = list(handshakesAccepted)
-    if handshakesAccepted:
-        hasAcceptedOffer = True
-
-
     return {
         "emp_id": emp_id,
         "name": fullname,
@@ -199,24 +221,32 @@ def fsbid_bureau_position_bids_to_talentmap(bid, jwt, cp_id, active_perdet):
         # fsbid hs offered stats are for register, not to be confused with TM HS functionality
         "handshake_registered": bid.get('ubw_handshake_offered_flag'),
         "handshake_registered_date": ensure_date(bid.get('ubw_handshake_offered_dt'), utc_offset=-5),
-        "cdo": cdo,
-        "classifications": classifications,
-        "has_competing_rank": has_competing_rank_value,
+        "cdo": bidder.get("cdo"),
+        "classifications": bidder.get("classifications"),
+        "has_competing_rank": bidder.get("has_competing_rank"),
         "handshake": {
-            **handshake,
+            **bidder.get("handshake", bh_services.map_handshake(None)),
         },
         "active_handshake_perdet": active_handshake_perdet,
-        "has_accepted_other_offer": hasAcceptedOffer,
+        "has_accepted_other_offer": bidder.get("has_accepted_other_offer", False),
     }
 
 
-def fsbid_bureau_positions_to_talentmap(bp):
+def prefetch_bureau_positions(data, mapping_function):
+    from talentmap_api.fsbid.services.common import prefetch_obc_ids
+
+    return prefetch_obc_ids(data, mapping_function)
+
+
+def fsbid_bureau_positions_to_talentmap(bp, obc_ids=None):
     '''
     Converts the response bureau position from FSBid to a format more in line with the Talentmap position
     '''
 
-    from talentmap_api.fsbid.services.common import get_post_overview_url, get_post_bidding_considerations_url, get_obc_id, parseLanguage
+    from talentmap_api.fsbid.services.common import get_post_overview_url, get_post_bidding_considerations_url, get_obc_ids, parseLanguage
 
+    if obc_ids is None:
+        obc_ids = get_obc_ids([bp.get("pos_location_code", None)])
     cp_id = str(int(bp.get("cp_id", None)))
 
     bh_props = bh_services.get_position_handshake_data(cp_id)
@@ -304,15 +334,15 @@ def fsbid_bureau_positions_to_talentmap(bp):
                 "id": None,
                 "code": bp.get("pos_location_code", None),
                 "tour_of_duty": bp.get("tod", None),
-                "post_overview_url": get_post_overview_url(bp.get("pos_location_code", None)),
-                "post_bidding_considerations_url": get_post_bidding_considerations_url(bp.get("pos_location_code", None)),
+                "post_overview_url": get_post_overview_url(bp.get("pos_location_code", None), obc_ids),
+                "post_bidding_considerations_url": get_post_bidding_considerations_url(bp.get("pos_location_code", None), obc_ids),
                 "cost_of_living_adjustment": None,
                 "differential_rate": bp.get("bt_differential_rate_num", None),
                 "danger_pay": bp.get("bt_danger_pay_num", None),
                 "rest_relaxation_point": None,
                 "has_consumable_allowance": None,
                 "has_service_needs_differential": None,
-                "obc_id": get_obc_id(bp.get("pos_location_code", None)),
+                "obc_id": obc_ids.get(bp.get("pos_location_code", None)),
                 "location": {
                     "country": bp.get("location_country", None),
                     "code": bp.get("pos_location_code", None),
@@ -365,6 +395,9 @@ def fsbid_bureau_positions_to_talentmap(bp):
     }
 
 
+fsbid_bureau_positions_to_talentmap.prefetch = prefetch_bureau_positions
+
+
 def convert_bp_query(query, allowed_status_codes=["FP", "OP", "HS"], use_post=False):
     '''
     Converts TalentMap filters into FSBid filters
@@ -2,9 +2,12 @@ import logging
 import jwt
 import pydash
 from django.conf import settings
+from django.core.cache import cache
 from talentmap_api.common.common_helpers import get_avatar_url
 
 CLIENTS_API_URL = settings.CLIENTS_API_URL
+CDO_CACHE_TIMEOUT = settings.FSBID_CDO_CACHE_TIMEOUT
+CDO_DIRECTORY_CACHE_KEY = "fsbid_cdo_directory"
 
 logger = logging.getLogger(__name__)
 
@@ -13,15 +16,39 @@ def cdo(jwt_token):
     '''
     Get All CDOs
     '''
+    return list(get_cdo_directory(jwt_token).values())
+
+
+def get_cdo_directory(jwt_token):
+    '''
+    Get All CDOs keyed by hru_id, ordered by name and flagged for the current user.
+    The list is shared between requests and workers for FSBID_CDO_CACHE_TIMEOUT seconds.
+    '''
+    cdos = cache.get(CDO_DIRECTORY_CACHE_KEY)
+    if cdos is None:
+        cdos = fetch_cdo_directory(jwt_token)
+        if cdos is None:
+            return {}
+        cache.set(CDO_DIRECTORY_CACHE_KEY, cdos, CDO_CACHE_TIMEOUT)
+
+    email = jwt.decode(jwt_token, verify=False).get('email')
+    return {hru_id: {**x, "isCurrentUser": x['email'] == email} for hru_id, x in cdos.items()}
+
+
+def fetch_cdo_directory(jwt_token):
+    '''
+    Gets every CDO from FSBid, deduplicated by hru_id, or None if the call failed
+    '''
     from talentmap_api.fsbid.services.common import get_fsbid_results
     ad_id = jwt.decode(jwt_token, verify=False).get('unique_name')
-    email = jwt.decode(jwt_token, verify=False).get('email')
     uri = f"Agents?ad_id={ad_id}&request_params.rl_cd=CDO&request_params.rl_cd=CDO3"
-    response = get_fsbid_results(uri, jwt_token, fsbid_cdo_list_to_talentmap_cdo_list, email, False, CLIENTS_API_URL)
-    response = list(response)
-    response = [d for i, d in enumerate(response) if d['id'] not in [x['id'] for x in response[i + 1:]]] # dedup
-    response = pydash.order_by(response, ['name'])
-    return response
+    response = get_fsbid_results(uri, jwt_token, fsbid_cdo_list_to_talentmap_cdo_list, None, False, CLIENTS_API_URL)
+    if response is None:
+        return None
+
+    # an agent is listed once per role; the last listing wins
+    cdos = {x['id']: x for x in response}
+    return {x['id']: x for x in pydash.order_by(list(cdos.values()), ['name'])}
 
 
 def single_cdo(jwt_token=None, perdet_seq_num=None):
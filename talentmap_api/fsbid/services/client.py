@@ -1,9 +1,13 @@
 import csv
+import hashlib
 import logging
+import time
 from copy import deepcopy
 from datetime import datetime
+from functools import partial
 from urllib.parse import urlencode, quote
 from django.conf import settings
+from django.core.cache import cache
 from django.http import HttpResponse
 from django.utils.encoding import smart_str
 import jwt
@@ -19,6 +23,8 @@ from talentmap_api.fsbid.requests import requests
 SECREF_ROOT = settings.SECREF_URL
 CLIENTS_ROOT = settings.CLIENTS_API_URL
 CLIENTS_ROOT_V2 = settings.CLIENTS_API_V2_URL
+CLIENT_CACHE_TIMEOUT = settings.FSBID_CLIENT_CACHE_TIMEOUT
+CONTACT_CACHE_TIMEOUT = settings.FSBID_CONTACT_CACHE_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +47,36 @@ def get_user_information(jwt_token, perdet_seq_num):
         return {}
 
 
+def get_user_information_map(jwt_token, perdet_seq_nums):
+    '''
+    Gets the contact details of many employees keyed by perdet, from the cache where possible
+    and otherwise with concurrent SECREF lookups. What SECREF returns depends on the caller's
+    authorization, so the cache is per token.
+    '''
+    token = hashlib.sha256(jwt_token.encode('utf-8')).hexdigest()
+    perdets = list(dict.fromkeys(filter(None, perdet_seq_nums)))
+    keys = {f"fsbid_user_information:{perdet}:{token}": perdet for perdet in perdets}
+    contacts = {keys[key]: contact for key, contact in cache.get_many(list(keys)).items()}
+
+    missing = [perdet for perdet in perdets if perdet not in contacts]
+    if missing:
+        def lookup(perdet):
+            try:
+                return get_user_information(jwt_token, perdet)
+            except Exception as e:
+                logger.error(f"Error getting user information for {perdet}: {e}\n")
+                return {}
+
+        resolved = dict(zip(missing, services.run_concurrently(lookup, missing)))
+        # failed lookups and ones SECREF had no Data for (every field None) aren't cached, so the next export retries them
+        cache.set_many({
+            f"fsbid_user_information:{perdet}:{token}": contact for perdet, contact in resolved.items()
+            if contact.get("email") or contact.get("hru_id")
+        }, CONTACT_CACHE_TIMEOUT)
+        contacts.update(resolved)
+    return contacts
+
+
 def client(jwt_token, query, host=None):
     '''
     Get Clients by CDO
@@ -283,60 +319,59 @@ def client_suggestions(jwt_token, perdet_seq_num):
 
 def single_client(jwt_token, perdet_seq_num, host=None):
     '''
-    Get a single client for a CDO
+    Get a single client for a CDO.
+    The profile is shared with client_suggestions and repeat page loads for FSBID_CLIENT_CACHE_TIMEOUT seconds.
     '''
-    from talentmap_api.fsbid.services.common import send_get_request
-    
-    ad_id = jwt.decode(jwt_token, verify=False).get('unique_name')
+    key = f"fsbid_client:{perdet_seq_num}:{hashlib.sha256(jwt_token.encode('utf-8')).hexdigest()}"
+    CLIENT = cache.get(key)
+    if CLIENT is None:
+        CLIENT = get_client_profile(jwt_token, perdet_seq_num)
+        if CLIENT is not None:
+            cache.set(key, CLIENT, CLIENT_CACHE_TIMEOUT)
+    return CLIENT
 
-    query = {
-        "ad_id": ad_id,
-        "perdet_seq_num": perdet_seq_num,
-        "currentAssignmentOnly": "false",
-    }
 
+def get_client_profile(jwt_token, perdet_seq_num):
+    '''
+    Fetches a client's assignments, current assignment, CDO and contact details concurrently.
+    A single perdet needs no pagination, so no counts are requested.
+    The assignments are mapped back on the request thread, since mapping reads the OBC index from the database.
+    '''
+    ad_id = jwt.decode(jwt_token, verify=False).get('unique_name')
+
+    def get_assignments(current_only):
+        query = {
+            "ad_id": ad_id,
+            "perdet_seq_num": perdet_seq_num,
+            "currentAssignmentOnly": current_only,
+        }
+        return services.get_results("", query, convert_client_query, jwt_token, None, CLIENTS_ROOT_V2)
+
+    fetches = [
+        lambda: get_assignments("false"),
+        lambda: get_assignments("true"),
+        lambda: cdo_services.single_cdo(jwt_token, perdet_seq_num),
+        lambda: get_user_information(jwt_token, perdet_seq_num),
+    ]
     try:
-        responseAllAssignments = send_get_request(
-            "",
-            query,
-            convert_client_query,
-            jwt_token,
-            fsbid_clients_to_talentmap_clients,
-            get_clients_count,
-            "/api/v2/clients/",
-            host,
-            CLIENTS_ROOT_V2,
-        )
+        allAssignments, currentAssignment, cdo, user_info = services.run_concurrently(lambda fetch: fetch(), fetches)
     except Exception as e:
-        logger.error(f"Error getting responseAllAssignments: {e}\n")
+        logger.error(f"Error getting client {perdet_seq_num}: {e}\n")
         return None
-    
-    query["currentAssignmentOnly"] = "true"
 
-    try:
-        responseCurrentAssignment = send_get_request(
-            "",
-            query,
-            convert_client_query,
-            jwt_token,
-            fsbid_clients_to_talentmap_clients,
-            get_clients_count,
-            "/api/v2/clients/",
-            host,
-            CLIENTS_ROOT_V2,
-        )
-    except Exception as e:
-        logger.error(f"Error getting responseCurrentAssignment: {e}\n")
+    if allAssignments is None or currentAssignment is None:
         return None
 
-    cdo = cdo_services.single_cdo(jwt_token, perdet_seq_num)
-    user_info = get_user_information(jwt_token, perdet_seq_num)
-    
+    # both pages' post codes are resolved to OBC ids with one lookup
+    obc_ids = services.get_obc_ids(get_client_post_codes([*allAssignments, *currentAssignment]))
+    allAssignments = [fsbid_clients_to_talentmap_clients(client, obc_ids) for client in allAssignments]
+    currentAssignment = [fsbid_clients_to_talentmap_clients(client, obc_ids) for client in currentAssignment]
+
     try:
-        CLIENT = list(responseAllAssignments['results'])[0]
+        CLIENT = allAssignments[0]
         CLIENT['cdo'] = cdo
         CLIENT['user_info'] = user_info
-        CLIENT['current_assignment'] = list(responseCurrentAssignment['results'])[0].get('current_assignment', {})
+        CLIENT['current_assignment'] = currentAssignment[0].get('current_assignment', {})
         return CLIENT
     except IndexError:
         pass
@@ -350,6 +385,7 @@ def get_client_csv(query, jwt_token, rl_cd, host=None):
     
     ad_id = jwt.decode(jwt_token, verify=False).get('unique_name')
 
+    start = time.perf_counter()
     try:
         data = send_get_csv_request(
             "",
@@ -361,11 +397,14 @@ def get_client_csv(query, jwt_token, rl_cd, host=None):
             host,
             ad_id
         )
-        logger.info(f"Got {len(data)} records for CSV\n")
-        logger.info(f"Data: {data}\n")
+        data = [record for record in data if record]
     except Exception as e:
         logger.error(f"Error getting client CSV: {e}\n")
         return None
+    clients_time = time.perf_counter() - start
+
+    contacts = get_user_information_map(jwt_token, [record['id'] for record in data])
+    contacts_time = time.perf_counter() - start - clients_time
 
     response = HttpResponse(content_type='text/csv')
     response['Content-Disposition'] = f"attachment; filename=clients_{datetime.now().strftime('%Y_%m_%d_%H%M%S')}.csv"
@@ -389,10 +428,8 @@ def get_client_csv(query, jwt_token, rl_cd, host=None):
     ])
 
     try:
-        logger.info(f"Writing {len(data)} records to CSV\n\n")
         for record in data:
-            email_response = get_user_information(jwt_token, record['id'])
-            email = pydash.get(email_response, 'email') or 'None listed'
+            email = pydash.get(contacts, [record['id'], 'email']) or 'None listed'
             writer.writerow([
                 smart_str(record["name"]),
                 email,
@@ -411,6 +448,7 @@ def get_client_csv(query, jwt_token, rl_cd, host=None):
         logger.error(f"exception caught: {e}\n")
         return None
 
+    logger.info(f"Client CSV: {len(data)} clients in {clients_time:.2f}s, {len(contacts)} contacts in {contacts_time:.2f}s, total {time.perf_counter() - start:.2f}s")
     return response
 
 def client_panel(jwt_token, query, host=None):
@@ -440,7 +478,29 @@ def client_panel_res_mapping(data):
         
     return data['PV_PM_LST_O']
 
-def fsbid_clients_to_talentmap_clients(data):
+def get_client_post_codes(clients):
+    '''
+    Collects the post codes of every assignment in a page of FSBid clients
+    '''
+    codes = []
+    for client in clients:
+        employee = client.get('employee') or {}
+        assignments = employee.get('assignment') or []
+        if type(assignments) is type(dict()):
+            assignments = [assignments]
+        for assignment in [employee.get('currentAssignment'), *assignments]:
+            position = (assignment or {}).get('position') or (assignment or {}).get('currentPosition') or {}
+            location = position.get('location') or position.get('currentLocation') or {}
+            codes.append(location.get('gvt_geoloc_cd'))
+    return pydash.uniq(codes)
+
+
+def prefetch_clients(data, mapping_function):
+    obc_ids = services.get_obc_ids(get_client_post_codes(data))
+    return partial(mapping_function, obc_ids=obc_ids)
+
+
+def fsbid_clients_to_talentmap_clients(data, obc_ids=None):
     employee = data.get('employee', None)
     current_assignment = None
     assignments = None
@@ -487,7 +547,7 @@ def fsbid_clients_to_talentmap_clients(data):
 
     # first object in array, mapped
     try:
-        current_assignment = fsbid_assignments_to_tmap(current_assignment)[0]
+        current_assignment = fsbid_assignments_to_tmap(current_assignment, obc_ids)[0]
     except:
         current_assignment = {}
 
@@ -539,10 +599,13 @@ def fsbid_clients_to_talentmap_clients(data):
         "languages": fsbid_languages_to_tmap(data.get("languages", []) or []),
         "cdos": data.get("cdos") or [],
         "current_assignment": current_assignment,
-        "assignments": fsbid_assignments_to_tmap(assignments),
+        "assignments": fsbid_assignments_to_tmap(assignments, obc_ids),
     }
 
 
+fsbid_clients_to_talentmap_clients.prefetch = prefetch_clients
+
+
 def parse_date_string(date_string):
     # Try to parse the date string as an ISO 8601 format with timezone offset
     # Ex: '2023-07-01T00:00:00-04:00'
@@ -878,8 +941,8 @@ def fsbid_classifications_to_tmap(cs):
     return tmap_classifications
 
 
-def fsbid_assignments_to_tmap(assignments):
-    from talentmap_api.fsbid.services.common import get_post_overview_url, get_post_bidding_considerations_url, get_obc_id
+def fsbid_assignments_to_tmap(assignments, obc_ids=None):
+    from talentmap_api.fsbid.services.common import get_post_overview_url, get_post_bidding_considerations_url, get_obc_ids
     assignmentsCopy = []
     tmap_assignments = []
     try:
@@ -892,6 +955,8 @@ def fsbid_assignments_to_tmap(assignments):
         return None
     
     if type(assignmentsCopy) is type([]):
+        if obc_ids is None:
+            obc_ids = get_obc_ids(pydash.uniq([pydash.get(x, 'position.location.gvt_geoloc_cd') for x in assignmentsCopy]))
         for x in assignmentsCopy:
             pos = x.get('position', {})
             loc = pos.get('location', {})
@@ -915,9 +980,9 @@ def fsbid_assignments_to_tmap(assignments):
                             "title": pos.get("pos_title_desc", None),
                             "post": {
                                 "code": loc.get("gvt_geoloc_cd", None),
-                                "post_overview_url": get_post_overview_url(loc.get("gvt_geoloc_cd", None)),
-                                "post_bidding_considerations_url": get_post_bidding_considerations_url(loc.get("gvt_geoloc_cd", None)),
-                                "obc_id": get_obc_id(loc.get("gvt_geoloc_cd", None)),
+                                "post_overview_url": get_post_overview_url(loc.get("gvt_geoloc_cd", None), obc_ids),
+                                "post_bidding_considerations_url": get_post_bidding_considerations_url(loc.get("gvt_geoloc_cd", None), obc_ids),
+                                "obc_id": obc_ids.get(loc.get("gvt_geoloc_cd", None)),
                                 "location": {
                                     "country": loc.get("country", None),
                                     "code": loc.get("gvt_geoloc_cd", None),
@@ -1024,10 +1089,12 @@ def get_available_bidders(jwt_token, isCDO, query, host=None):
         return None
     
     try:
-        stats = get_available_bidders_stats(response)
+        # bidders can be listed more than once, so dedup before counting them
+        results = list({v['perdet_seq_number']:v for v in response.get('results')}.values())
+        stats = get_available_bidders_stats(results)
         return {
             **stats,
-            "results": list({v['perdet_seq_number']:v for v in response.get('results')}.values()),
+            "results": results,
         }
     except Exception as e:
         logger.error(f"Error getting stats in get_available_bidders: {e}\n")
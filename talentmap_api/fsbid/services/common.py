@@ -1,19 +1,29 @@
 import re
 import logging
 import csv
+import contextvars
+import json
+import hashlib
+import threading
+import time
 from datetime import datetime
 from copy import deepcopy
 from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 
 
 from django.conf import settings
-from django.http import HttpResponse
+from django.core.cache import cache
+from django.db import connections
+from django.db.models.signals import post_save, post_delete
+from django.http import StreamingHttpResponse
 from django.utils.encoding import smart_str
 from django.http import QueryDict
 
-import maya
 import pydash
 
+from talentmap_api.common.cache.invalidation import get_model_versions, track_models
+from talentmap_api.common.dates import format_date
 from talentmap_api.organization.models import Obc
 from talentmap_api.settings import BACKOFFICE_CRUD_URL, OBC_URL, OBC_URL_EXTERNAL
 
@@ -36,13 +46,21 @@ FAVORITES_LIMIT = settings.FAVORITES_LIMIT
 PV_API_V2_URL = settings.PV_API_V2_URL
 CLIENTS_ROOT_V2 = settings.CLIENTS_API_V2_URL
 BACKOFFICE_CRUD_URL = settings.BACKOFFICE_CRUD_URL
+FSBID_MAX_WORKERS = settings.FSBID_MAX_WORKERS
+FSBID_COUNT_CACHE_TIMEOUT = settings.FSBID_COUNT_CACHE_TIMEOUT
 
+# Shared, bounded pool that runs pagination counts alongside the results request
+count_executor = ThreadPoolExecutor(max_workers=FSBID_MAX_WORKERS, thread_name_prefix='fsbid-count')
+FSBID_REFERENCE_CACHE_TIMEOUT = settings.FSBID_REFERENCE_CACHE_TIMEOUT
+CSV_PAGE_SIZE = settings.FSBID_CSV_PAGE_SIZE
+OBC_INDEX_TIMEOUT = settings.FSBID_OBC_INDEX_TIMEOUT
+OBC_VERSION_CHECK_INTERVAL = settings.FSBID_OBC_VERSION_CHECK_INTERVAL
+# Rows buffered before each chunk of a streamed export is sent
+CSV_CHUNK_ROWS = 200
 
-urls_expire_after = {
-    '*/cycles': 30,
-    '*': 0,  # Every other non-matching URL: do not cache
-}
-# session = requests_cache.CachedSession(backend='memory', namespace='tmap-cache', urls_expire_after=urls_expire_after)
+# Seconds a reference refresh may hold its lock, and how long other callers wait on it before fetching themselves
+REFERENCE_LOCK_TIMEOUT = 30
+REFERENCE_LOCK_WAIT = 5
 
 
 def get_pagination(query, count, base_url, host=None):
@@ -245,6 +263,18 @@ def sorting_values(sort, use_post=False):
         return results
 
 
+def map_page(mapping_function, data):
+    '''
+    Maps a page of FSBid rows. Mapping functions with a `prefetch` hook load whatever they need for the
+    whole page up front (e.g. in a single query) and return the mapping function to apply per row.
+    '''
+    prefetch = getattr(getattr(mapping_function, 'func', mapping_function), 'prefetch', None)
+    if prefetch:
+        data = list(data)
+        mapping_function = prefetch(data, mapping_function)
+    return map(mapping_function, data)
+
+
 def get_results(uri, query, query_mapping_function, jwt_token, mapping_function, api_root=API_ROOT):
     queryClone = query or {}
     if query_mapping_function:
@@ -258,7 +288,7 @@ def get_results(uri, query, query_mapping_function, jwt_token, mapping_function,
         return None
 
     if mapping_function:
-        return list(map(mapping_function, response.get("Data", {})))
+        return list(map_page(mapping_function, response.get("Data", {})))
     else:
         return response.get("Data", {})
 
@@ -271,28 +301,77 @@ def get_results_with_post(uri, query, query_mapping_function, jwt_token, mapping
         logger.error(f"Fsbid call to '{url}' failed.")
         return None
     if mapping_function:
-        return list(map(mapping_function, response.get("Data", {})))
+        return list(map_page(mapping_function, response.get("Data", {})))
     else:
         return response.get("Data", {})
 
 
-def get_fsbid_results(uri, jwt_token, mapping_function, email=None, use_cache=False, api_root=API_ROOT):
-    url = f"{api_root}/{uri}"
-    # TODO - fix SSL issue with use_cache
-    # method = session if use_cache else requests
-    method = requests
-    response = method.get(url, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'}).json()
+def fetch_fsbid_data(url, jwt_token):
+    '''
+    Gets the Data of an FSBid endpoint, or None if the call failed
+    '''
+    response = requests.get(url, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'}).json()
 
     if response.get("Data") is None or ((response.get('return_code') and response.get('return_code', -1) == -1) or (response.get('ReturnCode') and response.get('ReturnCode', -1) == -1)):
         logger.error(f"Fsbid call to '{url}' failed.")
         return None
 
+    return response.get("Data")
+
+
+def get_reference_cache_key(url):
+    return f"fsbid_reference:{hashlib.sha256(url.encode('utf-8')).hexdigest()}"
+
+
+def get_cached_fsbid_data(url, jwt_token, timeout=FSBID_REFERENCE_CACHE_TIMEOUT, refresh=False):
+    '''
+    Gets the Data of an FSBid reference endpoint through the shared cache.
+    Only one caller refreshes a missing entry, the others wait for it instead of all hitting FSBid.
+    '''
+    key = get_reference_cache_key(url)
+    if not refresh:
+        data = cache.get(key)
+        if data is not None:
+            return data
+
+    lock_key = f"{key}:lock"
+    if cache.add(lock_key, True, REFERENCE_LOCK_TIMEOUT):
+        try:
+            data = fetch_fsbid_data(url, jwt_token)
+            # failures are never cached so the next caller retries
+            if data is not None:
+                cache.set(key, data, timeout)
+        finally:
+            cache.delete(lock_key)
+        return data
+
+    deadline = time.monotonic() + REFERENCE_LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(0.1)
+        data = cache.get(key)
+        if data is not None:
+            return data
+
+    logger.warning(f"Timed out waiting on the reference cache refresh of '{url}'.")
+    return fetch_fsbid_data(url, jwt_token)
+
+
+def get_fsbid_results(uri, jwt_token, mapping_function, email=None, use_cache=False, api_root=API_ROOT, cache_timeout=FSBID_REFERENCE_CACHE_TIMEOUT):
+    url = f"{api_root}/{uri}"
+    if use_cache:
+        data = get_cached_fsbid_data(url, jwt_token, cache_timeout)
+    else:
+        data = fetch_fsbid_data(url, jwt_token)
+
+    if data is None:
+        return None
+
     # determine if the result is the current user
     if email:
-        for a in response.get("Data"):
+        for a in data:
             a['isCurrentUser'] = True if a.get('email', None) == email else False
 
-    return map(mapping_function, response.get("Data", {}))
+    return map_page(mapping_function, data)
 
 
 def get_individual(uri, query, query_mapping_function, jwt_token, mapping_function, api_root=API_ROOT, use_post=False):
@@ -324,18 +403,77 @@ def send_post_back_office(proc_name, package_name, request_body, request_mapping
         return response
 
 
+def get_count_cache_key(uri, query, count_function, jwt_token, api_root):
+    '''
+    Builds a cache key for a count from the normalized filter set. Paging and ordering don't change
+    the count, and the token is part of the key since counts can depend on the user's permissions.
+    '''
+    items = query.lists() if isinstance(query, QueryDict) else query.items()
+    filters = sorted(
+        (k, sorted(map(str, v if isinstance(v, (list, tuple)) else [v])))
+        for k, v in items if k not in ('page', 'limit', 'ordering')
+    )
+    name = getattr(getattr(count_function, 'func', count_function), '__qualname__', str(count_function))
+    key = json.dumps([api_root, uri, name, jwt_token, filters], default=str)
+    return f"fsbid_count:{hashlib.sha256(key.encode('utf-8')).hexdigest()}"
+
+
+def get_count(uri, query, count_function, jwt_token, api_root):
+    '''
+    Runs a count function, reusing a recent count for the same filters while only the page changes
+    '''
+    key = get_count_cache_key(uri, query, count_function, jwt_token, api_root)
+    count = cache.get(key)
+    if count is None:
+        try:
+            count = count_function(query, jwt_token)['count']
+        finally:
+            # counts run on the shared pool, don't leave a DB connection open on the worker thread
+            connections.close_all()
+        if count is not None:
+            cache.set(key, count, FSBID_COUNT_CACHE_TIMEOUT)
+    return count
+
+
 def send_get_request(uri, query, query_mapping_function, jwt_token, mapping_function, count_function, base_url, host=None, api_root=API_ROOT, use_post=False):
     '''
-    Gets items from FSBid
+    Gets items from FSBid. The count and results requests run concurrently.
     '''
-    pagination = get_pagination(query, count_function(query, jwt_token)['count'], base_url, host) if count_function else {}
     fetch_method = get_results_with_post if use_post else get_results
+    start = time.perf_counter()
+    count_future = count_executor.submit(
+        contextvars.copy_context().run, get_count, uri, query, count_function, jwt_token, api_root
+    ) if count_function else None
+
+    results = fetch_method(uri, query, query_mapping_function, jwt_token, mapping_function, api_root)
+    results_time = time.perf_counter() - start
+
+    pagination = {}
+    if count_future:
+        pagination = get_pagination(query, count_future.result(), base_url, host)
+    total_time = time.perf_counter() - start
+    logger.info(f"FSBid get request to '{api_root}/{uri}': results {results_time:.3f}s, total {total_time:.3f}s")
+
     return {
         **pagination,
-        "results": fetch_method(uri, query, query_mapping_function, jwt_token, mapping_function, api_root)
+        "results": results,
     }
 
 
+def run_concurrently(fn, items, max_workers=FSBID_MAX_WORKERS):
+    '''
+    Calls fn once per item on a bounded thread pool and returns the results in order.
+    Only meant for upstream calls - DB access from the worker threads would open new connections.
+    '''
+    items = list(items)
+    if len(items) <= 1:
+        return list(map(fn, items))
+    # each call runs in a copy of the caller's context so upstream calls are still attributed to its request
+    context = contextvars.copy_context()
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(lambda item: context.copy().run(fn, item), items))
+
+
 def send_put_request(uri, query, query_mapping_function, jwt_token, mapping_function, api_root=API_ROOT):
     mappedQuery = pydash.omit_by(query_mapping_function(query), lambda o: o is None)
     url = f"{api_root}/{uri}"
@@ -344,7 +482,7 @@ def send_put_request(uri, query, query_mapping_function, jwt_token, mapping_func
         logger.error(f"Fsbid call to '{url}' failed.")
         return None
     if mapping_function:
-        return list(map(mapping_function, response.get("Data", {})))
+        return list(map_page(mapping_function, response.get("Data", {})))
     else:
         return response.get("Data", {})
 
@@ -358,7 +496,7 @@ def send_post_request(uri, query, query_mapping_function, jwt_token, mapping_fun
         logger.error(f"Fsbid call to '{url}' failed.")
         return None
     if mapping_function:
-        return list(map(mapping_function, response.get("Data", {})))
+        return list(map_page(mapping_function, response.get("Data", {})))
     else:
         return response.get("Data", {})
 
@@ -402,26 +540,60 @@ def send_count_request(uri, query, query_mapping_function, jwt_token, host=None,
     except:
         logger.error(f"Fsbid call to '{url}' failed.")
 
-# pre-load since this data rarely changes
-obc_vals = list([])
+# OBC ids keyed by post code, loaded once per process since this data rarely changes. The index is rebuilt after
+# OBC_INDEX_TIMEOUT seconds, or once Obc rows are written (load_csv obc bumps the Obc cache version). Checking
+# that version is a cache round trip, so it happens at most every OBC_VERSION_CHECK_INTERVAL seconds.
+obc_index = {"ids": None, "version": None, "loaded": 0, "checked": 0}
+obc_index_lock = threading.Lock()
+
+track_models([Obc])
+
+
+def expire_obc_index(sender, **kwargs):
+    # writes made by this process are seen at once; other processes see them at their next version check
+    obc_index["checked"] = 0
+
+
+post_save.connect(expire_obc_index, sender=Obc, dispatch_uid="obc_index_saved")
+post_delete.connect(expire_obc_index, sender=Obc, dispatch_uid="obc_index_deleted")
+
+
+def get_obc_index():
+    index = obc_index
+    now = time.monotonic()
+    if index["ids"] is not None and now - index["checked"] < OBC_VERSION_CHECK_INTERVAL and now - index["loaded"] < OBC_INDEX_TIMEOUT:
+        return index["ids"]
+    version = get_model_versions([Obc])['organization.obc']
+    with obc_index_lock:
+        if obc_index["ids"] is None or obc_index["version"] != version or now - obc_index["loaded"] > OBC_INDEX_TIMEOUT:
+            ids = dict(Obc.objects.values_list('code', 'obc_id'))
+            obc_index.update(ids=ids, version=version, loaded=time.monotonic())
+        obc_index["checked"] = now
+        return obc_index["ids"]
 
-def get_obc_vals():
-    global obc_vals
-    if not obc_vals:
-        obc_vals = list(Obc.objects.values())
-    return obc_vals
 
 def get_obc_id(post_id):
-    obc = pydash.find(get_obc_vals(), lambda x: x['code'] == post_id)
+    return get_obc_index().get(post_id)
+
+
+def get_obc_ids(post_ids):
+    '''
+    Resolves a page of post codes to their OBC ids (None when unknown) with a single index lookup
+    '''
+    ids = get_obc_index()
+    return {post_id: ids.get(post_id) for post_id in post_ids}
 
-    if obc:
-        return obc['obc_id']
 
-    return None
+def prefetch_obc_ids(data, mapping_function):
+    '''
+    Prefetch hook for position mappers: resolves the OBC ids of a page's post codes once
+    '''
+    obc_ids = get_obc_ids(pydash.uniq(pydash.map_(data, 'pos_location_code')))
+    return partial(mapping_function, obc_ids=obc_ids)
 
 
-def get_post_overview_url(post_id):
-    obc_id = get_obc_id(post_id)
+def get_post_overview_url(post_id, obc_ids=None):
+    obc_id = get_obc_id(post_id) if obc_ids is None else obc_ids.get(post_id)
     if obc_id:
         return {
             'internal': f"{OBC_URL}/post/detail/{obc_id}",
@@ -431,8 +603,8 @@ def get_post_overview_url(post_id):
         return None
 
 
-def get_post_bidding_considerations_url(post_id):
-    obc_id = get_obc_id(post_id)
+def get_post_bidding_considerations_url(post_id, obc_ids=None):
+    obc_id = get_obc_id(post_id) if obc_ids is None else obc_ids.get(post_id)
     if obc_id:
         return {
             'internal': f"{OBC_URL}/post/postdatadetails/{obc_id}",
@@ -469,7 +641,99 @@ def send_get_csv_request(uri, query, query_mapping_function, jwt_token, mapping_
         logger.error(f"Fsbid call to '{url}' failed.")
         return None
 
-    return map(mapping_function, response.get("Data", {}))
+    return map_page(mapping_function, response.get("Data", {}))
+
+
+def fetch_csv_page(uri, query, query_mapping_function, jwt_token, base_url, page, page_size, use_post=False):
+    '''
+    Gets a single unmapped page of items for an export from FSBid
+    '''
+    pageQuery = query.copy()
+    pageQuery['page'] = page
+    pageQuery['limit'] = page_size
+
+    if use_post:
+        mappedQuery = pydash.omit_by(query_mapping_function(pageQuery), lambda o: o is None)
+        url = f"{base_url}/{uri}"
+        response = requests.post(url, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'}, json=mappedQuery).json()
+    else:
+        url = f"{base_url}/{uri}?{query_mapping_function(pageQuery)}"
+        response = requests.get(url, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'}).json()
+
+    if response.get("Data") is None or ((response.get('return_code') and response.get('return_code', -1) == -1) or (response.get('ReturnCode') and response.get('ReturnCode', -1) == -1)):
+        logger.error(f"Fsbid call to '{url}' failed.")
+        return None
+
+    return response.get("Data")
+
+
+def send_get_csv_pages(uri, query, query_mapping_function, jwt_token, mapping_function, base_url, limit=None, use_post=False, page_size=None):
+    '''
+    Gets items for an export from FSBid one page at a time, up to limit items.
+    The first page is fetched eagerly (None if it fails); the rest are fetched and mapped only as rows are written.
+    '''
+    page_size = int(page_size or CSV_PAGE_SIZE)
+    limit = int(limit) if limit else None
+    fetch = partial(fetch_csv_page, uri, query, query_mapping_function, jwt_token, base_url, page_size=page_size, use_post=use_post)
+
+    first = fetch(page=1)
+    if first is None:
+        return None
+
+    # later pages are fetched while the response body is sent, after the request's context has been reset,
+    # so they run in a copy of it to still be attributed to the request
+    context = contextvars.copy_context()
+
+    def pages():
+        data, page, remaining = first, 1, limit
+        while data:
+            if remaining is not None:
+                data = data[:remaining]
+                remaining -= len(data)
+            yield from map_page(mapping_function, data)
+            # a short page is the last one; an oversized one means FSBid ignored the page size
+            if len(data) != page_size or remaining == 0:
+                return
+            page += 1
+            data = context.run(fetch, page=page)
+
+    return pages()
+
+
+def stream_csv_response(rows, filename):
+    '''
+    Streams CSV rows (headers first) to the client in chunks as they are produced, without building the file in memory
+    '''
+    writer = csv.writer(Echo(), csv.excel)
+
+    def content():
+        yield u'\ufeff'
+        chunk = []
+        try:
+            for row in rows:
+                chunk.append(writer.writerow(row))
+                if len(chunk) >= CSV_CHUNK_ROWS:
+                    yield ''.join(chunk)
+                    chunk = []
+        except Exception as e:
+            # headers are already sent, so the download can only be cut short
+            logger.error(f"CSV export {filename} failed: {type(e).__name__} at line {e.__traceback__.tb_lineno} of {__file__}: {e}")
+            raise
+        if chunk:
+            yield ''.join(chunk)
+
+    response = StreamingHttpResponse(content(), content_type='text/csv')
+    response['Content-Disposition'] = f"attachment; filename={filename}_{datetime.now().strftime('%Y_%m_%d_%H%M%S')}.csv"
+    return response
+
+
+class Echo:
+    '''
+    File-like object whose write returns what it was given, so csv.writer can feed a generator
+    '''
+
+    def write(self, value):
+        return value
 
 
 def get_bid_stats_for_csv(record):
@@ -486,13 +750,7 @@ def get_bid_stats_for_csv(record):
     return bid_stats_row_value
 
 
-def get_ap_and_pv_csv(data, filename, ap=False, tandem=False):
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f"attachment; filename={filename}_{datetime.now().strftime('%Y_%m_%d_%H%M%S')}.csv"
-
-    writer = csv.writer(response, csv.excel)
-    response.write(u'\ufeff'.encode('utf8'))
-
+def get_ap_and_pv_csv_rows(data, ap=False, tandem=False):
     # write the headers
     headers = []
     headers.append(smart_str(u"Position"))
@@ -525,17 +783,11 @@ def get_ap_and_pv_csv(data, filename, ap=False, tandem=False):
     if ap:
         headers.append(smart_str(u"Bid Count"))
     headers.append(smart_str(u"Capsule Description"))
-    writer.writerow(headers)
+    yield headers
 
     for record in data:
-        try:
-            ted = smart_str(maya.parse(record["ted"]).datetime().strftime('%m/%d/%Y'))
-        except:
-            ted = "None listed"
-        try:
-            posteddate = smart_str(maya.parse(record["posted_date"]).datetime().strftime('%m/%d/%Y'))
-        except:
-            posteddate = "None listed"
+        ted = smart_str(format_date(record.get("ted"), default="None listed"))
+        posteddate = smart_str(format_date(record.get("posted_date"), default="None listed"))
 
         if record["position"]["post"]["differential_rate"] is not None:
             formattedDifferential = record["position"]["post"]["differential_rate"]
@@ -579,17 +831,14 @@ def get_ap_and_pv_csv(data, filename, ap=False, tandem=False):
             row.append(get_bid_stats_for_csv(record))
         row.append(smart_str(record["position"]["description"]["content"]))
 
-        writer.writerow(row)
-    return response
+        yield row
 
 
-def get_bids_csv(data, filename, jwt_token):
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f"attachment; filename={filename}_{datetime.now().strftime('%Y_%m_%d_%H%M%S')}.csv"
+def get_ap_and_pv_csv(data, filename, ap=False, tandem=False):
+    return stream_csv_response(get_ap_and_pv_csv_rows(data or [], ap, tandem), filename)
 
-    writer = csv.writer(response, csv.excel)
-    response.write(u'\ufeff'.encode('utf8'))
 
+def get_bids_csv_rows(data):
     # write the headers
     headers = []
     headers.append(smart_str(u"Bid Status"))
@@ -615,7 +864,7 @@ def get_bids_csv(data, filename, jwt_token):
     headers.append(smart_str(u"Bid Count"))
     headers.append(smart_str(u"Capsule Description"))
 
-    writer.writerow(headers)
+    yield headers
 
     bid_status = {
         "approved": "Approved",
@@ -635,10 +884,7 @@ def get_bids_csv(data, filename, jwt_token):
 
     for record in data:
         if pydash.get(record, 'position_info') is not None:
-            try:
-                ted = smart_str(maya.parse(pydash.get(record, 'position_info.ted')).datetime().strftime('%m/%d/%Y'))
-            except:
-                ted = "None listed"
+            ted = smart_str(format_date(pydash.get(record, 'position_info.ted'), default="None listed"))
 
             hs_offered = mapBool[pydash.get(record, 'position_info.bid_statistics[0].has_handshake_offered')]
             status = pydash.get(record, "status") or 'N/A'
@@ -672,8 +918,11 @@ def get_bids_csv(data, filename, jwt_token):
             row.append(get_bid_stats_for_csv(pydash.get(record, 'position_info')))
             row.append(smart_str(pydash.get(record, 'position_info.position.description.content')))
 
-            writer.writerow(row)
-    return response
+            yield row
+
+
+def get_bids_csv(data, filename, jwt_token):
+    return stream_csv_response(get_bids_csv_rows(data or []), filename)
 
 
 def archive_favorites(ids, request, isPV=False, favoritesLimit=FAVORITES_LIMIT):
@@ -705,31 +954,38 @@ def archive_favorites(ids, request, isPV=False, favoritesLimit=FAVORITES_LIMIT):
 
 # Determine if the bidder has a competing #1 ranked bid on a position within the requester's org or bureau permissions
 def has_competing_rank(jwt, perdet, pk):
-    rankOneBids = AvailablePositionRanking.objects.filter(bidder_perdet=perdet, rank=0).exclude(cp_id=pk).values_list(
-        "cp_id", flat=True)
-    rankOneBids = list(rankOneBids)
-    aps = []
-    if rankOneBids:
-        ids = ','.join(rankOneBids)
-        ap = apservices.get_available_positions({'id': ids, 'page': 1, 'limit': len(rankOneBids) or 1}, jwt)
-        aps = pydash.map_(ap['results'], 'id')
+    return str(perdet) in get_competing_rank_perdets(jwt, [perdet], pk)
 
-    for y in aps:
-        hasBureauPermissions = empservices.has_bureau_permissions(y, jwt)
-        hasOrgPermissions = empservices.has_org_permissions(y, jwt)
-        if hasBureauPermissions or hasOrgPermissions:
-            # don't bother continuing the loop if we've already found one
-            return True
-    return False
-
-
-def get_bidders_csv(self, pk, data, filename, jwt_token):
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f"attachment; filename={filename}_{datetime.now().strftime('%Y_%m_%d_%H%M%S')}.csv"
-
-    writer = csv.writer(response, csv.excel)
-    response.write(u'\ufeff'.encode('utf8'))
 
+def get_competing_rank_perdets(jwt, perdets, pk):
+    '''
+    Returns the perdets that have a competing #1 ranked bid on an available position within the requester's
+    org or bureau permissions. Costs one ranking query and at most five upstream calls, regardless of bidder count.
+    '''
+    perdets = [str(x) for x in perdets]
+    rankOneBids = AvailablePositionRanking.objects.filter(bidder_perdet__in=perdets, rank=0).exclude(cp_id=pk).values_list(
+        "bidder_perdet", "cp_id")
+    rankOneBids = list(rankOneBids)
+    if not rankOneBids:
+        return set()
+
+    ids = pydash.uniq(pydash.map_(rankOneBids, lambda x: x[1]))
+    aps = get_results_with_post(
+        "available",
+        {'id': ','.join(ids), 'page': 1, 'limit': len(ids)},
+        apservices.convert_ap_query,
+        jwt,
+        lambda ap: str(int(ap.get("cp_id"))),
+        CP_API_V2_ROOT,
+    ) or []
+    if not aps:
+        return set()
+
+    permitted = empservices.get_permitted_cp_ids(aps, jwt)
+    return set([perdet for perdet, cp_id in rankOneBids if str(int(cp_id)) in permitted])
+
+
+def get_bidders_csv_rows(data):
     # write the headers
     headers = []
     headers.append(smart_str(u"Name"))
@@ -745,17 +1001,11 @@ def get_bidders_csv(self, pk, data, filename, jwt_token):
     headers.append(smart_str(u"Handshake Status"))
     headers.append(smart_str(u"Bid Updated by CDO"))
 
-    writer.writerow(headers)
+    yield headers
 
     for record in data:
-        try:
-            ted = smart_str(maya.parse(record["ted"]).datetime().strftime('%m/%d/%Y'))
-        except:
-            ted = "None listed"
-        try:
-            submit_date = smart_str(maya.parse(record["submitted_date"]).datetime().strftime('%m/%d/%Y'))
-        except:
-            submit_date = "None listed"
+        ted = smart_str(format_date(record.get("ted"), default="None listed"))
+        submit_date = smart_str(format_date(record.get("submitted_date"), default="None listed"))
         try:
             cdo_name = smart_str(record["cdo"]["name"])
             cdo_email = smart_str(record["cdo"]["email"])
@@ -778,8 +1028,11 @@ def get_bidders_csv(self, pk, data, filename, jwt_token):
         row.append(hs_status)
         row.append(mapBool[pydash.get(record, "handshake.hs_cdo_indicator", 'default')])
 
-        writer.writerow(row)
-    return response
+        yield row
+
+
+def get_bidders_csv(self, pk, data, filename, jwt_token):
+    return stream_csv_response(get_bidders_csv_rows(data or []), filename)
 
 
 def get_secondary_skill(pos={}):
@@ -957,14 +1210,7 @@ def parse_agenda_remarks(remarks=[]):
     return remarks_values
 
 
-def get_aih_csv(data, filename):
-    filename = re.sub(r'(\_)\1+', r'\1', filename.replace(',', '_').replace(' ', '_').replace("'", '_'))
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f"attachment; filename={filename}_{datetime.now().strftime('%Y_%m_%d_%H%M%S')}.csv"
-
-    writer = csv.writer(response, csv.excel)
-    response.write(u'\ufeff'.encode('utf8'))
-
+def get_aih_csv_rows(data):
     # write the headers
     headers = []
     headers.append(smart_str(u"Position Title"))
@@ -977,23 +1223,14 @@ def get_aih_csv(data, filename):
     headers.append(smart_str(u"Panel Date"))
     headers.append(smart_str(u"Status"))
     headers.append(smart_str(u"Remarks"))
-    writer.writerow(headers)
+    yield headers
 
     for record in data:
-        try:
-            ted = smart_str(maya.parse(pydash.get(record, "assignment.ted")).datetime().strftime('%m/%d/%Y'))
-        except:
-            ted = "None listed"
+        ted = smart_str(format_date(pydash.get(record, "assignment.ted"), default="None listed"))
 
-        try:
-            eta = smart_str(maya.parse(pydash.get(record, "assignment.eta")).datetime().strftime('%m/%d/%Y'))
-        except:
-            eta = "None listed"
+        eta = smart_str(format_date(pydash.get(record, "assignment.eta"), default="None listed"))
 
-        try:
-            panelDate = smart_str(maya.parse(pydash.get(record, "panel_date")).datetime().strftime('%m/%d/%Y'))
-        except:
-            panelDate = "None listed"
+        panelDate = smart_str(format_date(pydash.get(record, "panel_date"), default="None listed"))
 
         try:
             remarks = pydash.map_(pydash.get(record, "remarks", []), 'text')
@@ -1014,8 +1251,12 @@ def get_aih_csv(data, filename):
         row.append(smart_str(pydash.get(record, "status_full")))
         row.append(smart_str(remarks))
 
-        writer.writerow(row)
-    return response
+        yield row
+
+
+def get_aih_csv(data, filename):
+    filename = re.sub(r'(\_)\1+', r'\1', filename.replace(',', '_').replace(' ', '_').replace("'", '_'))
+    return stream_csv_response(get_aih_csv_rows(data or []), filename)
 
 
 def map_return_template_cols(cols, cols_mapping, data):
@@ -1081,10 +1322,7 @@ def csv_fsbid_template_to_tm(data, mapping):
 
 
 def process_dates_csv(date):
-    if date:
-        return maya.parse(date).datetime().strftime('%m/%d/%Y')
-    else:
-        return "None Listed"
+    return format_date(date, default="None Listed")
 
 
 def process_remarks_csv(remarks):
@@ -1116,10 +1354,7 @@ def panel_process_dates_csv(dates):
 
     for date in dates:
         if date['mdtcode'] in columnOrdering.keys():
-            try:
-                columnOrdering.update({date['mdtcode']: smart_str(maya.parse(pydash.get(date, 'pmddttm') or None).datetime(to_timezone='US/Eastern', naive=True).strftime('%m/%d/%Y %H:%M'))})
-            except:
-                columnOrdering.update({date['mdtcode']: 'None Listed'})
+            columnOrdering.update({date['mdtcode']: smart_str(format_date(pydash.get(date, 'pmddttm'), '%m/%d/%Y %H:%M', 'None Listed', 'US/Eastern'))})
 
     return list(columnOrdering.values())
 
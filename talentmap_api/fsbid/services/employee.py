@@ -1,9 +1,12 @@
 import logging
+import hashlib
+import time
 from functools import partial
 from urllib.parse import urlencode, quote
 
 from django.conf import settings
 from django.contrib.auth.models import Group
+from django.core.cache import cache
 from django.http import FileResponse, HttpResponse
 from django.core.exceptions import ValidationError
 
@@ -12,7 +15,6 @@ import pydash
 
 from talentmap_api.fsbid.services.client import map_skill_codes, map_skill_codes_additional
 from talentmap_api.fsbid.requests import requests
-from talentmap_api.fsbid.services.bureau import get_bureau_positions
 from talentmap_api.fsbid.services.assignment_history import assignment_history_to_client_format, get_assignments
 import talentmap_api.fsbid.services.bid as bid_services
 
@@ -20,6 +22,8 @@ import talentmap_api.fsbid.services.bid as bid_services
 API_ROOT = settings.EMPLOYEES_API_URL
 ORG_ROOT = settings.ORG_API_URL
 WS_ROOT = settings.WS_ROOT_API_URL
+PERMISSIONS_CACHE_TIMEOUT = settings.FSBID_PERMISSIONS_CACHE_TIMEOUT
+POSITION_PERMISSIONS_CACHE_TIMEOUT = settings.FSBID_POSITION_PERMISSIONS_CACHE_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
@@ -38,13 +42,13 @@ def get_employee_information(jwt_token, emp_id):
     '''
     Gets the grade and skills for the employee from FSBid
     '''
+    from talentmap_api.fsbid.services.reference import get_skills
+
     url = f"{WS_ROOT}/v1/Persons?request_params.perdet_seq_num={emp_id}"
-    skillUrl = f"{WS_ROOT}/v1/references/skills"
     employee = requests.get(url, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'}).json()
     employee = next(iter(employee.get('Data', [])), {})
     employeeSkills = map_skill_codes(employee)
-    skills = requests.get(skillUrl, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'}).json()
-    skills = pydash.get(skills, 'Data', [])
+    skills = get_skills(jwt_token)
     try:
         return {
             "skills": map_skill_codes(employee),
@@ -65,8 +69,7 @@ def map_group_to_fsbid_role(jwt_token):
         roles = [roles]
     tm_roles = list(map(lambda z: ROLE_MAPPING.get(z), roles))
 
-    orgPermissions = list(get_org_permissions(jwt_token))
-    if len(orgPermissions) >= 1:
+    if get_permission_codes(jwt_token)["org"]:
         tm_roles.append('post_user')
 
     # For developer testing
@@ -98,36 +101,102 @@ ROLE_MAPPING = {
 }
 
 
-def has_bureau_or_org_permissions(cp_id, jwt_token, is_bureau=True):
-    get_permissions = get_bureau_permissions
-    query_prop = "position__bureau__code__in"
+def get_permissions_cache_timeout(jwt_token):
+    '''
+    Seconds the user's permissions may be cached; the remaining life of the token, capped by the configured timeout
+    '''
+    expires = jwt.decode(jwt_token, verify=False).get('exp')
+    if not expires:
+        return PERMISSIONS_CACHE_TIMEOUT
+    return max(0, min(int(expires - time.time()), PERMISSIONS_CACHE_TIMEOUT))
 
-    if not is_bureau:
-        get_permissions = get_org_permissions
-        query_prop = "position__org__code__in"
 
-    permissions = list(get_permissions(jwt_token))
-    codes = (','.join(pydash.map_(permissions, 'code')))
+def get_token_key(jwt_token):
+    return hashlib.sha256(jwt_token.encode('utf-8')).hexdigest()
+
+
+def get_permission_codes(jwt_token):
+    '''
+    Gets the sets of bureau and org codes the user may manage, fetched once per token
+    '''
+    key = f"fsbid_permissions:{get_token_key(jwt_token)}"
+    codes = cache.get(key)
+    if codes is None:
+        codes = {
+            "bureau": set(pydash.map_(list(get_bureau_permissions(jwt_token)), 'code')) - {None},
+            "org": set(pydash.map_(list(get_org_permissions(jwt_token)), 'code')) - {None},
+        }
+        cache.set(key, codes, get_permissions_cache_timeout(jwt_token))
+    return codes
+
+
+def normalize_cp_ids(cp_ids):
+    normalized = []
+    for cp_id in cp_ids:
+        try:
+            normalized.append(str(int(cp_id)))
+        except (TypeError, ValueError):
+            continue
+    return pydash.uniq(normalized)
+
+
+def get_bureau_or_org_permitted_cp_ids(cp_ids, jwt_token, is_bureau=True):
+    '''
+    Returns the subset of cp_ids within the user's bureau (or org) permissions.
+    FSBid decides which positions match the user's codes with a filtered bureau position search, and its answer
+    is cached per token and cp_id.
+    '''
+    from talentmap_api.fsbid.services.bureau import convert_bp_query, CP_API_V2_ROOT
+    from talentmap_api.fsbid.services.common import get_results_with_post
 
+    kind = "bureau" if is_bureau else "org"
+    query_prop = "position__bureau__code__in" if is_bureau else "position__org__code__in"
+    codes = get_permission_codes(jwt_token)[kind]
     if not codes:
-        return False
-    pos = get_bureau_positions(
-        {
-            "id": cp_id,
-            query_prop: codes,
-        },
-        jwt_token
-    )
-    try:
-        pos_cp_id = pydash.get(pos, 'results[0].id')
-        if pos_cp_id:
-            pos_cp_id = str(int(pos_cp_id))
-        if pos_cp_id:
-            return cp_id == pos_cp_id
-    except Exception as e:
-        logger.error(f"{type(e).__name__} at line {e.__traceback__.tb_lineno} of {__file__}: {e}")
-        return False
-    return False
+        return set()
+
+    token_key = get_token_key(jwt_token)
+    keys = {f"fsbid_position_permission:{token_key}:{kind}:{cp_id}": cp_id for cp_id in normalize_cp_ids(cp_ids)}
+    permitted = {keys[key]: allowed for key, allowed in cache.get_many(list(keys)).items()}
+    missing = [cp_id for cp_id in keys.values() if cp_id not in permitted]
+    if missing:
+        matched = get_results_with_post(
+            "",
+            {"id": ','.join(missing), "limit": len(missing), query_prop: ','.join(sorted(codes))},
+            partial(convert_bp_query, use_post=True),
+            jwt_token,
+            lambda bp: str(int(bp.get("cp_id"))),
+            CP_API_V2_ROOT,
+        )
+        if matched is None:
+            # a failed search grants nothing, and isn't cached
+            return {cp_id for cp_id, allowed in permitted.items() if allowed}
+        resolved = {cp_id: cp_id in matched for cp_id in missing}
+        timeout = min(POSITION_PERMISSIONS_CACHE_TIMEOUT, get_permissions_cache_timeout(jwt_token))
+        cache.set_many({f"fsbid_position_permission:{token_key}:{kind}:{cp_id}": allowed for cp_id, allowed in resolved.items()}, timeout)
+        permitted.update(resolved)
+    return {cp_id for cp_id, allowed in permitted.items() if allowed}
+
+
+def get_permitted_cp_ids(cp_ids, jwt_token):
+    '''
+    Returns the subset of cp_ids within either the user's bureau or org permissions
+    '''
+    return get_bureau_or_org_permitted_cp_ids(cp_ids, jwt_token, True) | get_bureau_or_org_permitted_cp_ids(cp_ids, jwt_token, False)
+
+
+def get_position_permissions(cp_id, jwt_token):
+    '''
+    Returns whether the user has bureau and org permissions for the cycle position
+    '''
+    return {
+        "bureau": bool(get_bureau_or_org_permitted_cp_ids([cp_id], jwt_token, True)),
+        "org": bool(get_bureau_or_org_permitted_cp_ids([cp_id], jwt_token, False)),
+    }
+
+
+def has_bureau_or_org_permissions(cp_id, jwt_token, is_bureau=True):
+    return get_position_permissions(cp_id, jwt_token)["bureau" if is_bureau else "org"]
 
 
 def has_bureau_permissions(cp_id, jwt_token):
@@ -111,15 +111,13 @@ def get_projected_vacancies_tandem_count(query, jwt_token, host=None):
 
 
 def get_projected_vacancies_csv(query, jwt_token, host=None, limit=None, includeLimit=False):
-    data = services.send_get_csv_request(
+    data = services.send_get_csv_pages(
         "",
         query,
         convert_pv_query,
         jwt_token,
         fsbid_pv_to_talentmap_pv,
         PV_API_V2_URL,
-        host,
-        None,
         limit,
         True,
     )
@@ -134,15 +132,13 @@ def get_projected_vacancies_csv(query, jwt_token, host=None, limit=None, include
 
 
 def get_projected_vacancies_tandem_csv(query, jwt_token, host=None, limit=None, includeLimit=False):
-    data = services.send_get_csv_request(
+    data = services.send_get_csv_pages(
         "tandem",
         query,
         partial(convert_pv_query, isTandem=True),
         jwt_token,
         fsbid_pv_to_talentmap_pv,
         PV_API_V2_URL,
-        host,
-        None,
         limit,
         True,
     )
@@ -156,10 +152,17 @@ def get_projected_vacancies_tandem_csv(query, jwt_token, host=None, limit=None,
     return response
 
 
-def fsbid_pv_to_talentmap_pv(pv):
+def prefetch_obc_ids(data, mapping_function):
+    # resolved at call time, since common imports this module before defining it
+    return services.prefetch_obc_ids(data, mapping_function)
+
+
+def fsbid_pv_to_talentmap_pv(pv, obc_ids=None):
     '''
     Converts the response projected vacancy from FSBid to a format more in line with the Talentmap position
     '''
+    if obc_ids is None:
+        obc_ids = services.get_obc_ids([pv.get("pos_location_code", None)])
     ted = ensure_date(pv.get("fv_override_ted_date", None), utc_offset=-5)
     if ted is None:
         ted = ensure_date(pv.get("ted", None), utc_offset=-5)
@@ -196,9 +199,9 @@ def fsbid_pv_to_talentmap_pv(pv):
             },
             "post": {
                 "tour_of_duty": pv.get("tod", None),
-                "post_overview_url": services.get_post_overview_url(pv.get("pos_location_code", None)),
-                "post_bidding_considerations_url": services.get_post_bidding_considerations_url(pv.get("pos_location_code", None)),
-                "obc_id": services.get_obc_id(pv.get("pos_location_code", None)),
+                "post_overview_url": services.get_post_overview_url(pv.get("pos_location_code", None), obc_ids),
+                "post_bidding_considerations_url": services.get_post_bidding_considerations_url(pv.get("pos_location_code", None), obc_ids),
+                "obc_id": obc_ids.get(pv.get("pos_location_code", None)),
                 "differential_rate": pv.get("bt_differential_rate_num", None),
                 "danger_pay": pv.get("bt_danger_pay_num", None),
                 "location": {
@@ -250,6 +253,9 @@ def fsbid_pv_to_talentmap_pv(pv):
     }
 
 
+fsbid_pv_to_talentmap_pv.prefetch = prefetch_obc_ids
+
+
 def convert_pv_query(query, isTandem=False):
     '''
     Converts TalentMap filters into FSBid filters
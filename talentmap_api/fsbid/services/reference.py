@@ -29,10 +29,36 @@ def get_cycles(jwt_token):
         mapping_function,
         None,
         True,
+        cache_timeout=view.cache_timeout,
     )
     return list(response)
 
 
+def get_reference_data(view, jwt_token, refresh=False):
+    '''
+    Gets the unmapped FSBid data behind a reference view from the shared reference cache
+    '''
+    return common.get_cached_fsbid_data(f"{API_ROOT}/{view.uri}", jwt_token, view.cache_timeout, refresh)
+
+
+def get_skills(jwt_token):
+    '''
+    Gets the unmapped skill codes
+    '''
+    return get_reference_data(views.FSBidCodesView, jwt_token) or []
+
+
+def get_reference_views():
+    '''
+    Returns the reference views whose data is cached, one per FSBid endpoint
+    '''
+    reference_views = {}
+    for view in vars(views).values():
+        if isinstance(view, type) and issubclass(view, views.BaseView) and view.uri and view.cache_timeout is not None:
+            reference_views.setdefault(view.uri, view)
+    return list(reference_views.values())
+
+
 @staticmethod
 def fsbid_danger_pay_to_talentmap_danger_pay(data):
     return {
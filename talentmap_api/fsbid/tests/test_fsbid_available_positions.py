@@ -65,3 +65,36 @@ def test_available_position_actions(authorized_client, authorized_user):
         mock_get.return_value.json.return_value = {"Data": [ap], "return_code": 0}
         response = authorized_client.get(f'/api/v1/fsbid/available_positions/{ap["cp_id"]}/', HTTP_JWT=fake_jwt)
         assert response.json()['id'] == ap['cp_id']
+
+
+def count_designation_queries(queries):
+    return len([q for q in queries if 'availablepositiondesignation' in q['sql'].lower()])
+
+
+@pytest.mark.django_db(transaction=True)
+def test_available_positions_designation_queries():
+    from django.db import connection
+    from django.http import QueryDict
+    from django.test.utils import CaptureQueriesContext
+    from talentmap_api.fsbid.services import available_positions as services
+
+    aps = [{**ap, "cp_id": cp_id} for cp_id in range(1, 51)]
+    mommy.make('available_positions.AvailablePositionDesignation', cp_id="2", is_highlighted=True)
+
+    with patch('talentmap_api.fsbid.services.common.requests.post') as mock_post:
+        mock_post.return_value = Mock(ok=True)
+        mock_post.return_value.json.return_value = {"Data": aps, "return_code": 0}
+
+        searches = [
+            lambda: services.get_available_positions(QueryDict(""), fake_jwt),
+            lambda: services.get_available_positions_tandem(QueryDict(""), fake_jwt),
+            # favorites search by cp_id
+            lambda: services.get_available_positions(QueryDict(f"id={','.join(map(str, range(1, 51)))}&limit=50&page=1"), fake_jwt),
+        ]
+        for search in searches:
+            with CaptureQueriesContext(connection) as context:
+                results = search()["results"]
+            assert len(results) == 50
+            assert count_designation_queries(context.captured_queries) == 1
+            assert results[1]["position"]["is_highlighted"] is True
+            assert results[0]["position"]["is_highlighted"] is False
@@ -77,3 +77,47 @@ def test_bidlist_position_actions(authorized_client, authorized_user):
             mock_del.return_value = Mock(ok=True)
             response = authorized_client.delete('/api/v1/fsbid/bidlist/position/1/', HTTP_JWT=fake_jwt)
             assert response.status_code == status.HTTP_204_NO_CONTENT
+
+
+@pytest.mark.django_db()
+def test_accept_handshake_disabled_checks_only_accepted_handshakes():
+    from talentmap_api.fsbid.services.bid import is_accept_handshake_disabled
+
+    with patch('talentmap_api.fsbid.services.bid.requests.get') as mock_get:
+        # no accepted handshakes, so no upstream calls
+        assert not is_accept_handshake_disabled(2, 1, fake_jwt)
+        assert not mock_get.called
+
+        mommy.make('bidding.BidHandshake', cp_id='5', bidder_perdet='2', status='A', bidder_status='A')
+        mock_get.return_value.json.return_value = {'Data': [bid, {**bid, 'cp_id': 5}]}
+        with patch('talentmap_api.fsbid.services.common.get_results_with_post') as mock_positions:
+            mock_positions.return_value = [{'id': 1, 'bidcycle': {'id': 10}}, {'id': 5, 'bidcycle': {'id': 10}}]
+            assert is_accept_handshake_disabled(2, 1, fake_jwt)
+
+            mock_positions.return_value = [{'id': 1, 'bidcycle': {'id': 10}}, {'id': 5, 'bidcycle': {'id': 11}}]
+            assert not is_accept_handshake_disabled(2, 1, fake_jwt)
+
+        # the accepted handshake is on this position
+        assert not is_accept_handshake_disabled(2, 5, fake_jwt)
+
+
+@pytest.mark.django_db()
+def test_bids_hydration_loads_positions_in_one_call():
+    from talentmap_api.fsbid.services.bid import get_bids_hydration, fsbid_bid_to_talentmap_bid
+
+    bids = [{**bid, "cp_id": cp_id, "perdet_seq_num": 2 + cp_id % 2} for cp_id in range(1, 11)]
+
+    def get_positions(uri, query, query_mapping_function, jwt_token, mapping_function, api_root):
+        return [{"id": int(cp_id), "title": f"Position {cp_id}", "bidcycle": {"id": 1}} for cp_id in query["id"].split(',')]
+
+    with patch('talentmap_api.fsbid.services.common.get_results_with_post', side_effect=get_positions) as mock_post:
+        hydration = get_bids_hydration(bids, fake_jwt)
+        mock_post.assert_called_once()
+        assert mock_post.call_args[0][1]["id"].split(',') == [str(b["cp_id"]) for b in bids]
+
+        hydrated = [fsbid_bid_to_talentmap_bid(b, fake_jwt, hydration) for b in bids]
+        assert mock_post.call_count == 1
+
+        # the same rows the per-bid lookups return
+        assert hydrated == [fsbid_bid_to_talentmap_bid(b, fake_jwt) for b in bids]
+        assert mock_post.call_count == 1 + len(bids)
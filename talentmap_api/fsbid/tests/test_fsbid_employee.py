@@ -19,3 +19,52 @@ def test_employee_perdet_seq_num_actions(authorized_client, authorized_user):
         mock_get.return_value.json.return_value = {}
         response = authorized_client.put('/api/v1/fsbid/employee/perdet_seq_num/', HTTP_JWT=fake_jwt)
         assert response.status_code == status.HTTP_204_NO_CONTENT
+
+
+def test_permitted_cp_ids_resolve_once_per_token():
+    from django.core.cache.backends.locmem import LocMemCache
+    from talentmap_api.fsbid.services import employee
+
+    def get_permissions(url, **kwargs):
+        response = Mock(ok=True)
+        if url.endswith('bureauPermissions'):
+            response.json.return_value = {"Data": [{"bur": "110000"}]}
+        else:
+            response.json.return_value = {"Data": [{"org_code": "ORG1"}]}
+        return response
+
+    # FSBid's bureau position search, filtered by the cp_ids and bureau or org codes asked for
+    positions = [
+        {"cp_id": 1, "bureau": "110000", "org": "ORG9"},
+        {"cp_id": 2, "bureau": "120000", "org": "ORG1"},
+        {"cp_id": 3, "bureau": "120000", "org": "ORG9"},
+    ]
+
+    def search_positions(url, json=None, **kwargs):
+        response = Mock(ok=True)
+        response.json.return_value = {"Data": [
+            {"cp_id": p["cp_id"]} for p in positions
+            if str(p["cp_id"]) in json["cp_ids"]
+            and p["bureau"] in json.get("bureaus", [p["bureau"]])
+            and p["org"] in json.get("org_codes", [p["org"]])
+        ]}
+        return response
+
+    with patch('talentmap_api.fsbid.services.employee.cache', LocMemCache('permissions-test', {})), \
+            patch('talentmap_api.fsbid.services.employee.get_permissions_cache_timeout', return_value=60), \
+            patch('talentmap_api.fsbid.services.common.requests.get', side_effect=get_permissions) as mock_get, \
+            patch('talentmap_api.fsbid.services.common.requests.post', side_effect=search_positions) as mock_post:
+        assert employee.get_permitted_cp_ids(["1", "2", "3", "4"], fake_jwt) == {"1", "2"}
+        assert mock_post.call_args_list[0][1]["json"]["bureaus"] == ["110000"]
+        assert mock_post.call_args_list[1][1]["json"]["org_codes"] == ["ORG1"]
+
+        # answers are reused for the same token
+        assert employee.get_position_permissions("1", fake_jwt) == {"bureau": True, "org": False}
+        assert employee.has_org_permissions("2", fake_jwt)
+        assert not employee.has_bureau_permissions("4", fake_jwt)
+        assert mock_get.call_count == 2
+        assert mock_post.call_count == 2
+
+        # but not shared with other tokens
+        assert employee.get_position_permissions("2", f"{fake_jwt}x") == {"bureau": False, "org": True}
+        assert mock_post.call_count == 4
@@ -88,3 +88,24 @@ def test_fsbid_languages(authorized_client, authorized_user):
         assert response.status_code == status.HTTP_200_OK
         data = response.json()[0]
         assert data['code'] == languages[0]['language_code']
+
+
+def test_reference_cache_single_flight():
+    from django.core.cache.backends.locmem import LocMemCache
+    from talentmap_api.fsbid.services import common
+
+    url = 'http://fsbid/v1/references/grades'
+    with patch('talentmap_api.fsbid.services.common.cache', LocMemCache('reference-test', {})), patch('talentmap_api.fsbid.services.common.requests.get') as mock_get:
+        mock_get.return_value.json.return_value = {"Data": [{"grade_code": "01"}], "return_code": 0}
+        assert common.get_cached_fsbid_data(url, fake_jwt) == [{"grade_code": "01"}]
+        assert common.get_cached_fsbid_data(url, fake_jwt) == [{"grade_code": "01"}]
+        assert mock_get.call_count == 1
+
+        common.get_cached_fsbid_data(url, fake_jwt, refresh=True)
+        assert mock_get.call_count == 2
+
+        # failures are not cached
+        mock_get.return_value.json.return_value = {"Data": None, "return_code": -1}
+        assert common.get_cached_fsbid_data('http://fsbid/v1/cycles', fake_jwt) is None
+        assert common.get_cached_fsbid_data('http://fsbid/v1/cycles', fake_jwt) is None
+        assert mock_get.call_count == 4
@@ -0,0 +1,69 @@
+from unittest.mock import patch
+
+from django.conf import settings
+
+
+def test_transport_routes_to_most_specific_root():
+    from talentmap_api.fsbid.requests import FSBidTransport, DEFAULT_ROOT
+
+    transport = FSBidTransport()
+    assert transport.resolve_root(f"{settings.CP_API_V2_URL}/available") == 'CP_API_V2_URL'
+    assert transport.resolve_root(f"{settings.BACKOFFICE_CRUD_URL}?procName=x") == 'BACKOFFICE_CRUD_URL'
+    assert transport.resolve_root("http://elsewhere/v1/thing") == DEFAULT_ROOT
+
+
+def test_transport_reuses_session_and_applies_root_timeout():
+    from talentmap_api.fsbid.requests import FSBidTransport
+
+    transport = FSBidTransport()
+    assert transport.get_session('CP_API_V2_URL') is transport.get_session('CP_API_V2_URL')
+    assert transport.get_session('CP_API_V2_URL') is not transport.get_session('SECREF_URL')
+
+    with patch('requests.Session.request') as mock_request:
+        transport.get(f"{settings.BACKOFFICE_CRUD_URL}?procName=x")
+        _, kwargs = mock_request.call_args
+        assert kwargs['timeout'] == (
+            settings.FSBID_TRANSPORT_DEFAULTS['connect_timeout'],
+            settings.FSBID_TRANSPORT_ROOTS['BACKOFFICE_CRUD_URL']['read_timeout'],
+        )
+
+        transport.get(f"{settings.CP_API_V2_URL}/available", timeout=1)
+        _, kwargs = mock_request.call_args
+        assert kwargs['timeout'] == 1
+
+    assert 'CP_API_V2_URL' in transport.get_pool_stats()
+
+
+def test_transport_only_replays_reads():
+    from talentmap_api.fsbid.requests import FSBidTransport
+
+    retry = FSBidTransport().get_session('BACKOFFICE_CRUD_URL').get_adapter('https://fsbid').max_retries
+    assert retry.connect == settings.FSBID_TRANSPORT_DEFAULTS['retries']
+    assert retry.is_retry('GET', 503)
+    for method in ['POST', 'PUT', 'PATCH', 'DELETE']:
+        assert not retry.is_retry(method, 503)
+
+
+def test_upstream_metrics_group_calls_by_endpoint_and_request():
+    from talentmap_api.fsbid.metrics import UpstreamMetrics, RequestUpstream, current_request, get_endpoint
+
+    assert get_endpoint('CLIENTS_API_V2_URL', 'GET', 'http://fsbid/v2/clients/123456/assignments?x=1') == 'GET CLIENTS_API_V2_URL /v2/clients/{id}/assignments'
+    assert get_endpoint('BACKOFFICE_CRUD_URL', 'POST', 'http://fsbid/crud?procName=act_get&packageName=pkg') == 'POST BACKOFFICE_CRUD_URL proc:pkg.act_get'
+
+    metrics = UpstreamMetrics()
+    upstream = RequestUpstream()
+    token = current_request.set(upstream)
+    try:
+        metrics.record_call('CP_API_V2_URL', 'POST', 'http://fsbid/available', 40, 200, 10, 1000)
+        metrics.record_call('CP_API_V2_URL', 'POST', 'http://fsbid/available', 600, 503)
+    finally:
+        current_request.reset(token)
+    metrics.record_request('fsbid.available-positions', upstream)
+
+    snapshot = metrics.snapshot()
+    available = snapshot['endpoints']['POST CP_API_V2_URL /available']
+    assert available['calls'] == 2
+    assert available['error_rate'] == 0.5
+    assert available['latency_ms']['50'] == 1
+    assert available['latency_ms']['1000'] == 1
+    assert snapshot['views']['fsbid.available-positions']['upstream_calls'] == 2
@@ -79,7 +79,7 @@ class FSBidListPositionActionView(APIView):
         Returns 204 if the position is in the list, otherwise, 404
         '''
         user = UserProfile.objects.get(user=self.request.user)
-        if len(services.user_bids(user.emp_id, request.META['HTTP_JWT'], pk)) > 0:
+        if services.get_user_bid(user.emp_id, pk, request.META['HTTP_JWT']) is not None:
             return Response(status=status.HTTP_204_NO_CONTENT)
         else:
             return Response(status=status.HTTP_404_NOT_FOUND)
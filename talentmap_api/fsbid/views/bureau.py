@@ -107,8 +107,9 @@ class FSBidBureauPositionView(BaseView):
         '''
         Gets a bureau position
         '''
-        hasBureauPermissions = empservices.has_bureau_permissions(pk, self.request.META['HTTP_JWT'])
-        hasOrgPermissions = empservices.has_org_permissions(pk, self.request.META['HTTP_JWT'])
+        permissions = empservices.get_position_permissions(pk, self.request.META['HTTP_JWT'])
+        hasBureauPermissions = permissions["bureau"]
+        hasOrgPermissions = permissions["org"]
         result = services.get_bureau_position(pk, request.META['HTTP_JWT'])
         if result is None:
             return Response(status=status.HTTP_404_NOT_FOUND)
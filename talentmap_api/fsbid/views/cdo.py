@@ -175,7 +175,7 @@ class FSBidListPositionActionView(BaseView):
 
         Returns 204 if the position is in the list, otherwise, 404
         '''
-        if len(services.user_bids(client_id, request.META['HTTP_JWT'], pk)) > 0:
+        if services.get_user_bid(client_id, pk, request.META['HTTP_JWT']) is not None:
             return Response(status=status.HTTP_204_NO_CONTENT)
         else:
             return Response(status=status.HTTP_404_NOT_FOUND)
@@ -13,7 +13,7 @@ from drf_yasg import openapi
 from talentmap_api.common.permissions import isDjangoGroupMemberOrReadOnly, isDjangoGroupMember
 from talentmap_api.fsbid.views.base import BaseView
 from rest_framework.views import APIView
-from talentmap_api.common.common_helpers import user_in_any_group
+from talentmap_api.common.common_helpers import user_in_any_group, clear_user_group_names
 import talentmap_api.fsbid.services.employee as services
 import talentmap_api.fsbid.services.client as client_services
 
@@ -42,16 +42,19 @@ class FSBidEmployeePerdetSeqNumActionView(BaseView):
         user_roles = services.map_group_to_fsbid_role(jwt)
 
         # Add roles
-        for current_role in user_roles:
-            auth_user.groups.add(current_role)
+        auth_user.groups.add(*user_roles)
 
         # Remove any roles that the user has lost since the last time they logged in
-        for role in services.ROLE_MAPPING.values():
-            if role not in user_roles.values_list('name', flat=True):
-                auth_user.groups.remove(Group.objects.filter(name=role).first())
+        role_names = set(user_roles.values_list('name', flat=True))
+        lost_roles = Group.objects.filter(name__in=set(services.ROLE_MAPPING.values()) - role_names)
+        auth_user.groups.remove(*lost_roles)
 
         auth_user.save()
 
+        # The groups signal has already done this for each change; it is repeated in case no role changed
+        # but the cache still holds groups from before a change made outside the app
+        clear_user_group_names([auth_user.pk])
+
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -9,6 +9,8 @@ import talentmap_api.fsbid.services.reference as services
 import talentmap_api.fsbid.services.common as common
 
 TP_ROOT = settings.TP_API_URL
+REFERENCE_CACHE_TIMEOUT = settings.FSBID_REFERENCE_CACHE_TIMEOUT
+CYCLES_CACHE_TIMEOUT = settings.FSBID_CYCLES_CACHE_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
@@ -16,51 +18,61 @@ logger = logging.getLogger(__name__)
 class FSBidDangerPayView(BaseView):
     uri = "v1/posts/dangerpays"
     mapping_function = services.fsbid_danger_pay_to_talentmap_danger_pay
+    cache_timeout = REFERENCE_CACHE_TIMEOUT
 
 
 class FSBidCyclesView(BaseView):
     uri = "v1/cycles"
     mapping_function = services.fsbid_cycles_to_talentmap_cycles
+    cache_timeout = CYCLES_CACHE_TIMEOUT
 
 
 class FSBidBureausView(BaseView):
     uri = "v1/fsbid/bureaus"
     mapping_function = services.fsbid_bureaus_to_talentmap_bureaus
+    cache_timeout = REFERENCE_CACHE_TIMEOUT
 
 
 class FSBidDifferentialRatesView(BaseView):
     uri = "v1/posts/differentialrates"
     mapping_function = services.fsbid_differential_rates_to_talentmap_differential_rates
+    cache_timeout = REFERENCE_CACHE_TIMEOUT
 
 
 class FSBidGradesView(BaseView):
     uri = "v1/references/grades"
     mapping_function = services.fsbid_grade_to_talentmap_grade
+    cache_timeout = REFERENCE_CACHE_TIMEOUT
 
 
 class FSBidLanguagesView(BaseView):
     uri = "v1/references/languages"
     mapping_function = services.fsbid_languages_to_talentmap_languages
+    cache_timeout = REFERENCE_CACHE_TIMEOUT
 
 
 class FSBidTourOfDutiesView(BaseView):
     uri = "v1/posts/tourofduties"
     mapping_function = services.fsbid_tour_of_duties_to_talentmap_tour_of_duties
+    cache_timeout = REFERENCE_CACHE_TIMEOUT
 
 
 class FSBidToursOfDutyView(BaseView):
     uri = "v1/references/tours-of-duty"
     mapping_function = services.fsbid_tours_of_duty_to_talentmap_tours_of_duty
+    cache_timeout = REFERENCE_CACHE_TIMEOUT
 
 
 class FSBidCodesView(BaseView):
     uri = "v1/references/skills"
     mapping_function = services.fsbid_codes_to_talentmap_codes
+    cache_timeout = REFERENCE_CACHE_TIMEOUT
 
 
 class FSBidLocationsView(BaseView):
     uri = "v1/references/Locations"
     mapping_function = services.fsbid_locations_to_talentmap_locations
+    cache_timeout = REFERENCE_CACHE_TIMEOUT
 
 class FSBidGSALocationsView(BaseView):
     @swagger_auto_schema(
@@ -84,6 +96,7 @@ class FSBidGSALocationsView(BaseView):
 class FSBidConesView(BaseView):
     uri = "v1/references/skills"
     mapping_function = services.fsbid_codes_to_talentmap_cones
+    cache_timeout = REFERENCE_CACHE_TIMEOUT
 
     def modCones(self, results):
         results = list(results)
@@ -142,16 +155,19 @@ class FSBidClassificationsView(BaseView):
 class FSBidPostIndicatorsView(BaseView):
     uri = "v1/posts/attributes?codeTableName=PostIndicatorTable"
     mapping_function = services.fsbid_post_indicators_to_talentmap_indicators
+    cache_timeout = REFERENCE_CACHE_TIMEOUT
 
 
 class FSBidUnaccompaniedStatusView(BaseView):
     uri = "v1/posts/attributes?codeTableName=UnaccompaniedTable"
     mapping_function = services.fsbid_us_to_talentmap_us
+    cache_timeout = REFERENCE_CACHE_TIMEOUT
 
 
 class FSBidCommuterPostsView(BaseView):
     uri = "v1/posts/attributes?codeTableName=CommuterPostTable"
     mapping_function = services.fsbid_commuter_posts_to_talentmap_commuter_posts
+    cache_timeout = REFERENCE_CACHE_TIMEOUT
 
 class FSBidTravelFunctionsView(BaseView):
 
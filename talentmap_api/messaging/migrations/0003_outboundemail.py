@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0002_notification_meta'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboundEmail',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(help_text='The subject of the email', max_length=255)),
+                ('body', models.TextField(help_text='The message inserted into the email template')),
+                ('recipients', models.CharField(help_text='Comma separated recipient addresses', max_length=2000)),
+                ('status', models.CharField(choices=[('P', 'Pending'), ('S', 'Sending'), ('D', 'Sent'), ('F', 'Failed')], db_index=True, default='P', max_length=1)),
+                ('attempts', models.IntegerField(default=0, help_text='Number of failed send attempts')),
+                ('last_error', models.CharField(blank=True, max_length=255, null=True)),
+                ('date_created', models.DateTimeField(auto_now_add=True)),
+                ('next_attempt', models.DateTimeField(help_text='Earliest time the next send may be attempted')),
+                ('date_claimed', models.DateTimeField(help_text='When a worker picked the email up for sending', null=True)),
+                ('date_sent', models.DateTimeField(null=True)),
+            ],
+            options={
+                'ordering': ['next_attempt'],
+                'managed': True,
+            },
+        ),
+    ]
@@ -0,0 +1,65 @@
+import json
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+BATCH_SIZE = 1000
+
+
+def backfill_notification_index(apps, schema_editor):
+    Notification = apps.get_model('messaging', 'Notification')
+    NotificationTag = apps.get_model('messaging', 'NotificationTag')
+
+    def get_bidcycle_id(meta):
+        try:
+            bidcycle_id = json.loads(meta or '{}').get('bidcycle_id')
+        except (ValueError, AttributeError):
+            return None
+        return None if bidcycle_id in (None, '') else f"{bidcycle_id}"
+
+    notifications = []
+    tags = []
+    for notification in Notification.objects.only('id', 'tags', 'meta').iterator(chunk_size=BATCH_SIZE):
+        bidcycle_id = get_bidcycle_id(notification.meta)
+        if bidcycle_id:
+            notification.bidcycle_id = bidcycle_id
+            notifications.append(notification)
+        tags += [NotificationTag(notification_id=notification.id, tag=tag) for tag in {f"{tag}" for tag in notification.tags or [] if tag}]
+
+        if len(notifications) >= BATCH_SIZE:
+            Notification.objects.bulk_update(notifications, ['bidcycle_id'])
+            notifications = []
+        if len(tags) >= BATCH_SIZE:
+            NotificationTag.objects.bulk_create(tags)
+            tags = []
+
+    Notification.objects.bulk_update(notifications, ['bidcycle_id'])
+    NotificationTag.objects.bulk_create(tags)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0003_outboundemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='bidcycle_id',
+            field=models.CharField(db_index=True, help_text='The bid cycle the notification refers to', max_length=255, null=True),
+        ),
+        migrations.CreateModel(
+            name='NotificationTag',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag', models.CharField(db_index=True, max_length=255)),
+                ('notification', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_index', to='messaging.notification')),
+            ],
+            options={
+                'managed': True,
+                'unique_together': {('notification', 'tag')},
+            },
+        ),
+        migrations.RunPython(backfill_notification_index, migrations.RunPython.noop),
+    ]
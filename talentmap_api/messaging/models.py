@@ -1,7 +1,20 @@
+import json
+
 from django.db import models
 from jsonfield import JSONField
 
 
+def get_meta_bidcycle_id(meta):
+    '''
+    Returns the bidcycle_id stored in a notification's meta, as a string
+    '''
+    try:
+        bidcycle_id = json.loads(meta or '{}').get('bidcycle_id')
+    except (ValueError, AttributeError):
+        return None
+    return None if bidcycle_id in (None, '') else f"{bidcycle_id}"
+
+
 class Notification(models.Model):
     '''
     This model represents an individual notification item
@@ -12,11 +25,82 @@ class Notification(models.Model):
     tags = JSONField(default=[], help_text="Tags to categorize the notification")
     meta = models.TextField(default='{}', help_text="Meta data about the notification") # Has to be TextField due to ORA-01754
 
+    # Copied from meta on save so that notifications for unrevealed handshake cycles can be excluded in SQL
+    bidcycle_id = models.CharField(max_length=255, null=True, db_index=True, help_text="The bid cycle the notification refers to")
+
     is_read = models.BooleanField(default=False, help_text="Whether this notification has been read")
 
     date_created = models.DateTimeField(auto_now_add=True)
     date_updated = models.DateTimeField(auto_now=True)
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'meta' in update_fields:
+            self.bidcycle_id = get_meta_bidcycle_id(self.meta)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'bidcycle_id'}
+        created = self.pk is None
+        super(Notification, self).save(*args, **kwargs)
+        if update_fields is None or 'tags' in update_fields:
+            self.index_tags(created)
+
+    def index_tags(self, created=False):
+        '''
+        Mirrors the tags JSON into NotificationTag rows, which can be filtered on in SQL
+        '''
+        tags = {f"{tag}" for tag in self.tags or [] if tag}
+        existing = set() if created else set(self.tag_index.values_list('tag', flat=True))
+        if existing - tags:
+            self.tag_index.filter(tag__in=existing - tags).delete()
+        NotificationTag.objects.bulk_create([NotificationTag(notification=self, tag=tag) for tag in tags - existing])
+
     class Meta:
         managed = True
         ordering = ["date_updated"]
+
+
+class NotificationTag(models.Model):
+    '''
+    One tag of a notification
+    '''
+
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name="tag_index")
+    tag = models.CharField(max_length=255, db_index=True)
+
+    class Meta:
+        managed = True
+        unique_together = ('notification', 'tag',)
+
+
+class OutboundEmail(models.Model):
+    '''
+    An email waiting in (or sent through) the outbox
+    '''
+
+    STATUS_PENDING = 'P'
+    STATUS_SENDING = 'S'
+    STATUS_SENT = 'D'
+    STATUS_FAILED = 'F'
+    STATUS_CHOICES = (
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENDING, 'Sending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_FAILED, 'Failed'),
+    )
+
+    subject = models.CharField(max_length=255, help_text="The subject of the email")
+    body = models.TextField(help_text="The message inserted into the email template")
+    recipients = models.CharField(max_length=2000, help_text="Comma separated recipient addresses")
+
+    status = models.CharField(max_length=1, choices=STATUS_CHOICES, default=STATUS_PENDING, db_index=True)
+    attempts = models.IntegerField(default=0, help_text="Number of failed send attempts")
+    last_error = models.CharField(max_length=255, null=True, blank=True)
+
+    date_created = models.DateTimeField(auto_now_add=True)
+    next_attempt = models.DateTimeField(help_text="Earliest time the next send may be attempted")
+    date_claimed = models.DateTimeField(null=True, help_text="When a worker picked the email up for sending")
+    date_sent = models.DateTimeField(null=True)
+
+    class Meta:
+        managed = True
+        ordering = ["next_attempt"]
@@ -0,0 +1,254 @@
+'''
+Database-backed outbox for notification emails.
+
+Emails are stored as OutboundEmail rows and sent by a small, fixed pool of worker threads per process.
+Each worker claims a batch of due emails and sends it over a single SMTP connection. Failed sends are
+retried with exponential backoff until EMAIL_OUTBOX_MAX_ATTEMPTS. Rows survive restarts, and several
+processes may drain the same outbox because batches are claimed with SELECT ... FOR UPDATE SKIP LOCKED.
+'''
+import logging
+import os
+import threading
+import time
+from datetime import timedelta
+from email.mime.image import MIMEImage
+from string import Template
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connections, transaction
+from django.db.models import Q, Count, Min
+from django.utils import timezone
+
+from talentmap_api.messaging.models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+EMAIL_DIR = os.path.join(os.path.dirname(__file__), 'email')
+
+# Emails claimed by a worker that died mid-send are handed out again after this long
+STALE_CLAIM = timedelta(minutes=10)
+
+EMAIL_TEMPLATE = Template("""
+<html>
+    <body style="font-size:14px;font-family:Tahoma">
+        <span>
+            $body
+            <br /><br />
+            Access TalentMAP to view additional details.
+            <br /><br />
+            Kindly,
+            <br />
+            The TalentMAP Team
+        </span>
+        <div style="display:block;padding-top:10;padding-bottom:10">
+            <img height="100" src="cid:hr_logo">
+            <img height="50" src="cid:tmap_logo" style="margin-bottom:27;margin-left:5;">
+        </div>
+        Do not reply to this email. If you have feedback, contact us at <a href = "mailto:TalentMAP@state.gov" />TalentMAP@state.gov</a>.
+    </body>
+</html>
+""")
+
+
+def load_logos():
+    logos = {}
+    for name in ['hr_logo', 'tmap_logo']:
+        with open(os.path.join(EMAIL_DIR, f"{name}.png"), 'rb') as f:
+            logos[name] = f.read()
+    return logos
+
+
+# Read once per process and attached inline by Content-ID rather than inlined into every HTML body
+LOGOS = load_logos()
+
+
+def build_message(email, connection=None):
+    message = EmailMultiAlternatives(
+        email.subject,
+        email.body,
+        settings.EMAIL_FROM_ADDRESS,
+        email.recipients.split(','),
+        connection=connection,
+    )
+    message.attach_alternative(EMAIL_TEMPLATE.safe_substitute(body=email.body), 'text/html')
+    message.mixed_subtype = 'related'
+    for name, data in LOGOS.items():
+        image = MIMEImage(data, 'png')
+        image.add_header('Content-ID', f"<{name}>")
+        image.add_header('Content-Disposition', 'inline', filename=f"{name}.png")
+        message.attach(image)
+    return message
+
+
+class EmailOutbox:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.workers = []
+        self.stats = {
+            "sent": 0,
+            "retried": 0,
+            "failed": 0,
+            "batches": 0,
+            "send_ms": 0.0,
+            "max_send_ms": 0.0,
+            "delivery_ms": 0.0,
+        }
+
+    def start(self):
+        '''
+        Starts this process' worker pool, once
+        '''
+        if self.workers:
+            return
+        with self.lock:
+            if self.workers:
+                return
+            for i in range(settings.EMAIL_OUTBOX_WORKERS):
+                worker = threading.Thread(target=self.run, name=f"email-outbox-{i}", daemon=True)
+                worker.start()
+                self.workers.append(worker)
+
+    def wake(self):
+        self.start()
+        self.wakeup.set()
+
+    def run(self):
+        # drain straight away, so emails left pending by a previous process don't wait for a new one to be queued
+        while True:
+            self.wakeup.clear()
+            try:
+                while self.send_batch():
+                    pass
+            except Exception as e:
+                logger.error(f"{type(e).__name__} at line {e.__traceback__.tb_lineno} of {__file__}: {e}")
+            finally:
+                connections.close_all()
+            self.wakeup.wait(settings.EMAIL_OUTBOX_POLL_INTERVAL)
+
+    def claim_batch(self):
+        now = timezone.now()
+        due = (
+            Q(status=OutboundEmail.STATUS_PENDING, next_attempt__lte=now) |
+            Q(status=OutboundEmail.STATUS_SENDING, date_claimed__lt=now - STALE_CLAIM)
+        )
+        # Oracle can't combine FOR UPDATE with a row limit, so pick the candidates first and lock only those
+        candidates = list(
+            OutboundEmail.objects.filter(due).order_by('next_attempt')
+            .values_list('id', flat=True)[:settings.EMAIL_OUTBOX_BATCH_SIZE]
+        )
+        if not candidates:
+            return []
+        with transaction.atomic():
+            # re-checked under the lock, as another worker may have claimed some in between
+            ids = list(
+                OutboundEmail.objects.select_for_update(skip_locked=True)
+                .filter(due, id__in=candidates)
+                .values_list('id', flat=True)
+            )
+            OutboundEmail.objects.filter(id__in=ids).update(status=OutboundEmail.STATUS_SENDING, date_claimed=now)
+        return list(OutboundEmail.objects.filter(id__in=ids))
+
+    def send_batch(self):
+        '''
+        Sends one batch of due emails over a single SMTP connection, returning how many were claimed
+        '''
+        emails = self.claim_batch()
+        if not emails:
+            return 0
+
+        start = time.perf_counter()
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+            for email in emails:
+                try:
+                    connection.send_messages([build_message(email, connection)])
+                    self.mark_sent(email)
+                except Exception as e:
+                    self.mark_failed(email, e)
+                    # the connection may be unusable now; send_messages reopens it for the next email
+                    connection.close()
+        except Exception as e:
+            for email in emails:
+                if email.status == OutboundEmail.STATUS_SENDING:
+                    self.mark_failed(email, e)
+        finally:
+            connection.close()
+
+        elapsed = (time.perf_counter() - start) * 1000
+        with self.lock:
+            self.stats["batches"] += 1
+            self.stats["send_ms"] += elapsed
+            self.stats["max_send_ms"] = max(self.stats["max_send_ms"], elapsed)
+        return len(emails)
+
+    def mark_sent(self, email):
+        email.status = OutboundEmail.STATUS_SENT
+        email.date_sent = timezone.now()
+        email.save(update_fields=['status', 'date_sent'])
+        with self.lock:
+            self.stats["sent"] += 1
+            self.stats["delivery_ms"] += (email.date_sent - email.date_created).total_seconds() * 1000
+
+    def mark_failed(self, email, error):
+        email.attempts += 1
+        email.last_error = f"{type(error).__name__}: {error}"[:255]
+        if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            email.status = OutboundEmail.STATUS_FAILED
+            logger.error(f"Giving up on email {email.id} after {email.attempts} attempts: {email.last_error}")
+        else:
+            email.status = OutboundEmail.STATUS_PENDING
+            email.next_attempt = timezone.now() + timedelta(seconds=settings.EMAIL_OUTBOX_RETRY_BACKOFF * 2 ** (email.attempts - 1))
+        email.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt'])
+        with self.lock:
+            self.stats["failed" if email.status == OutboundEmail.STATUS_FAILED else "retried"] += 1
+
+    def get_stats(self):
+        '''
+        Returns the queue depth across all processes, and this process' send figures
+        '''
+        queue = OutboundEmail.objects.exclude(status=OutboundEmail.STATUS_SENT).values('status').annotate(
+            count=Count('id'), oldest=Min('date_created'))
+        with self.lock:
+            stats = dict(self.stats)
+        stats["avg_batch_ms"] = round(stats["send_ms"] / stats["batches"], 1) if stats["batches"] else None
+        stats["avg_delivery_ms"] = round(stats["delivery_ms"] / stats["sent"], 1) if stats["sent"] else None
+        stats["workers"] = len(self.workers)
+        stats["queue"] = {
+            dict(OutboundEmail.STATUS_CHOICES)[row['status']]: {"count": row['count'], "oldest": row['oldest']} for row in queue
+        }
+        return stats
+
+
+outbox = EmailOutbox()
+
+
+def start_outbox(**kwargs):
+    '''
+    request_started receiver that starts this process' workers with its first request
+    '''
+    if settings.EMAIL_ENABLED:
+        outbox.start()
+
+
+def enqueue_email(subject='', body='', recipients=[]):
+    '''
+    Queues an email for the outbox workers; it is sent once the current transaction commits
+    '''
+    if not settings.EMAIL_ENABLED:
+        return
+    if settings.EMAIL_IS_DEV:
+        recipients = [settings.EMAIL_DEV_TO]
+    recipients = [r for r in recipients if r]
+    if not recipients:
+        return
+    OutboundEmail.objects.create(
+        subject=subject[:255],
+        body=body,
+        recipients=','.join(recipients),
+        next_attempt=timezone.now(),
+    )
+    transaction.on_commit(outbox.wake)
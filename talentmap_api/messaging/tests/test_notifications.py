@@ -1,9 +1,12 @@
 import json
+from datetime import timedelta
 
 import pytest
+from django.utils import timezone
 from model_mommy import mommy
 from rest_framework import status
 
+from talentmap_api.bidding.models import BidHandshakeCycle
 from talentmap_api.messaging.models import Notification
 
 @pytest.fixture
@@ -23,6 +26,27 @@ def test_notification_tag_filters(authorized_client, authorized_user):
     assert response.status_code == status.HTTP_200_OK
     assert len(response.data["results"]) == 4
 
+    response = authorized_client.get('/api/v1/notification/?tags=fruit,potassium')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [n["id"] for n in response.data["results"]] == [1]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_notification_hides_unrevealed_handshake_cycles(authorized_client, authorized_user):
+    mommy.make(BidHandshakeCycle, cycle_id="1", handshake_allowed_date=timezone.now() + timedelta(days=1))
+    mommy.make(BidHandshakeCycle, cycle_id="2", handshake_allowed_date=timezone.now() - timedelta(days=1))
+    hidden = mommy.make(Notification, owner=authorized_user.profile, tags=["bidding"], meta=json.dumps({"bidcycle_id": "1"}))
+    shown = mommy.make(Notification, owner=authorized_user.profile, tags=["bidding"], meta=json.dumps({"bidcycle_id": 2}))
+    untracked = mommy.make(Notification, owner=authorized_user.profile, tags=["bidding"])
+
+    assert hidden.bidcycle_id == "1" and shown.bidcycle_id == "2" and untracked.bidcycle_id is None
+
+    response = authorized_client.get('/api/v1/notification/?tags=bidding')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert sorted(n["id"] for n in response.data["results"]) == sorted([shown.id, untracked.id])
+
 
 @pytest.mark.django_db(transaction=True)
 @pytest.mark.usefixtures("test_notification_fixture")
@@ -0,0 +1,58 @@
+from unittest.mock import patch
+
+import pytest
+from django.core import mail
+from django.test import override_settings
+
+from talentmap_api.messaging.models import OutboundEmail
+
+
+@pytest.mark.django_db
+@override_settings(EMAIL_ENABLED=True, EMAIL_IS_DEV=False, EMAIL_OUTBOX_MAX_ATTEMPTS=2)
+def test_outbox_sends_batch_and_retries_failures():
+    from talentmap_api.messaging.outbox import EmailOutbox, enqueue_email
+
+    enqueue_email('Handshake', 'Bidder has accepted your handshake.', ['bureau@state.gov', None])
+    enqueue_email('Handshake', 'CDO has accepted your handshake.', ['bidder@state.gov'])
+    assert OutboundEmail.objects.filter(status=OutboundEmail.STATUS_PENDING).count() == 2
+
+    outbox = EmailOutbox()
+    assert outbox.send_batch() == 2
+    assert len(mail.outbox) == 2
+    assert mail.outbox[0].to == ['bureau@state.gov']
+    assert 'cid:hr_logo' in mail.outbox[0].alternatives[0][0]
+    assert OutboundEmail.objects.filter(status=OutboundEmail.STATUS_SENT).count() == 2
+
+    enqueue_email('Handshake', 'Another bidder was registered.', ['other@state.gov'])
+    with patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=OSError('refused')):
+        outbox.send_batch()
+        email = OutboundEmail.objects.get(recipients='other@state.gov')
+        assert email.status == OutboundEmail.STATUS_PENDING
+        assert email.attempts == 1
+
+        OutboundEmail.objects.filter(id=email.id).update(next_attempt=email.date_created)
+        outbox.send_batch()
+        assert OutboundEmail.objects.get(id=email.id).status == OutboundEmail.STATUS_FAILED
+
+    stats = outbox.get_stats()
+    assert (stats['sent'], stats['retried'], stats['failed']) == (2, 1, 1)
+    assert stats['queue']['Failed']['count'] == 1
+
+
+@pytest.mark.django_db
+@override_settings(EMAIL_ENABLED=True, EMAIL_IS_DEV=False, EMAIL_OUTBOX_BATCH_SIZE=1)
+def test_outbox_reclaims_stale_emails_in_batches():
+    from datetime import timedelta
+    from django.utils import timezone
+    from talentmap_api.messaging.outbox import EmailOutbox, enqueue_email
+
+    enqueue_email('Handshake', 'Left sending by a stopped worker.', ['stale@state.gov'])
+    enqueue_email('Handshake', 'Still pending.', ['pending@state.gov'])
+    OutboundEmail.objects.filter(recipients='stale@state.gov').update(
+        status=OutboundEmail.STATUS_SENDING, date_claimed=timezone.now() - timedelta(hours=1))
+
+    outbox = EmailOutbox()
+    assert outbox.send_batch() == 1
+    assert outbox.send_batch() == 1
+    assert outbox.send_batch() == 0
+    assert OutboundEmail.objects.filter(status=OutboundEmail.STATUS_SENT).count() == 2
@@ -1,15 +1,16 @@
 import logging
-import json
 
-import maya
 import pydash
 
+from django.db.models import Count
+from django.utils import timezone
+
 from rest_framework.viewsets import GenericViewSet
 from rest_framework import mixins
 from rest_framework.permissions import IsAuthenticated
 
 from talentmap_api.common.mixins import FieldLimitableSerializerMixin
-from talentmap_api.messaging.models import Notification
+from talentmap_api.messaging.models import Notification, NotificationTag
 from talentmap_api.bidding.models import BidHandshakeCycle
 from talentmap_api.messaging.filters import NotificationFilter
 from talentmap_api.messaging.serializers import NotificationSerializer
@@ -42,49 +43,24 @@ class NotificationView(FieldLimitableSerializerMixin,
     permission_classes = (IsAuthenticated,)
 
     def get_queryset(self):
-        # Oracle and Django don't play nice with JSON. This makes filtering by an array of tags difficult.
+        # Oracle and Django don't play nice with JSON, so tags are filtered through their NotificationTag rows.
         # We comma separate the tags provided in the ?tags query parameter (ex: ?tags=a,b,c).
         tags = list(self.request.GET.get('tags', '').split(','))
         # filter out an empty strings
-        tags = pydash.without(tags, '')
-
-        matches = []
-
-        params = {
-            'owner': self.request.user.profile,
-        }
+        tags = set(pydash.without(tags, ''))
 
-        exclude_params = {
-            'id__in': []
-        }
+        owner = self.request.user.profile
+        queryset = Notification.objects.filter(owner=owner)
 
-        matches = Notification.objects.filter(owner=self.request.user.profile).values()
-
-        # This is inefficient, but we have to fetch all notifications to find out which ones have the requested tags.
+        # Only notifications having every requested tag, grouping only the user's own tag rows
         if tags:
-            matchesClone = pydash.filter_(matches, lambda x: set(tags).issubset(set(x['tags'] or [])))
-            matchesClone = pydash.map_(matchesClone, 'id')
-            # Only append to params if tags exists, so that we don't inadvertently pass an empty array
-            params['id__in'] = matchesClone
-
+            tagged = NotificationTag.objects.filter(notification__owner=owner, tag__in=tags).values('notification') \
+                .annotate(matched=Count('tag')).filter(matched=len(tags)).values('notification')
+            queryset = queryset.filter(id__in=tagged)
 
         # Don't show notifications for handshakes that are in an unrevealed bid cycle
-        for x in matches:
-            try:
-                meta = pydash.get(x, 'meta') or '{}'
-                meta = json.loads(meta)
-                bidcycle_id = pydash.get(meta, 'bidcycle_id')
-                cycles = BidHandshakeCycle.objects.filter(cycle_id=bidcycle_id)
-                if cycles.first():
-                    cycle = cycles.first()
-                    allowed_date = cycle.handshake_allowed_date
-                    if allowed_date:
-                        if allowed_date > maya.now().datetime():
-                            exclude_params['id__in'].append(pydash.get(x, 'id'))
-            except Exception as e:
-                logger.error(f"{type(e).__name__} at line {e.__traceback__.tb_lineno} of {__file__}: {e}")
-
-
-        queryset = Notification.objects.filter(**params).exclude(**exclude_params)
+        unrevealed = BidHandshakeCycle.objects.filter(handshake_allowed_date__gt=timezone.now()).values('cycle_id')
+        queryset = queryset.exclude(bidcycle_id__in=unrevealed)
+
         self.serializer_class.prefetch_model(Notification, queryset)
         return queryset
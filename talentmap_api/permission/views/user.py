@@ -7,7 +7,7 @@ from django.contrib.auth.models import User
 from django.shortcuts import get_object_or_404
 from django.db.models import Q
 
-from talentmap_api.common.common_helpers import get_prefetched_filtered_queryset
+from talentmap_api.common.common_helpers import get_prefetched_filtered_queryset, get_user_group_names
 from talentmap_api.common.mixins import FieldLimitableSerializerMixin
 from talentmap_api.common.permissions import isDjangoGroupMember
 from talentmap_api.permission.serializers import UserPermissionSerializer
@@ -18,7 +18,7 @@ from talentmap_api.user_profile.models import UserProfile
 def construct_return_object(user):
     permission_dict = {}
     permission_dict["user"] = UserSerializer(user).data
-    permission_dict["groups"] = list(user.groups.values_list("name", flat=True))
+    permission_dict["groups"] = sorted(get_user_group_names(user))
     permission_dict["permissions"] = list(user.get_all_permissions())
     return permission_dict
 
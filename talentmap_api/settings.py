@@ -62,6 +62,15 @@ EMAIL_FROM_ADDRESS = get_delineated_environment_variable("EMAIL_FROM_ADDRESS")
 EMAIL_IS_DEV = bool_env_variable("EMAIL_IS_DEV")
 EMAIL_DEV_TO = get_delineated_environment_variable("EMAIL_DEV_TO")
 
+# Notification email outbox: worker threads per process, emails per SMTP connection, and retry policy
+EMAIL_OUTBOX_WORKERS = int(get_delineated_environment_variable("EMAIL_OUTBOX_WORKERS", 2))
+EMAIL_OUTBOX_BATCH_SIZE = int(get_delineated_environment_variable("EMAIL_OUTBOX_BATCH_SIZE", 50))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(get_delineated_environment_variable("EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+EMAIL_OUTBOX_RETRY_BACKOFF = int(get_delineated_environment_variable("EMAIL_OUTBOX_RETRY_BACKOFF", 30))
+EMAIL_OUTBOX_POLL_INTERVAL = int(get_delineated_environment_variable("EMAIL_OUTBOX_POLL_INTERVAL", 30))
+# Threads per process looking up the bidders to notify of a handshake change; further changes wait for one
+HANDSHAKE_NOTIFICATION_WORKERS = int(get_delineated_environment_variable("HANDSHAKE_NOTIFICATION_WORKERS", 2))
+
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -170,6 +179,7 @@ MIDDLEWARE = [
     # Our middleware
     'talentmap_api.common.middleware.IE11Middleware',
     'talentmap_api.common.middleware.ExposeHeadersMiddleware',
+    'talentmap_api.common.middleware.UpstreamMetricsMiddleware',
 ]
 
 ROOT_URLCONF = 'talentmap_api.urls'
@@ -209,16 +219,37 @@ REST_FRAMEWORK = {
 }
 
 
+# Cache backend; one of the aliases below or a dotted path to any backend class (e.g. django_redis.cache.RedisCache)
+# locmem is per worker process, file is shared by the workers of one host, memcached/redis are shared by every host.
+# Cache invalidation (model versions) only reaches every process through a shared backend, so locmem is only
+# suitable for a single process (runserver); multi-worker deployments should use memcached (or redis). file is a
+# single host fallback only: its add isn't atomic across processes, which races the single-flight locks.
+CACHE_BACKENDS = {
+    'dummy': 'django.core.cache.backends.dummy.DummyCache',
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',
+}
+CACHE_BACKEND = get_delineated_environment_variable('DJANGO_CACHE_BACKEND', 'locmem')
+
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+        'BACKEND': CACHE_BACKENDS.get(CACHE_BACKEND, CACHE_BACKEND),
+        # unique name for locmem, directory for file, host:port (comma separated) for networked backends
+        'LOCATION': get_delineated_environment_variable('DJANGO_CACHE_LOCATION', 'talentmap'),
+        'KEY_PREFIX': get_delineated_environment_variable('DJANGO_CACHE_KEY_PREFIX', 'talentmap'),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(get_delineated_environment_variable('DJANGO_CACHE_MAX_ENTRIES', 5000)),
+        } if CACHE_BACKEND in ['locmem', 'file'] else {},
     }
 }
+if ',' in CACHES['default']['LOCATION']:
+    CACHES['default']['LOCATION'] = CACHES['default']['LOCATION'].split(',')
 
 
 REST_FRAMEWORK_EXTENSIONS = {
     'DEFAULT_USE_CACHE': 'default',
-    'DEFAULT_CACHE_RESPONSE_TIMEOUT': 86400,  # 1 day
+    'DEFAULT_CACHE_RESPONSE_TIMEOUT': int(get_delineated_environment_variable('DJANGO_CACHE_RESPONSE_TIMEOUT', 86400)),  # 1 day
     'DEFAULT_CACHE_KEY_FUNC': 'talentmap_api.common.cache.key_constructor.key_func'
 }
 
@@ -479,15 +510,27 @@ WSGI_APPLICATION = 'talentmap_api.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.oracle',
+        # Django's Oracle backend, plus health checks on reused connections and optional session pooling
+        'ENGINE': 'talentmap_api.common.oracle',
         'NAME': get_delineated_environment_variable("DATABASE_URL"),
         'USER': get_delineated_environment_variable("DATABASE_USER"),
         'PASSWORD': get_delineated_environment_variable("DATABASE_PW"),
-        # 'CONN_MAX_AGE': 300,
-        # 'OPTIONS': {'threaded': True}
+        # Seconds a connection is kept open between requests (0 closes it after every request)
+        'CONN_MAX_AGE': int(get_delineated_environment_variable('DATABASE_CONN_MAX_AGE', 300)),
+        # Ping a reused connection before its first query in each request, reconnecting if it was dropped
+        'CONN_HEALTH_CHECKS': get_delineated_environment_variable('DATABASE_CONN_HEALTH_CHECKS', 'true') in ["1", "True", "true"],
+        'OPTIONS': {'threaded': True},
     }
 }
 
+# Acquire connections from a per-process cx_Oracle session pool instead of logging in for each one
+if bool_env_variable("DATABASE_POOL_ENABLED"):
+    DATABASES['default']['POOL'] = {
+        'min': int(get_delineated_environment_variable('DATABASE_POOL_MIN', 2)),
+        'max': int(get_delineated_environment_variable('DATABASE_POOL_MAX', 10)),
+        'increment': int(get_delineated_environment_variable('DATABASE_POOL_INCREMENT', 1)),
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/1.11/ref/settings/#auth-password-validators
@@ -564,6 +607,82 @@ OBC_URL_EXTERNAL = get_delineated_environment_variable('OBC_URL_EXTERNAL', 'http
 # SSL cert
 HRONLINE_CERT = get_delineated_environment_variable('HRONLINE_CERT', None)
 
+# FSBid transport (see talentmap_api/fsbid/requests.py)
+# Connection pool, timeout and retry defaults applied to every FSBid root
+FSBID_TRANSPORT_DEFAULTS = {
+    'pool_connections': int(get_delineated_environment_variable('FSBID_POOL_CONNECTIONS', 4)),
+    'pool_maxsize': int(get_delineated_environment_variable('FSBID_POOL_MAXSIZE', 20)),
+    'pool_block': bool_env_variable('FSBID_POOL_BLOCK'),
+    'connect_timeout': float(get_delineated_environment_variable('FSBID_CONNECT_TIMEOUT', 5)),
+    'read_timeout': float(get_delineated_environment_variable('FSBID_READ_TIMEOUT', 60)),
+    'retries': int(get_delineated_environment_variable('FSBID_RETRIES', 2)),
+    'backoff_factor': float(get_delineated_environment_variable('FSBID_RETRY_BACKOFF', 0.3)),
+}
+
+# Max upstream calls a single inbound request may run concurrently
+FSBID_MAX_WORKERS = int(get_delineated_environment_variable('FSBID_MAX_WORKERS', 8))
+
+# Seconds a pagination count is reused while only the page number changes
+FSBID_COUNT_CACHE_TIMEOUT = int(get_delineated_environment_variable('FSBID_COUNT_CACHE_TIMEOUT', 60))
+
+# Seconds FSBid reference data (skills, grades, languages, ...) is shared between requests and workers
+FSBID_REFERENCE_CACHE_TIMEOUT = int(get_delineated_environment_variable('FSBID_REFERENCE_CACHE_TIMEOUT', 60 * 60 * 12))
+
+# Bid cycles change status during a season, so they are refreshed more often than other reference data
+FSBID_CYCLES_CACHE_TIMEOUT = int(get_delineated_environment_variable('FSBID_CYCLES_CACHE_TIMEOUT', 60 * 5))
+
+# Max seconds a user's bureau/org permission codes are reused; never longer than their token is valid
+FSBID_PERMISSIONS_CACHE_TIMEOUT = int(get_delineated_environment_variable('FSBID_PERMISSIONS_CACHE_TIMEOUT', 60 * 60))
+
+# Seconds FSBid's answer to whether a token's bureau/org codes cover a cycle position is reused (capped by token expiry)
+FSBID_POSITION_PERMISSIONS_CACHE_TIMEOUT = int(get_delineated_environment_variable('FSBID_POSITION_PERMISSIONS_CACHE_TIMEOUT', 60 * 5))
+
+# Seconds the directory of all CDOs is shared between requests and workers
+FSBID_CDO_CACHE_TIMEOUT = int(get_delineated_environment_variable('FSBID_CDO_CACHE_TIMEOUT', 60 * 15))
+
+# Seconds a client's profile is reused between a CDO's page loads and suggestions
+FSBID_CLIENT_CACHE_TIMEOUT = int(get_delineated_environment_variable('FSBID_CLIENT_CACHE_TIMEOUT', 60))
+
+# Seconds an employee's SECREF contact details (email, office phone and address) are reused
+FSBID_CONTACT_CACHE_TIMEOUT = int(get_delineated_environment_variable('FSBID_CONTACT_CACHE_TIMEOUT', 60 * 60))
+
+# Max seconds the post code to OBC id index is reused by a worker; writes to Obc refresh it sooner
+FSBID_OBC_INDEX_TIMEOUT = int(get_delineated_environment_variable('FSBID_OBC_INDEX_TIMEOUT', 60 * 60))
+# Min seconds between a worker's checks of the shared Obc version, i.e. how long another process's OBC load can go unseen
+FSBID_OBC_VERSION_CHECK_INTERVAL = int(get_delineated_environment_variable('FSBID_OBC_VERSION_CHECK_INTERVAL', 30))
+
+# Rows fetched from FSBid per page while streaming a CSV export
+FSBID_CSV_PAGE_SIZE = int(get_delineated_environment_variable('FSBID_CSV_PAGE_SIZE', 500))
+
+# Record latency, payload size and error figures for every FSBid call (see stats/fsbidupstream/)
+FSBID_METRICS_ENABLED = get_delineated_environment_variable('FSBID_METRICS_ENABLED', True) in ["1", "True", "true", True]
+
+# Report the FSBid calls and time spent on each request in the Upstream-Calls and Upstream-Time headers
+FSBID_UPSTREAM_TIME_HEADER = bool_env_variable('FSBID_UPSTREAM_TIME_HEADER')
+
+# Saved search count refresh: seconds a count is considered fresh, and distinct upstream counts run at once
+SAVED_SEARCH_COUNT_MAX_AGE = int(get_delineated_environment_variable('SAVED_SEARCH_COUNT_MAX_AGE', 300))
+SAVED_SEARCH_COUNT_WORKERS = int(get_delineated_environment_variable('SAVED_SEARCH_COUNT_WORKERS', 4))
+
+# Seconds a user's permission group names are shared between requests; changes made through the app invalidate them
+# immediately, but only in processes sharing the cache, so with a per-process (locmem/dummy) backend they never are
+USER_GROUPS_CACHE_TIMEOUT = int(get_delineated_environment_variable('USER_GROUPS_CACHE_TIMEOUT', 300))
+if CACHE_BACKEND in ['locmem', 'dummy']:
+    USER_GROUPS_CACHE_TIMEOUT = 0
+
+# Per-root overrides, keyed by the name of the root URL setting
+FSBID_TRANSPORT_ROOTS = {
+    'BACKOFFICE_CRUD_URL': {
+        'read_timeout': float(get_delineated_environment_variable('FSBID_BACKOFFICE_READ_TIMEOUT', 120)),
+    },
+    'SECREF_URL': {
+        'read_timeout': float(get_delineated_environment_variable('FSBID_SECREF_READ_TIMEOUT', 30)),
+    },
+    'CP_API_V2_URL': {
+        'pool_maxsize': int(get_delineated_environment_variable('FSBID_CP_POOL_MAXSIZE', 40)),
+    },
+}
+
 # defaults from https://pypi.org/project/django-cors-headers/ plus our custom headers
 CORS_ALLOW_HEADERS = [
     'accept',
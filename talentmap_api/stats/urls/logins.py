@@ -16,4 +16,8 @@ urlpatterns = [
 
     # system resources
     url(r'^sysmon/', views.SystemResources.as_view({'get': 'get'}), name='stats.SystemResources'),
+    url(r'^fsbidpools/', views.FSBidPoolStats.as_view({'get': 'get'}), name='stats.FSBidPoolStats'),
+    url(r'^fsbidupstream/', views.FSBidUpstreamStats.as_view({'get': 'get', 'delete': 'reset'}), name='stats.FSBidUpstreamStats'),
+    url(r'^cache/', views.CacheStats.as_view({'get': 'get'}), name='stats.CacheStats'),
+    url(r'^emailoutbox/', views.EmailOutboxStats.as_view({'get': 'get'}), name='stats.EmailOutboxStats'),
 ]
@@ -3,6 +3,7 @@ import logging
 import os
 import maya
 
+from django.conf import settings
 from django.db.models import TextField
 from django.db.models.functions import Concat
 
@@ -20,6 +21,11 @@ from talentmap_api.user_profile.models import UserProfile
 from talentmap_api.stats.models import LoginInstance, ViewPositionInstance
 from talentmap_api.stats.serializers import LoginInstanceSerializer, LoginInstanceListSerializer, ViewPositionInstanceSerializer
 from talentmap_api.stats.filters import LoginInstanceFilter, ViewPositionInstanceFilter
+from talentmap_api.fsbid.requests import requests as fsbid_transport
+from talentmap_api.fsbid.metrics import metrics as fsbid_metrics
+from talentmap_api.common.cache.invalidation import get_access_stats
+from talentmap_api.common.cache.views import cached_views
+from talentmap_api.messaging.outbox import outbox
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +43,57 @@ class SystemResources(GenericViewSet):
         return Response(data={"memory":memory, "cpu":cpu, "disk":disk})
 
 
+class FSBidPoolStats(GenericViewSet):
+    '''
+    Connection pool usage of the FSBid transport for this worker
+    '''
+
+    permission_classes = (IsAuthenticated, isDjangoGroupMember('superuser'))
+
+    def get(self, format=None):
+        return Response(data=fsbid_transport.get_pool_stats())
+
+
+class FSBidUpstreamStats(GenericViewSet):
+    '''
+    Latency, payload and error figures per FSBid endpoint, and upstream calls per view, for this worker
+    '''
+
+    permission_classes = (IsAuthenticated, isDjangoGroupMember('superuser'))
+
+    def get(self, format=None):
+        return Response(data=fsbid_metrics.snapshot())
+
+    def reset(self, format=None):
+        fsbid_metrics.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class CacheStats(GenericViewSet):
+    '''
+    Response cache backend and hit/miss counters per cached view
+    '''
+
+    permission_classes = (IsAuthenticated, isDjangoGroupMember('superuser'))
+
+    def get(self, format=None):
+        return Response(data={
+            "backend": settings.CACHES['default']['BACKEND'],
+            "views": get_access_stats(sorted(cached_views)),
+        })
+
+
+class EmailOutboxStats(GenericViewSet):
+    '''
+    Notification email queue depth, and this worker's send/retry/failure counts and latencies
+    '''
+
+    permission_classes = (IsAuthenticated, isDjangoGroupMember('superuser'))
+
+    def get(self, format=None):
+        return Response(data=outbox.get_stats())
+
+
 class UserLoginActionView(GenericViewSet):
     '''
     Tracks login for user
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+import logging
+
+from talentmap_api.user_profile.models import SavedSearch
+
+
+class Command(BaseCommand):
+    help = 'Refreshes saved search counts, notifying owners of new results. Meant to be run on a schedule.'
+    logger = logging.getLogger(__name__)
+
+    def add_arguments(self, parser):
+        parser.add_argument('jwt', nargs=1, help="The JWT used to authorize the FSBid count calls")
+        parser.add_argument('--endpoint', dest='endpoint', help='Only refresh searches whose endpoint contains this value')
+        parser.add_argument('--max-age', dest='max_age', type=int, help='Skip searches counted within this many seconds (defaults to SAVED_SEARCH_COUNT_MAX_AGE)')
+        parser.add_argument('--force', dest='force', action='store_true', help='Refresh every search, however recently it was counted')
+
+    def handle(self, *args, **options):
+        max_age = 0 if options['force'] else options['max_age']
+        summary = SavedSearch.update_counts_for_endpoint(options['endpoint'], True, options['jwt'][0], max_age=max_age)
+        self.logger.info(f"Refreshed {summary['searches'] - summary['skipped'] - summary['failed']} of {summary['searches']} saved searches "
+                         f"({summary['distinct']} distinct queries, {summary['skipped']} fresh, {summary['failed']} failed) in {summary['elapsed_ms']}ms")
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_profile', '0002_savedsearch_is_bureau'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='savedsearch',
+            name='date_counted',
+            field=models.DateTimeField(help_text='When the count was last refreshed', null=True),
+        ),
+    ]
@@ -1,18 +1,24 @@
 import json
+import logging
+import time
+from datetime import timedelta
 
+from django.conf import settings
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 from jsonfield import JSONField
 
 from talentmap_api.common.models import StaticRepresentationModel
-from talentmap_api.common.common_helpers import get_filtered_queryset, resolve_path_to_view, format_filter, get_avatar_url
-from talentmap_api.common.permissions import in_group_or_403
+from talentmap_api.common.common_helpers import get_filtered_queryset, resolve_path_to_view, format_filter, get_avatar_url, get_user_group_names
 
 from talentmap_api.messaging.models import Notification
 
+logger = logging.getLogger(__name__)
+
 
 class UserProfile(StaticRepresentationModel):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
@@ -63,11 +69,7 @@ class UserProfile(StaticRepresentationModel):
         '''
         Represents if the user is a CDO (Career development officer) or not.
         '''
-        try:
-            in_group_or_403(self.user, 'cdo')
-            return True
-        except BaseException:
-            return False
+        return 'cdo' in get_user_group_names(self.user)
 
     class Meta:
         managed = True
@@ -100,19 +102,29 @@ class SavedSearch(models.Model):
     date_created = models.DateTimeField(auto_now_add=True)
     date_updated = models.DateTimeField(auto_now=True)
     is_bureau = models.BooleanField(default=False, help_text="Whether this search is for Bureau/AO")
+    date_counted = models.DateTimeField(null=True, help_text="When the count was last refreshed")
 
 
     def get_queryset(self):
         return get_filtered_queryset(resolve_path_to_view(self.endpoint).filter_class, self.filters)
 
-    def update_count(self, created=False, jwt_token=''):
-
+    def get_count(self, jwt_token=''):
         filter_class = resolve_path_to_view(self.endpoint).filter_class
-        query_params = format_filter(self.filters)
         if getattr(filter_class, "use_api", False):
-            count = int(filter_class.get_count(query_params, jwt_token).get('count', 0))
-        else:
-            count = self.get_queryset().count()
+            return int(filter_class.get_count(format_filter(self.filters), jwt_token).get('count', 0))
+        return self.get_queryset().count()
+
+    def get_count_key(self):
+        '''
+        Searches on the same endpoint with the same filters, in any order, share a count
+        '''
+        filters = {key: sorted(f"{v}" for v in value) if isinstance(value, list) else f"{value}" for key, value in (self.filters or {}).items()}
+        return (self.endpoint, json.dumps(filters, sort_keys=True))
+
+    def update_count(self, created=False, jwt_token='', count=None):
+        if count is None:
+            count = self.get_count(jwt_token)
+        self.date_counted = timezone.now()
 
         if self.count != count:
             # Create a notification for this saved search's owner if the amount has increased
@@ -131,27 +143,84 @@ class SavedSearch(models.Model):
             self._disable_signals = True
             self.save()
             self._disable_signals = False
+        else:
+            SavedSearch.objects.filter(id=self.id).update(date_counted=self.date_counted)
 
     @staticmethod
-    def update_counts_for_endpoint(endpoint=None, contains=False, jwt_token='', user=''):
+    def update_counts_for_endpoint(endpoint=None, contains=False, jwt_token='', user='', max_age=None):
         '''
         Update all saved searches counts whose endpoint matches the specified endpoint.
         If the endpoint is omitted, updates all saved search counts.
 
+        Searches counted within the last max_age seconds (SAVED_SEARCH_COUNT_MAX_AGE by default) are skipped.
+        Each distinct endpoint and filter combination is counted once, API backed counts concurrently.
+
         Args:
             - endpoint (string) - Endpoint to updated saved searches for
+            - user (UserProfile) - Only update this user's saved searches
+
+        Returns a summary of the run
         '''
+        from talentmap_api.fsbid.services.common import run_concurrently
+
+        start = time.perf_counter()
+        if max_age is None:
+            max_age = settings.SAVED_SEARCH_COUNT_MAX_AGE
 
         queryset = SavedSearch.objects.all()
         if endpoint:
             if contains:
-                queryset = SavedSearch.objects.filter(endpoint__icontains=endpoint)
+                queryset = queryset.filter(endpoint__icontains=endpoint)
             else:
-                queryset = SavedSearch.objects.filter(endpoint=endpoint)
-
-        for search in queryset:
-            if search.owner == user or user == '':
-                search.update_count(jwt_token=jwt_token)
+                queryset = queryset.filter(endpoint=endpoint)
+        if user != '':
+            queryset = queryset.filter(owner=user)
+
+        searches = list(queryset)
+        fresh_since = timezone.now() - timedelta(seconds=max_age)
+        stale = [search for search in searches if not (max_age and search.date_counted and search.date_counted >= fresh_since)]
+
+        groups = {}
+        for search in stale:
+            groups.setdefault(search.get_count_key(), []).append(search)
+
+        def count_group(key):
+            try:
+                return groups[key][0].get_count(jwt_token)
+            except Exception as e:
+                logger.error(f"Could not count saved search {key}: {type(e).__name__}: {e}")
+                return None
+
+        # API backed counts are made concurrently; database counts stay on this thread and its connection
+        api_keys = []
+        db_keys = []
+        for key in groups:
+            try:
+                use_api = getattr(resolve_path_to_view(key[0]).filter_class, "use_api", False)
+            except Exception:
+                use_api = False
+            (api_keys if use_api else db_keys).append(key)
+
+        counts = dict(zip(api_keys, run_concurrently(count_group, api_keys, max_workers=settings.SAVED_SEARCH_COUNT_WORKERS)))
+        counts.update({key: count_group(key) for key in db_keys})
+
+        failed = 0
+        for key, count in counts.items():
+            if count is None:
+                failed += len(groups[key])
+                continue
+            for search in groups[key]:
+                search.update_count(jwt_token=jwt_token, count=count)
+
+        summary = {
+            "searches": len(searches),
+            "skipped": len(searches) - len(stale),
+            "distinct": len(groups),
+            "failed": failed,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+        logger.info(f"Refreshed saved search counts: {summary}")
+        return summary
 
     class Meta:
         managed = True
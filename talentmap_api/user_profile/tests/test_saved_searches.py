@@ -97,3 +97,25 @@ def test_saved_search_delete(authorized_client, authorized_user, test_saved_sear
 #     response = authorized_client.put('/api/v1/searches/listcount/', HTTP_JWT=fake_jwt)
 #
 #     assert response.status_code == status.HTTP_204_NO_CONTENT
+
+
+@pytest.mark.django_db()
+def test_saved_search_counts_grouped_and_fresh_skipped(authorized_user, test_saved_search_fixture):
+    from datetime import timedelta
+    from unittest.mock import patch
+    from django.utils import timezone
+    from talentmap_api.user_profile.models import SavedSearch
+
+    endpoint = '/api/v1/fsbid/available_positions/'
+    mommy.make('user_profile.SavedSearch', owner=authorized_user.profile, endpoint=endpoint, filters={"position__grade__code__in": ["02", "01"]})
+    mommy.make('user_profile.SavedSearch', owner=authorized_user.profile, endpoint=endpoint, filters={"position__grade__code__in": ["01", "02"]})
+    mommy.make('user_profile.SavedSearch', owner=authorized_user.profile, endpoint=endpoint, filters={"q": "french"}, date_counted=timezone.now() - timedelta(seconds=10))
+
+    with patch('talentmap_api.fsbid.filters.AvailablePositionsFilter.get_count', return_value={"count": 7}) as mock_count:
+        summary = SavedSearch.update_counts_for_endpoint(endpoint, jwt_token=fake_jwt, user=authorized_user.profile, max_age=60)
+
+    assert mock_count.call_count == 2
+    assert summary["searches"] == 4
+    assert summary["skipped"] == 1
+    assert summary["distinct"] == 2
+    assert SavedSearch.objects.filter(count=7).count() == 3
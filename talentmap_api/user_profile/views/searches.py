@@ -64,5 +64,6 @@ class SavedSearchListCountView(APIView):
 
     def put(self, request, *args, **kwargs):
 
+        # Counts refreshed within SAVED_SEARCH_COUNT_MAX_AGE are reused; the run summary is logged
         SavedSearch.update_counts_for_endpoint(contains=True, jwt_token=request.META['HTTP_JWT'], user=request.user.profile)
         return Response(status=status.HTTP_204_NO_CONTENT)
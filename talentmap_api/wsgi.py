@@ -9,36 +9,12 @@ https://docs.djangoproject.com/en/1.11/howto/deployment/wsgi/
 
 import os
 import sys
-import re
 
 from django.core.wsgi import get_wsgi_application
 
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-
-
-def load_environment_script(file):
-    '''
-    Attempts to load environment data from the specified location
-
-    Args:
-        - file (String) - The path to the file
+from talentmap_api.environment import load_environment_script
 
-    Return:
-        - dictionary (Object) - A dictionary of variable-key pairs
-    '''
-
-    environment_file = {}
-    try:
-        with open(file) as f:
-            for variable in re.finditer(r'export (.*?)=(.+)', f.read()):
-                # print(f"Found setup_environment.sh variable: {variable.group(1)}={variable.group(2)}")
-                # Store the variable, and strip any extra apostrophes or quotation marks
-                environment_file[variable.group(1)] = variable.group(2).replace("\'", "").replace("\"", "")
-    except:
-        print(f'TalentMAP: wsgi.py unable to load environment, does {file} exist?')
-        raise
-
-    return environment_file
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
 # https support for the swagger documentation